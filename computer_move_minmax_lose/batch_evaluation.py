@@ -0,0 +1,189 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import numpy as np
+
+from batch_playout import SHIFTS, allowed_pieces
+from bitboard import square_index, row_mask, PLAYER, NUM_SQUARES,\
+    DARK_SQUARES, POSITIONS
+from evaluation import MAN_VALUE, KING_VALUE, BACK_RANK_VALUE
+
+# Every feature counts the pieces or moves of the player to move minus those
+# of the opponent
+FEATURES = ("men", "kings", "back rank", "centre", "mobility", "runaways")
+CENTRE_VALUE = 4
+MOBILITY_VALUE = 2
+RUNAWAY_VALUE = 30
+WEIGHTS = np.array([MAN_VALUE, KING_VALUE, BACK_RANK_VALUE, CENTRE_VALUE,
+                    MOBILITY_VALUE, RUNAWAY_VALUE], dtype=np.int64)
+# Back rank of each player in PLAYER order
+BACK_RANKS = np.array([row_mask([0]), row_mask([NUM_SQUARES - 1])],
+                      dtype=np.uint64)
+CENTRE = np.uint64(sum(1 << square_index(row, col)
+                       for row in (3, 4) for col in range(2, 6)
+                       if row % 2 != col % 2))
+
+
+def forward_cones():
+    '''
+    Function -- forward_cones
+        Calculate the squares ahead of a man on each square, those it could
+        reach on its way to the last row
+    Parameters:
+        None
+    Returns:
+        A numpy array of shape (len(PLAYER), DARK_SQUARES) of bitmasks, men
+        of PLAYER[0] move to higher rows and men of PLAYER[1] to lower rows
+    '''
+    cones = np.zeros((len(PLAYER), DARK_SQUARES), dtype=np.uint64)
+    for index, (row, col) in enumerate(POSITIONS):
+        for other, (other_row, other_col) in enumerate(POSITIONS):
+            ahead = other_row - row
+            if abs(other_col - col) <= ahead:
+                cones[0, index] |= np.uint64(1 << other)
+            elif abs(other_col - col) <= -ahead:
+                cones[1, index] |= np.uint64(1 << other)
+    return cones
+
+
+CONES = forward_cones()
+SQUARE_BITS = np.uint64(1) << np.arange(DARK_SQUARES, dtype=np.uint64)
+
+
+def board_arrays(boards):
+    '''
+    Function -- board_arrays
+        Gather the bitmasks of a list of boards into numpy arrays
+    Parameters:
+        boards -- a list of BitBoard objects
+    Returns:
+        Numpy arrays of the pieces of each board's player to move, of its
+        opponent, of the kings and of the index in PLAYER of the player to
+        move
+    '''
+    player = np.array([PLAYER.index(board.current_player)
+                       for board in boards], dtype=np.intp)
+    black = np.array([board.black for board in boards], dtype=np.uint64)
+    red = np.array([board.red for board in boards], dtype=np.uint64)
+    kings = np.array([board.kings for board in boards], dtype=np.uint64)
+    own = np.where(player == 0, black, red)
+    opponent = np.where(player == 0, red, black)
+    return own, opponent, kings, player
+
+
+def mobility(pieces, kings, empty, player):
+    '''
+    Function -- mobility
+        Count the non capture moves of one side of each board
+    Parameters:
+        pieces -- a numpy array of the pieces of that side
+        kings -- a numpy array of the kings of each board
+        empty -- a numpy array of the empty squares of each board
+        player -- a numpy array of the index in PLAYER of that side
+    Returns:
+        A numpy array of move counts
+    '''
+    allowed = allowed_pieces(pieces, kings, player)
+    return sum(np.bitwise_count(shift(allowed[:, number]) & empty)
+               for number, shift in enumerate(SHIFTS)).astype(np.int64)
+
+
+def runaways(men, opponent, player):
+    '''
+    Function -- runaways
+        Count the men of one side of each board with no opponent piece on
+        their way to the last row
+    Parameters:
+        men -- a numpy array of the men of that side
+        opponent -- a numpy array of the pieces of the other side
+        player -- a numpy array of the index in PLAYER of that side
+    Returns:
+        A numpy array of counts
+    '''
+    count = np.zeros(len(men), dtype=np.int64)
+    cones = CONES[player]
+    for index in range(DARK_SQUARES):
+        count += ((men & SQUARE_BITS[index]) != 0) & (
+            (opponent & cones[:, index]) == 0)
+    return count
+
+
+def feature_matrix(own, opponent, kings, player):
+    '''
+    Function -- feature_matrix
+        Extract the FEATURES of a batch of positions
+    Parameters:
+        own -- a numpy array of the pieces of each board's player to move
+        opponent -- a numpy array of the opponent pieces of each board
+        kings -- a numpy array of the kings of each board
+        player -- a numpy array of the index in PLAYER of each board's
+        player to move
+    Returns:
+        A numpy array of shape (boards, len(FEATURES))
+    '''
+    other = 1 - player
+    own_men, opponent_men = own & ~kings, opponent & ~kings
+    empty = ~(own | opponent) & np.uint64((1 << DARK_SQUARES) - 1)
+
+    def count(mask):
+        return np.bitwise_count(mask).astype(np.int64)
+    return np.stack([
+        count(own_men) - count(opponent_men),
+        count(own & kings) - count(opponent & kings),
+        count(own_men & BACK_RANKS[player])
+        - count(opponent_men & BACK_RANKS[other]),
+        count(own & CENTRE) - count(opponent & CENTRE),
+        mobility(own, kings, empty, player)
+        - mobility(opponent, kings, empty, other),
+        runaways(own_men, opponent, player)
+        - runaways(opponent_men, own, other),
+    ], axis=1)
+
+
+def batch_evaluation(own, opponent, kings, player, weights=WEIGHTS):
+    '''
+    Function -- batch_evaluation
+        Score a batch of positions with one matrix-vector product of their
+        features and weights
+    Parameters:
+        own -- a numpy array of the pieces of each board's player to move
+        opponent -- a numpy array of the opponent pieces of each board
+        kings -- a numpy array of the kings of each board
+        player -- a numpy array of the index in PLAYER of each board's
+        player to move
+        weights -- a numpy array of one weight for each of FEATURES
+    Returns:
+        A numpy array of integer scores, each from the point of view of the
+        board's player to move
+    '''
+    return feature_matrix(own, opponent, kings, player) @ weights
+
+
+def evaluate_boards(boards, weights=WEIGHTS):
+    '''
+    Function -- evaluate_boards
+        Score a list of boards in one call
+    Parameters:
+        boards -- a list of BitBoard objects
+        weights -- a numpy array of one weight for each of FEATURES
+    Returns:
+        A list of integer scores, each from the point of view of the board's
+        player to move
+    '''
+    if not boards:
+        return []
+    return batch_evaluation(*board_arrays(boards), weights).tolist()
+
+
+def linear_evaluation(board):
+    '''
+    Function -- linear_evaluation
+        Score one position with the batch evaluation, so a search can mix
+        single and batched calls of the same evaluation
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        An integer score from the point of view of the current player
+    '''
+    return evaluate_boards([board])[0]
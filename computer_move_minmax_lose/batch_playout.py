@@ -0,0 +1,292 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import numpy as np
+
+from bitboard import EVEN_ROWS, ODD_ROWS, LEFT_EDGE, RIGHT_EDGE,\
+    BLACK_KING_ROW, RED_KING_ROW, FULL_MASK, HALF_ROW, DARK_SQUARES,\
+    PLAYER, BLACK, RED
+
+# np.bitwise_count counts the pieces of many masks at once
+if not hasattr(np, "bitwise_count"):
+    raise ImportError("batched playouts need numpy 2.0 or newer, found %s"
+                      % np.__version__)
+
+PLAYOUT_PLIES = 150
+# Winner of a playout: the index of its color in PLAYER, or NO_WINNER
+NO_WINNER = -1
+FULL = np.uint64(FULL_MASK)
+EVEN = np.uint64(EVEN_ROWS)
+ODD = np.uint64(ODD_ROWS)
+EVEN_INSIDE = np.uint64(EVEN_ROWS & ~RIGHT_EDGE)
+ODD_INSIDE = np.uint64(ODD_ROWS & ~LEFT_EDGE)
+KING_ROWS = np.array([BLACK_KING_ROW, RED_KING_ROW], dtype=np.uint64)
+STEP = np.uint64(HALF_ROW)
+ONE = np.uint64(1)
+NUM_SHIFTS = 4
+# Directions in the order of bitboard.SHIFTS, the men of PLAYER[0] move
+# along the first two and the men of PLAYER[1] along the last two
+MEN_FORWARD = np.array([[True, True, False, False],
+                        [False, False, True, True]])
+
+
+def up_left(mask):
+    '''
+    Function -- up_left
+        Shift every square of an array of bitmasks one step towards
+        (row + 1, col - 1), as bitboard.up_left does for one bitmask
+    Parameters:
+        mask -- a numpy array of uint64 bitmasks
+    Returns:
+        The shifted bitmasks
+    '''
+    return (((mask & EVEN) << STEP) | ((mask & ODD_INSIDE) << (STEP - ONE))
+            ) & FULL
+
+
+def up_right(mask):
+    '''
+    Function -- up_right
+        Shift every square of an array of bitmasks one step towards
+        (row + 1, col + 1)
+    Parameters:
+        mask -- a numpy array of uint64 bitmasks
+    Returns:
+        The shifted bitmasks
+    '''
+    return (((mask & EVEN_INSIDE) << (STEP + ONE)) | ((mask & ODD) << STEP)
+            ) & FULL
+
+
+def down_left(mask):
+    '''
+    Function -- down_left
+        Shift every square of an array of bitmasks one step towards
+        (row - 1, col - 1)
+    Parameters:
+        mask -- a numpy array of uint64 bitmasks
+    Returns:
+        The shifted bitmasks
+    '''
+    return ((mask & EVEN) >> STEP) | ((mask & ODD_INSIDE) >> (STEP + ONE))
+
+
+def down_right(mask):
+    '''
+    Function -- down_right
+        Shift every square of an array of bitmasks one step towards
+        (row - 1, col + 1)
+    Parameters:
+        mask -- a numpy array of uint64 bitmasks
+    Returns:
+        The shifted bitmasks
+    '''
+    return ((mask & EVEN_INSIDE) >> (STEP - ONE)) | ((mask & ODD) >> STEP)
+
+
+SHIFTS = (up_left, up_right, down_left, down_right)
+# The shift undoing each of SHIFTS
+REVERSE_SHIFTS = (down_right, down_left, up_right, up_left)
+
+
+def reverse_shift(mask, direction):
+    '''
+    Function -- reverse_shift
+        Shift each bitmask back along its own direction
+    Parameters:
+        mask -- a numpy array of uint64 bitmasks
+        direction -- a numpy array of indices into SHIFTS
+    Returns:
+        The shifted bitmasks
+    '''
+    return np.choose(direction, [shift(mask) for shift in REVERSE_SHIFTS])
+
+
+def choose_squares(masks, generator):
+    '''
+    Function -- choose_squares
+        Pick one set bit of each row of bitmasks at random, every set bit of
+        a row being equally likely: a random rank among the set bits picks
+        the direction by the bit counts of each direction, then the bit by
+        halving the bitmask until one bit is left
+    Parameters:
+        masks -- a numpy array of shape (boards, NUM_SHIFTS) of uint64
+        bitmasks, one for each direction
+        generator -- a numpy random Generator
+    Returns:
+        Boolean array of the boards with a set bit, the direction and the
+        bitmask of the chosen bit, the bitmask is 0 for a board without one
+    '''
+    counts = np.bitwise_count(masks).astype(np.intp)
+    ends = counts.cumsum(axis=1)
+    total = ends[:, -1]
+    found = total > 0
+    rank = (generator.random(len(masks)) * total).astype(np.intp)
+    direction = (ends <= rank[:, None]).sum(axis=1)
+    direction = np.minimum(direction, NUM_SHIFTS - 1)
+    rows = np.arange(len(masks))
+    rank -= ends[rows, direction] - counts[rows, direction]
+    mask = masks[rows, direction]
+    offset = np.zeros(len(masks), dtype=np.uint64)
+    width = DARK_SQUARES // 2
+    while width:
+        low = np.bitwise_count((mask >> offset)
+                               & np.uint64((1 << width) - 1))
+        high = rank >= low
+        rank -= np.where(high, low, 0)
+        offset += np.where(high, np.uint64(width), np.uint64(0))
+        width //= 2
+    bit = np.where(found, ONE << offset, np.uint64(0))
+    return found, direction, bit
+
+
+def jump_landings(pieces, opponent, empty):
+    '''
+    Function -- jump_landings
+        Calculate where pieces can land by jumping in each direction
+    Parameters:
+        pieces -- a numpy array of shape (boards, NUM_SHIFTS), the pieces
+        allowed to move in each direction
+        opponent -- a numpy array of the opponent pieces of each board
+        empty -- a numpy array of the empty squares of each board
+    Returns:
+        A numpy array of shape (boards, NUM_SHIFTS) of landing bitmasks
+    '''
+    return np.stack([shift(shift(pieces[:, number]) & opponent) & empty
+                     for number, shift in enumerate(SHIFTS)], axis=1)
+
+
+def allowed_pieces(pieces, kings, player):
+    '''
+    Function -- allowed_pieces
+        Split pieces by the directions they may move in, men only move
+        forward and kings move every way
+    Parameters:
+        pieces -- a numpy array of bitmasks of the pieces of each board
+        kings -- a numpy array of the kings of each board
+        player -- a numpy array of the index in PLAYER of each board's
+        player to move
+    Returns:
+        A numpy array of shape (boards, NUM_SHIFTS)
+    '''
+    return np.where(MEN_FORWARD[player], pieces[:, None],
+                    (pieces & kings)[:, None])
+
+
+def play_random_moves(own, opponent, kings, player, generator):
+    '''
+    Function -- play_random_moves
+        Make one random legal move on each board, a capture if the board has
+        one, every jump of a capture path included, the move of a man
+        reaching its last row ends there and crowns it
+    Parameters:
+        own -- a numpy array of the pieces of each board's player to move
+        opponent -- a numpy array of the opponent pieces of each board
+        kings -- a numpy array of the kings of each board
+        player -- a numpy array of the index in PLAYER of each board's
+        player to move
+        generator -- a numpy random Generator
+    Returns:
+        Boolean array of the boards where a move was made, and the new
+        own, opponent and kings arrays, the player to move is not switched
+    '''
+    empty = ~(own | opponent) & FULL
+    pieces = allowed_pieces(own, kings, player)
+    jumps = jump_landings(pieces, opponent, empty)
+    steps = np.stack([shift(pieces[:, number]) & empty
+                      for number, shift in enumerate(SHIFTS)], axis=1)
+    jumping = (jumps != 0).any(axis=1)
+    moved, direction, land = choose_squares(
+        np.where(jumping[:, None], jumps, steps), generator)
+    back = reverse_shift(land, direction)
+    over = np.where(jumping, back, np.uint64(0))
+    source = np.where(jumping, reverse_shift(back, direction), back)
+    source = np.where(moved, source, np.uint64(0))
+    king_rows = KING_ROWS[player]
+    while True:
+        crowned = (land & king_rows != 0) & (kings & source == 0)
+        moving_king = (kings & source) != 0
+        own = own ^ source ^ land
+        kings = kings ^ np.where(moving_king, source ^ land, np.uint64(0))
+        kings = kings | np.where(crowned, land, np.uint64(0))
+        opponent = opponent & ~over
+        kings = kings & ~over
+        going_on = jumping & ~crowned & (land != 0)
+        if not going_on.any():
+            return moved, own, opponent, kings
+        # keep jumping with the piece which just landed
+        piece = np.where(going_on, land, np.uint64(0))
+        empty = ~(own | opponent) & FULL
+        jumps = jump_landings(allowed_pieces(piece, kings, player), opponent,
+                              empty)
+        jumping, direction, next_land = choose_squares(jumps, generator)
+        over = np.where(jumping, reverse_shift(next_land, direction),
+                        np.uint64(0))
+        source = np.where(jumping, piece, np.uint64(0))
+        land = next_land
+
+
+def batch_playouts(black, red, kings, player, max_plies=PLAYOUT_PLIES,
+                   generator=None):
+    '''
+    Function -- batch_playouts
+        Finish many games at once with random legal moves, every board makes
+        its move of each ply in the same numpy operations
+    Parameters:
+        black -- an array of the black pieces of each board
+        red -- an array of the red pieces of each board
+        kings -- an array of the kings of each board
+        player -- an array of the index in PLAYER of each board's player to
+        move
+        max_plies -- the number of moves after which a game is a draw
+        generator -- a numpy random Generator, a new one if None
+    Returns:
+        A numpy array of the index in PLAYER of each game's winner, or
+        NO_WINNER for a draw
+    '''
+    generator = generator or np.random.default_rng()
+    black = np.asarray(black, dtype=np.uint64)
+    red = np.asarray(red, dtype=np.uint64)
+    kings = np.array(kings, dtype=np.uint64)
+    player = np.array(player, dtype=np.intp)
+    own = np.where(player == 0, black, red)
+    opponent = np.where(player == 0, red, black)
+    winner = np.full(len(player), NO_WINNER, dtype=np.int8)
+    active = np.arange(len(player))
+    for _ in range(max_plies):
+        if not len(active):
+            break
+        moved, new_own, new_opponent, new_kings = play_random_moves(
+            own[active], opponent[active], kings[active], player[active],
+            generator)
+        winner[active[~moved]] = 1 - player[active[~moved]]
+        active = active[moved]
+        # the opponent is to move next, so the two sides swap
+        own[active], opponent[active] = new_opponent[moved], new_own[moved]
+        kings[active] = new_kings[moved]
+        player[active] ^= 1
+    return winner
+
+
+def playout_board(board, count, max_plies=PLAYOUT_PLIES, generator=None):
+    '''
+    Function -- playout_board
+        Finish a position many times with random legal moves
+    Parameters:
+        board -- a BitBoard object
+        count -- the number of playouts
+        max_plies -- the number of moves after which a game is a draw
+        generator -- a numpy random Generator, a new one if None
+    Returns:
+        A dictionary mapping BLACK, RED and None for a draw to the number
+        of playouts with that result
+    '''
+    winner = batch_playouts(np.full(count, board.black, dtype=np.uint64),
+                            np.full(count, board.red, dtype=np.uint64),
+                            np.full(count, board.kings, dtype=np.uint64),
+                            np.full(count, PLAYER.index(board.current_player)),
+                            max_plies, generator)
+    results = np.bincount(winner + 1, minlength=len(PLAYER) + 1)
+    return {None: int(results[0]), BLACK: int(results[1]),
+            RED: int(results[2])}
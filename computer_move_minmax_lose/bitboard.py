@@ -0,0 +1,797 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+from collections import namedtuple
+
+from zobrist import PIECE_KEYS, SIDE_KEY
+
+NUM_SQUARES = 8
+INITIAL_ROWS = 3
+BLACK = "black"
+RED = "dark red"
+EMPTY = "empty"
+KING = "king"
+PLAYER = [BLACK, RED]
+HALF_ROW = NUM_SQUARES // 2
+DARK_SQUARES = NUM_SQUARES * HALF_ROW
+FULL_MASK = (1 << DARK_SQUARES) - 1
+
+
+def square_index(row, col):
+    '''
+    Function -- square_index
+        Calculate the bit index of a dark square
+    Parameters:
+        row -- the square's row position
+        col -- the square's col position
+    Returns:
+        An integer between 0 and DARK_SQUARES - 1, counted row by row from
+        row 0 and from left to right inside a row
+    '''
+    return row * HALF_ROW + col // 2
+
+
+def square_position(index):
+    '''
+    Function -- square_position
+        Calculate the row and col of a dark square from its bit index
+    Parameters:
+        index -- the bit index of the square
+    Returns:
+        A tuple (row, col) of the square on the board
+    '''
+    row = index // HALF_ROW
+    col = 2 * (index % HALF_ROW) + (row + 1) % 2
+    return row, col
+
+
+def row_mask(rows):
+    '''
+    Function -- row_mask
+        Build a bitmask covering every dark square of the given rows
+    Parameters:
+        rows -- an iterable of row positions
+    Returns:
+        An integer bitmask
+    '''
+    mask = 0
+    for row in rows:
+        mask |= ((1 << HALF_ROW) - 1) << (row * HALF_ROW)
+    return mask
+
+
+EVEN_ROWS = row_mask(range(0, NUM_SQUARES, 2))
+ODD_ROWS = row_mask(range(1, NUM_SQUARES, 2))
+# col 0 only holds dark squares on odd rows, col NUM_SQUARES - 1 on even rows
+LEFT_EDGE = ODD_ROWS & sum(1 << (row * HALF_ROW)
+                           for row in range(NUM_SQUARES))
+RIGHT_EDGE = EVEN_ROWS & sum(1 << (row * HALF_ROW + HALF_ROW - 1)
+                             for row in range(NUM_SQUARES))
+BLACK_KING_ROW = row_mask([NUM_SQUARES - 1])
+RED_KING_ROW = row_mask([0])
+POSITIONS = [square_position(index) for index in range(DARK_SQUARES)]
+# A whole move of one player: path holds the movable piece followed by
+# every landing square, captures holds the squares of the captured pieces
+Move = namedtuple("Move", ["path", "captures"])
+
+
+def up_left(mask):
+    '''
+    Function -- up_left
+        Shift every square of a bitmask one step towards (row + 1, col - 1)
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        The shifted bitmask, squares falling off the board are dropped
+    '''
+    return (((mask & EVEN_ROWS) << HALF_ROW)
+            | ((mask & ODD_ROWS & ~LEFT_EDGE) << (HALF_ROW - 1))) & FULL_MASK
+
+
+def up_right(mask):
+    '''
+    Function -- up_right
+        Shift every square of a bitmask one step towards (row + 1, col + 1)
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        The shifted bitmask, squares falling off the board are dropped
+    '''
+    return (((mask & EVEN_ROWS & ~RIGHT_EDGE) << (HALF_ROW + 1))
+            | ((mask & ODD_ROWS) << HALF_ROW)) & FULL_MASK
+
+
+def down_left(mask):
+    '''
+    Function -- down_left
+        Shift every square of a bitmask one step towards (row - 1, col - 1)
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        The shifted bitmask, squares falling off the board are dropped
+    '''
+    return (((mask & EVEN_ROWS) >> HALF_ROW)
+            | ((mask & ODD_ROWS & ~LEFT_EDGE) >> (HALF_ROW + 1)))
+
+
+def down_right(mask):
+    '''
+    Function -- down_right
+        Shift every square of a bitmask one step towards (row - 1, col + 1)
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        The shifted bitmask, squares falling off the board are dropped
+    '''
+    return (((mask & EVEN_ROWS & ~RIGHT_EDGE) >> (HALF_ROW - 1))
+            | ((mask & ODD_ROWS) >> HALF_ROW))
+
+
+# Same order as GameState.move_direction: forward moves of black first
+SHIFTS = (up_left, up_right, down_left, down_right)
+BLACK_SHIFTS = SHIFTS[:2]
+RED_SHIFTS = SHIFTS[2:]
+# Shifts leading from a target square back to the piece stepping onto it
+BLACK_SOURCES = (down_right, down_left)
+RED_SOURCES = (up_right, up_left)
+PIECE_SHIFTS = {BLACK: BLACK_SHIFTS, RED: RED_SHIFTS, BLACK + KING: SHIFTS,
+                RED + KING: SHIFTS}
+OPPONENTS = {BLACK: RED, RED: BLACK}
+KINGS = {BLACK: BLACK + KING, RED: RED + KING}
+SQUARE_INDICES = {position: index for index, position in enumerate(POSITIONS)}
+
+
+def build_move_tables():
+    '''
+    Function -- build_move_tables
+        Calculate, for each piece and each dark square, its non capture
+        moves and its jumps, in the order of the piece's shifts, so moves
+        are generated without shifting single squares
+    Parameters:
+        None
+    Returns:
+        Two dictionaries keyed by piece, each value is a list indexed by
+        square index: of tuples of (target bit, Move) for the steps, and of
+        tuples of (over bit, landing bit, over index, landing index) for
+        the jumps
+    '''
+    step_table = {}
+    jump_table = {}
+    for piece, shifts in PIECE_SHIFTS.items():
+        steps, jumps = [], []
+        for index in range(DARK_SQUARES):
+            bit = 1 << index
+            square_steps, square_jumps = [], []
+            for shift in shifts:
+                target = shift(bit)
+                if not target:
+                    continue
+                target_index = target.bit_length() - 1
+                square_steps.append((target, Move(
+                    (POSITIONS[index], POSITIONS[target_index]), ())))
+                land = shift(target)
+                if land:
+                    square_jumps.append((target, land, target_index,
+                                         land.bit_length() - 1))
+            steps.append(tuple(square_steps))
+            jumps.append(tuple(square_jumps))
+        step_table[piece] = steps
+        jump_table[piece] = jumps
+    return step_table, jump_table
+
+
+# Built once at import, non capture moves are shared Move objects
+STEP_TABLE, JUMP_TABLE = build_move_tables()
+
+
+def bit_count(mask):
+    '''
+    Function -- bit_count
+        Count the squares set in a bitmask
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        The number of set bits
+    '''
+    return bin(mask).count("1")
+
+
+def bit_indices(mask):
+    '''
+    Function -- bit_indices
+        Iterate over the squares set in a bitmask, lowest index first
+    Parameters:
+        mask -- an integer bitmask
+    Returns:
+        A generator of bit indices
+    '''
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitBoard:
+    '''
+    Class -- BitBoard
+        Represents the checkerboard as bitmasks over the dark squares, an
+        alternative to the nested list of GameState for fast move generation
+    Attributes:
+        black -- A bitmask of the squares holding black pieces
+        red -- A bitmask of the squares holding red pieces
+        kings -- A bitmask of the squares holding kings of either color
+        current_player -- A String, use piece colors to represent who is
+        the current player
+        hash_key -- The Zobrist hash of the position and current player,
+        updated incrementally by make_move
+        history -- A stack of undo records, one for each move made
+    Methods:
+        from_squares -- Build a BitBoard from a nested list of squares
+        from_masks -- Build a BitBoard from the bitmasks of its pieces
+        compute_hash -- Calculate the Zobrist hash of the board from scratch
+        to_squares -- Build the nested list of squares of this BitBoard
+        piece_at -- Get the piece on a square in GameState notation
+        player_masks -- Get the bitmasks of the current player and opponent
+        piece_shifts -- Get the move directions of the piece on a square
+        source_shifts -- Get the shifts leading from a target square back to
+        the pieces of current player able to reach it
+        movers -- Calculate the pieces of current player with a non capture
+        move
+        jumpers -- Calculate the pieces of current player with a capture move
+        non_capture_move -- Calculate all the possible non capture moves of
+        current piece
+        capture_move -- Calculate all possible capture moves of current piece
+        move_options -- Calculate all possible moves(capture and non capture)
+        and possible movable pieces of the current player
+        capture_sequences -- Calculate every complete capture path of a piece
+        iter_moves -- Generate the legal moves of the current player one at a
+        time, capture moves first
+        legal_moves -- Calculate all legal moves of the current player
+        has_any_legal_move -- Check if the current player can move
+        make_move -- Make a move and switch the current player
+        apply_record -- XOR an undo record into the board, which both makes
+        and takes back its move
+        unmake_move -- Take back the last move made
+        copy -- Copy the position without its history
+        play -- Make a move on a copy of the board
+        switch_turn -- Switch the current player
+        game_end -- Check if the game ends or not
+    '''
+
+    def __init__(self):
+        '''
+        Constructor -- create a new instance of BitBoard in the initial
+        position
+        Parameters:
+            self -- the current BitBoard object
+        '''
+        self.black = row_mask(range(INITIAL_ROWS))
+        self.red = row_mask(range(NUM_SQUARES - INITIAL_ROWS, NUM_SQUARES))
+        self.kings = 0
+        self.current_player = PLAYER[0]
+        self.hash_key = self.compute_hash()
+        self.history = []
+
+    @classmethod
+    def from_squares(cls, squares, current_player):
+        '''
+        Method -- from_squares
+            Build a BitBoard from a nested list of squares
+        Parameters:
+            cls -- the BitBoard class
+            squares -- a nested list in the format of GameState.squares
+            current_player -- the color of the player to move
+        Returns:
+            A new BitBoard object holding the same position
+        '''
+        board = cls()
+        board.black, board.red, board.kings = 0, 0, 0
+        board.current_player = current_player
+        for row in range(NUM_SQUARES):
+            for col in range(NUM_SQUARES):
+                piece = squares[row][col]
+                if piece == EMPTY or row % 2 == col % 2:
+                    continue
+                bit = 1 << square_index(row, col)
+                if piece.startswith(BLACK):
+                    board.black |= bit
+                else:
+                    board.red |= bit
+                if piece.endswith(KING):
+                    board.kings |= bit
+        board.hash_key = board.compute_hash()
+        return board
+
+    @classmethod
+    def from_masks(cls, black, red, kings, current_player):
+        '''
+        Method -- from_masks
+            Build a BitBoard from the bitmasks of its pieces
+        Parameters:
+            cls -- the BitBoard class
+            black -- a bitmask of the squares holding black pieces
+            red -- a bitmask of the squares holding red pieces
+            kings -- a bitmask of the squares holding kings of either color
+            current_player -- the color of the player to move
+        Returns:
+            A new BitBoard object
+        '''
+        board = cls.__new__(cls)
+        board.black, board.red, board.kings = black, red, kings
+        board.current_player = current_player
+        board.hash_key = board.compute_hash()
+        board.history = []
+        return board
+
+    def compute_hash(self):
+        '''
+        Method -- compute_hash
+            Calculate the Zobrist hash of the board from scratch
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A 64 bit integer
+        '''
+        key = 0
+        for index in bit_indices(self.black | self.red):
+            key ^= PIECE_KEYS[self.piece_at(*POSITIONS[index])][index]
+        if self.current_player != BLACK:
+            key ^= SIDE_KEY
+        return key
+
+    def to_squares(self):
+        '''
+        Method -- to_squares
+            Build the nested list of squares of this BitBoard
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A nested list in the format of GameState.squares
+        '''
+        squares = [[EMPTY for _ in range(NUM_SQUARES)] for _ in
+                   range(NUM_SQUARES)]
+        for index in bit_indices(self.black | self.red):
+            row, col = square_position(index)
+            squares[row][col] = self.piece_at(row, col)
+        return squares
+
+    @property
+    def squares(self):
+        '''
+        Property -- squares
+            A read only nested list view of the board, so code drawing a
+            GameState can draw a BitBoard as well
+        '''
+        return self.to_squares()
+
+    def piece_at(self, row, col):
+        '''
+        Method -- piece_at
+            Get the piece on a square in GameState notation
+        Parameters:
+            self -- the current BitBoard object
+            row -- the square's row position
+            col -- the square's col position
+        Returns:
+            One of EMPTY, BLACK, RED, BLACK + KING, RED + KING
+        '''
+        if row % 2 == col % 2:
+            return EMPTY
+        bit = 1 << square_index(row, col)
+        piece = EMPTY
+        if self.black & bit:
+            piece = BLACK
+        elif self.red & bit:
+            piece = RED
+        if piece != EMPTY and self.kings & bit:
+            piece = piece + KING
+        return piece
+
+    def player_masks(self):
+        '''
+        Method -- player_masks
+            Get the bitmasks of the current player and opponent
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            Two bitmasks, pieces of the current player and of the opponent
+        '''
+        if self.current_player == BLACK:
+            return self.black, self.red
+        return self.red, self.black
+
+    def piece_shifts(self, bit):
+        '''
+        Method -- piece_shifts
+            Get the move directions of the piece on a square
+        Parameters:
+            self -- the current BitBoard object
+            bit -- the bitmask of a single square
+        Returns:
+            A tuple of shift functions, empty if the square is empty
+        '''
+        if self.kings & bit:
+            return SHIFTS
+        elif self.black & bit:
+            return BLACK_SHIFTS
+        elif self.red & bit:
+            return RED_SHIFTS
+        return ()
+
+    def source_shifts(self):
+        '''
+        Method -- source_shifts
+            Get the shifts leading from a target square back to the pieces of
+            current player able to reach it
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            Two tuples of shift functions, the first one for every piece of
+            current player and the second one for its kings only
+        '''
+        if self.current_player == BLACK:
+            return BLACK_SOURCES, RED_SOURCES
+        return RED_SOURCES, BLACK_SOURCES
+
+    def movers(self):
+        '''
+        Method -- movers
+            Calculate the pieces of current player with a non capture move
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A bitmask of the movable pieces
+        '''
+        own, _ = self.player_masks()
+        empty = ~(self.black | self.red) & FULL_MASK
+        men_sources, king_sources = self.source_shifts()
+        mask = 0
+        for reverse in men_sources:
+            mask |= reverse(empty) & own
+        own_kings = own & self.kings
+        if own_kings:
+            for reverse in king_sources:
+                mask |= reverse(empty) & own_kings
+        return mask
+
+    def jumpers(self):
+        '''
+        Method -- jumpers
+            Calculate the pieces of current player with a capture move
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A bitmask of the pieces able to capture
+        '''
+        own, opponent = self.player_masks()
+        empty = ~(self.black | self.red) & FULL_MASK
+        men_sources, king_sources = self.source_shifts()
+        mask = 0
+        for reverse in men_sources:
+            mask |= reverse(reverse(empty) & opponent) & own
+        own_kings = own & self.kings
+        if own_kings:
+            for reverse in king_sources:
+                mask |= reverse(reverse(empty) & opponent) & own_kings
+        return mask
+
+    def non_capture_move(self, row, col):
+        '''
+        Method -- non_capture_move
+            Calculate all the possible non capture moves of current piece
+        Parameters:
+            self -- the current BitBoard object
+            row -- the current click's row position
+            col -- the current click's col position
+        Returns:
+            A list storing the locations of all possible non capture moves of
+            current piece
+        '''
+        possible_moves = []
+        if row % 2 == col % 2:
+            return possible_moves
+        bit = 1 << square_index(row, col)
+        empty = ~(self.black | self.red) & FULL_MASK
+        for shift in self.piece_shifts(bit):
+            target = shift(bit) & empty
+            if target:
+                possible_moves.append(square_position(target.bit_length()
+                                                      - 1))
+        return possible_moves
+
+    def capture_move(self, row, col):
+        '''
+        Method -- capture_move
+            Calculate all the possible capture moves of current piece
+        Parameters:
+            self -- the current BitBoard object
+            row -- the current click's row position
+            col -- the current click's col position
+        Returns:
+            A list storing the locations of all possible capture moves of
+            current piece
+        '''
+        possible_capture_moves = []
+        if row % 2 == col % 2:
+            return possible_capture_moves
+        bit = 1 << square_index(row, col)
+        _, opponent = self.player_masks()
+        empty = ~(self.black | self.red) & FULL_MASK
+        for shift in self.piece_shifts(bit):
+            target = shift(shift(bit) & opponent) & empty
+            if target:
+                possible_capture_moves.append(
+                    square_position(target.bit_length() - 1))
+        return possible_capture_moves
+
+    def move_options(self):
+        '''
+        Method -- move_options
+            Calculate all the possible moves(capture and non capture) and
+            possible movable pieces of the current player
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            Four lists storing the locations of all possible non capture
+            capture moves, corresponding movable pieces, all possible capture
+            capture moves, and corresponding movable pieces, in the same
+            order as GameState.move_options
+        '''
+        non_capture_options = []
+        capture_options = []
+        non_capture_movable_options = []
+        capture_movable_options = []
+        movers = self.movers()
+        jumpers = self.jumpers()
+        for index in bit_indices(movers | jumpers):
+            piece = square_position(index)
+            if movers >> index & 1:
+                for item in self.non_capture_move(*piece):
+                    non_capture_options.append(item)
+                    non_capture_movable_options.append(piece)
+            if jumpers >> index & 1:
+                for item in self.capture_move(*piece):
+                    capture_options.append(item)
+                    capture_movable_options.append(piece)
+        return non_capture_options, non_capture_movable_options,\
+            capture_options, capture_movable_options
+
+    def capture_sequences(self, index, jumps, opponent, empty):
+        '''
+        Method -- capture_sequences
+            Calculate every complete capture path of a piece, a man arriving
+            at the last row is upgraded as king and its move ends there, as
+            a man has no jump forward from the last row
+        Parameters:
+            self -- the current BitBoard object
+            index -- the square index of the jumping piece
+            jumps -- the JUMP_TABLE list of the jumping piece
+            opponent -- a bitmask of the pieces which can still be captured
+            empty -- a bitmask of the empty squares
+        Returns:
+            A list of (landing indices, captured indices) tuples, empty if
+            the piece has no capture move
+        '''
+        sequences = []
+        for over, land, over_index, land_index in jumps[index]:
+            if not (over & opponent and land & empty):
+                continue
+            rest = self.capture_sequences(land_index, jumps, opponent ^ over,
+                                          (empty | over | 1 << index) ^ land)
+            if not rest:
+                sequences.append(((land_index,), (over_index,)))
+            for landings, captures in rest:
+                sequences.append(((land_index,) + landings,
+                                  (over_index,) + captures))
+        return sequences
+
+    def iter_moves(self):
+        '''
+        Method -- iter_moves
+            Generate the legal moves of the current player one at a time,
+            capture moves first, non capture moves are only looked for when
+            there is no capture move
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A generator of Move objects
+        '''
+        own, opponent = self.player_masks()
+        empty = ~(own | opponent) & FULL_MASK
+        man = self.current_player
+        king = KINGS[man]
+        kings = self.kings
+        jumpers = self.jumpers()
+        if jumpers:
+            while jumpers:
+                bit = jumpers & -jumpers
+                jumpers ^= bit
+                index = bit.bit_length() - 1
+                jumps = JUMP_TABLE[king if kings & bit else man]
+                for landings, captures in self.capture_sequences(
+                        index, jumps, opponent, empty):
+                    yield Move((POSITIONS[index],)
+                               + tuple(POSITIONS[land] for land in landings),
+                               tuple(POSITIONS[over] for over in captures))
+            return
+        movers = self.movers()
+        while movers:
+            bit = movers & -movers
+            movers ^= bit
+            steps = STEP_TABLE[king if kings & bit else man]
+            for target, move in steps[bit.bit_length() - 1]:
+                if target & empty:
+                    yield move
+
+    def legal_moves(self):
+        '''
+        Method -- legal_moves
+            Calculate all legal moves of the current player, capture moves
+            are mandatory and are enumerated as complete capture paths
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A list of Move objects
+        '''
+        return list(self.iter_moves())
+
+    def has_any_legal_move(self):
+        '''
+        Method -- has_any_legal_move
+            Check if the current player can move
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            True or False if the current player has a legal move or not
+        '''
+        return bool(self.jumpers() or self.movers())
+
+    def make_move(self, move):
+        '''
+        Method -- make_move
+            Make a move and switch the current player, the undo record only
+            holds the changed squares so the move is taken back by XOR
+        Parameters:
+            self -- the current BitBoard object
+            move -- a Move object of the current player
+        Returns:
+            Nothing
+        '''
+        path = move.path
+        origin_index = SQUARE_INDICES[path[0]]
+        target_index = SQUARE_INDICES[path[-1]]
+        moved = (1 << origin_index) ^ (1 << target_index)
+        own = self.current_player
+        opponent = OPPONENTS[own]
+        kings = self.kings
+        delta = SIDE_KEY
+        captured = 0
+        for square in move.captures:
+            index = SQUARE_INDICES[square]
+            captured |= 1 << index
+            if kings >> index & 1:
+                delta ^= PIECE_KEYS[KINGS[opponent]][index]
+            else:
+                delta ^= PIECE_KEYS[opponent][index]
+        captured_kings = captured & kings
+        king_moved, promoted = 0, 0
+        if kings >> origin_index & 1:
+            king_moved = moved
+            own_keys = PIECE_KEYS[KINGS[own]]
+            delta ^= own_keys[origin_index] ^ own_keys[target_index]
+        else:
+            # a man is crowned on the last row, where its move ends
+            if 1 << target_index & (BLACK_KING_ROW | RED_KING_ROW):
+                promoted = 1 << target_index
+                delta ^= (PIECE_KEYS[own][origin_index]
+                          ^ PIECE_KEYS[KINGS[own]][target_index])
+            else:
+                delta ^= (PIECE_KEYS[own][origin_index]
+                          ^ PIECE_KEYS[own][target_index])
+        kings = captured_kings ^ king_moved ^ promoted
+        self.apply_record(own, moved, captured, kings, delta)
+        self.current_player = opponent
+        self.history.append((moved, captured, kings, delta))
+
+    def apply_record(self, mover, moved, captured, kings, delta):
+        '''
+        Method -- apply_record
+            XOR an undo record into the board, which both makes and takes
+            back the move of the record
+        Parameters:
+            self -- the current BitBoard object
+            mover -- the color of the player making the move
+            moved -- the origin and target squares of the moving piece
+            captured -- the squares of the captured pieces
+            kings -- the squares whose king bit changes
+            delta -- the change of the Zobrist hash
+        Returns:
+            Nothing
+        '''
+        if mover == BLACK:
+            self.black ^= moved
+            self.red ^= captured
+        else:
+            self.red ^= moved
+            self.black ^= captured
+        self.kings ^= kings
+        self.hash_key ^= delta
+
+    def unmake_move(self):
+        '''
+        Method -- unmake_move
+            Take back the last move made
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            Nothing
+        '''
+        moved, captured, kings, delta = self.history.pop()
+        mover = OPPONENTS[self.current_player]
+        self.apply_record(mover, moved, captured, kings, delta)
+        self.current_player = mover
+
+    def copy(self):
+        '''
+        Method -- copy
+            Copy the position without its history
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A new BitBoard object
+        '''
+        board = BitBoard.__new__(BitBoard)
+        board.black, board.red, board.kings = self.black, self.red, self.kings
+        board.current_player = self.current_player
+        board.hash_key = self.hash_key
+        board.history = []
+        return board
+
+    def play(self, move):
+        '''
+        Method -- play
+            Make a move on a copy of the board
+        Parameters:
+            self -- the current BitBoard object
+            move -- a Move object of the current player
+        Returns:
+            A new BitBoard object holding the position after the move
+        '''
+        board = self.copy()
+        board.make_move(move)
+        return board
+
+    def switch_turn(self):
+        '''
+        Method -- switch_turn
+            Switch the current player
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            Nothing
+        '''
+        self.current_player = PLAYER[(PLAYER.index(self.current_player) + 1)
+                                     % 2]
+
+    def game_end(self):
+        '''
+        Method -- game_end
+            Check if the game ends or not
+        Parameters:
+            self -- the current BitBoard object
+        Returns:
+            A boolean to represent if the game ends and the result prompt to
+            show which player wins the game
+        '''
+        BLACK_WIN = "Game Over! You win!"
+        RED_WIN = "Game Over! Red player wins!"
+        if not self.black:
+            return True, RED_WIN
+        elif not self.red:
+            return True, BLACK_WIN
+        elif not self.has_any_legal_move():
+            if self.current_player == BLACK:
+                return True, RED_WIN
+            return True, BLACK_WIN
+        return False, " "
@@ -2,7 +2,11 @@
 Xiaoxi Yang
 Code for project_Checkers Game
 '''
+import math
 import turtle
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from bitboard import BitBoard
 from game_state import GameState
 
 NUM_SQUARES = 8
@@ -15,10 +19,16 @@ EMPTY = "empty"
 KING = "king"
 SQUARE_COLORS = ("light gray", "white")
 PIECES_COLORS = ("black", "dark red")
-DELAY_TIME = 1000
+# Milliseconds between two looks at whether the computer's search is done
+POLL_TIME = 50
 CLOSE_WINDOW = "Click again to close the window."
 TURN_REMINDER = "It's your turn now."
-game = GameState()
+THINKING = "The computer is thinking..."
+# Corners of the polygons approximating a piece
+CIRCLE_POINTS = 36
+# Heading of the stamping pen, at which shape coordinates are screen ones
+NORTH = 90
+FRAME_COLORS = {"movable": "blue", "move": "red"}
 
 
 class Board:
@@ -26,32 +36,71 @@ class Board:
     Class -- Board
         Draw the board, pieces and represents the UI
     Attributes:
+        game -- The GameState object of the game shown
+        drawn -- A nested list of the pieces on each square when it was last
+        drawn, compared with the game's squares to find what to draw again
+        framed -- A list of the (row, col) squares with a highlight frame
+        pen -- a turtle object, stamps the registered shapes of pieces and
+        highlight frames, the only turtle used after the board is drawn
+        stamps -- A dictionary mapping each (row, col) square to the ids of
+        the stamps on it, cleared before the square is stamped again
+        executor -- A ThreadPoolExecutor with one thread, runs the computer
+        player's search so the turtle event loop goes on meanwhile
+        thinking -- The Future of the running search, or None
+        stopping -- The Future of the last cancelled search, or None, the
+        next search waits for it so its stop is not cleared too early
         pen1 -- a turtle object, used to write prompt regarding player's move
         at the bottom of screen
         pen2 -- a turtle object, used to write prompt regarding game result at
         the top of screen
     Methods:
+        register_shapes -- Register the shapes of pieces and frames
         draw_squares -- Draw a square of a given size
         draw_board -- Draw a board of given size and conditions
+        clear_square -- Remove the stamps on a square
+        stamp_square -- Stamp a shape on a square
         draw_movable_piece_square -- Draw a highlight blue square frame for
         movable piece
         draw_possible_moves_square -- Draw highlight red square frames for
         possible moves
-        draw_circle -- Draw a circle with a given radius
+        draw_piece -- Draw the piece on one square
         draw_pieces -- Draw pieces on board according to the board state
+        redraw -- Draw again the squares which changed since they were last
+        drawn
         write_prompt -- Write prompt regarding player's move at the bottom of
         screen
         write_result -- Write prompt regarding game result at the top of screen
         click_handler -- The overall logic of the UI game
         computer_control -- The overall logic of computer player
+        poll_computer -- Make the computer player's move once it is found
+        cancel_computer -- Stop the computer player's search and drop its move
+        close -- Stop the computer player's thread
+        undo_handler -- Take back turns until it is human player's turn again
+        redo_handler -- Make again the turns taken back by undo_handler
+        refresh -- Clear the selected piece and prompts, and draw the board
+        again
     '''
 
-    def __init__(self):
+    def __init__(self, game=None):
         '''
         Constructor -- create a new instance of Board
         Parameters:
             self -- the current Board object
+            game -- the GameState object to show and play on, a new game if
+            None
         '''
+        self.game = game if game is not None else GameState()
+        self.drawn = []
+        self.framed = []
+        self.stamps = {}
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.thinking = None
+        self.stopping = None
+        self.register_shapes()
+        self.pen = turtle.Turtle()
+        self.pen.penup()
+        self.pen.hideturtle()
+        self.pen.setheading(NORTH)
         self.draw_board()
         self.draw_pieces()
         self.pen1 = turtle.Turtle()
@@ -66,6 +115,38 @@ class Board:
                               SQUARE * NUM_SQUARES // 2 + SQUARE // QUARTER)
         self.write_prompt(TURN_REMINDER)
 
+    def register_shapes(self):
+        '''
+        Method -- register_shapes
+            Register a compound shape for each piece, named after it, and
+            for each kind of highlight frame, named after FRAME_COLORS
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        def circle(radius, center):
+            return tuple((radius * math.cos(2 * math.pi * i / CIRCLE_POINTS),
+                          center + radius
+                          * math.sin(2 * math.pi * i / CIRCLE_POINTS))
+                         for i in range(CIRCLE_POINTS))
+        half = SQUARE / 2
+        # the centre of a king's mark relative to the centre of its piece
+        mark = SQUARE // QUARTER * 2 - SQUARE // 2
+        for color in PIECES_COLORS:
+            for king in (False, True):
+                shape = turtle.Shape("compound")
+                shape.addcomponent(circle(half, 0), color, "black")
+                if king:
+                    shape.addcomponent(circle(SQUARE // QUARTER, mark),
+                                       color, "white")
+                turtle.register_shape(color + KING if king else color, shape)
+        corners = ((-half, -half), (half, -half), (half, half), (-half, half))
+        for name, outline in FRAME_COLORS.items():
+            shape = turtle.Shape("compound")
+            shape.addcomponent(corners, SQUARE_COLORS[0], outline)
+            turtle.register_shape(name, shape)
+
     def draw_square(self, a_turtle, size):
         '''
         Method -- draw_square
@@ -117,6 +198,39 @@ class Board:
                                     origin_point + row * SQUARE)
                     self.draw_square(pen, SQUARE)
 
+    def clear_square(self, row, col):
+        '''
+        Method -- clear_square
+            Remove the piece and frame stamps on a square, showing the board
+            under them
+        Parameters:
+            self -- the current Board object
+            row -- the row of the square
+            col -- the col of the square
+        Returns:
+            Nothing
+        '''
+        for stamp in self.stamps.pop((row, col), []):
+            self.pen.clearstamp(stamp)
+
+    def stamp_square(self, row, col, shape):
+        '''
+        Method -- stamp_square
+            Stamp a registered shape on the centre of a square, above the
+            stamps already there
+        Parameters:
+            self -- the current Board object
+            row -- the row of the square
+            col -- the col of the square
+            shape -- the name of the shape
+        Returns:
+            Nothing
+        '''
+        self.pen.shape(shape)
+        self.pen.setposition((col - NUM_SQUARES // 2) * SQUARE + SQUARE // 2,
+                             (row - NUM_SQUARES // 2) * SQUARE + SQUARE // 2)
+        self.stamps.setdefault((row, col), []).append(self.pen.stamp())
+
     def draw_movable_piece_square(self):
         '''
         Method -- draw_movable_piece_square
@@ -126,22 +240,11 @@ class Board:
         Returns:
             Nothing.
         '''
-        pen = turtle.Turtle()
-        pen.penup()
-        pen.hideturtle()
-        pen.color("blue", SQUARE_COLORS[0])
-        row, col = game.movable_piece[0], game.movable_piece[1]
-        x = (col - NUM_SQUARES // 2) * SQUARE
-        y = (row - NUM_SQUARES // 2) * SQUARE
-        pen.setposition(x, y)
-        self.draw_square(pen, SQUARE)
-        pen.color("black", game.current_player)
-        pen.setposition(x + SQUARE // 2, y)
-        self.draw_circle(pen, SQUARE // 2)
-        if game.squares[row][col] == game.current_player + KING:
-            pen.color("white", game.current_player)
-            pen.setposition(x + SQUARE // 2, y + SQUARE // QUARTER)
-            self.draw_circle(pen, SQUARE // QUARTER)
+        row, col = self.game.movable_piece[0], self.game.movable_piece[1]
+        self.framed.append((row, col))
+        self.clear_square(row, col)
+        self.stamp_square(row, col, "movable")
+        self.draw_piece(row, col)
 
     def draw_possible_moves_square(self):
         '''
@@ -152,39 +255,27 @@ class Board:
         Returns:
             Nothing.
         '''
-        pen = turtle.Turtle()
-        pen.penup()
-        pen.hideturtle()
-        pen.color("red", SQUARE_COLORS[0])
-        if game.possible_capture_moves:
-            for move in game.possible_capture_moves:
-                x = (move[1] - NUM_SQUARES // 2) * SQUARE
-                y = (move[0] - NUM_SQUARES // 2) * SQUARE
-                pen.setposition(x, y)
-                self.draw_square(pen, SQUARE)
-        elif not game.possible_capture_moves and game.possible_moves:
-            for move in game.possible_moves:
-                x = (move[1] - NUM_SQUARES // 2) * SQUARE
-                y = (move[0] - NUM_SQUARES // 2) * SQUARE
-                pen.setposition(x, y)
-                self.draw_square(pen, SQUARE)
+        moves = (self.game.possible_capture_moves
+                 or self.game.possible_moves)
+        for move in moves:
+            self.framed.append((move[0], move[1]))
+            self.clear_square(move[0], move[1])
+            self.stamp_square(move[0], move[1], "move")
 
-    def draw_circle(self, a_turtle, size):
+    def draw_piece(self, row, col):
         '''
-        Method -- draw_circle
-            Draw a circle with a given radius
+        Method -- draw_piece
+            Stamp the piece on one square, if there is one
         Parameters:
             self -- the current Board object
-            a_turtle -- an instance of Turtle
-            size -- the radius of the circle
+            row -- the row of the square
+            col -- the col of the square
         Returns:
-            Nothing. Draws a circle in the graphics window.
+            Nothing. Draws a piece in the graphics window.
         '''
-        a_turtle.pendown()
-        a_turtle.begin_fill()
-        a_turtle.circle(size)
-        a_turtle.end_fill()
-        a_turtle.penup()
+        piece = self.game.squares[row][col]
+        if piece != EMPTY:
+            self.stamp_square(row, col, piece)
 
     def draw_pieces(self):
         '''
@@ -192,40 +283,39 @@ class Board:
             Draw pieces on board according to the board state
         Parameters:
             self -- the current Board object
-            a_turtle -- an instance of Turtle
-            size -- the radius of the circle
         Returns:
             Nothing. Draws pieces in the graphics window.
         '''
-        squares = game.squares
         for row in range(0, NUM_SQUARES):
             for col in range(0, NUM_SQUARES):
-                pen = turtle.Turtle()
-                pen.penup()
-                pen.hideturtle()
-                x = (col - NUM_SQUARES // 2) * SQUARE + SQUARE // 2
-                y = (row - NUM_SQUARES // 2) * SQUARE
-                pen.setposition(x, y)
-                if squares[row][col] == BLACK:
-                    pen.color("black", PIECES_COLORS[0])
-                    self.draw_circle(pen, SQUARE // 2)
-                elif squares[row][col] == BLACK + KING:
-                    pen.color("black", PIECES_COLORS[0])
-                    self.draw_circle(pen, SQUARE // 2)
-                    y = y + SQUARE // QUARTER
-                    pen.setposition(x, y)
-                    pen.color("white", PIECES_COLORS[0])
-                    self.draw_circle(pen, SQUARE // QUARTER)
-                elif squares[row][col] == RED:
-                    pen.color("black", PIECES_COLORS[1])
-                    self.draw_circle(pen, SQUARE // 2)
-                elif squares[row][col] == RED + KING:
-                    pen.color("black", PIECES_COLORS[1])
-                    self.draw_circle(pen, SQUARE // 2)
-                    y = y + SQUARE // QUARTER
-                    pen.setposition(x, y)
-                    pen.color("white", PIECES_COLORS[1])
-                    self.draw_circle(pen, SQUARE // QUARTER)
+                self.clear_square(row, col)
+                self.draw_piece(row, col)
+        self.drawn = [list(row) for row in self.game.squares]
+        self.framed = []
+
+    def redraw(self):
+        '''
+        Method -- redraw
+            Draw again only the squares whose piece changed since they were
+            last drawn and the squares with a highlight frame, so a move
+            repaints its origin, destination and captured squares instead of
+            the whole board
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing. Draws the changed squares in the graphics window.
+        '''
+        squares = self.game.squares
+        dirty = set(self.framed)
+        for row in range(NUM_SQUARES):
+            for col in range(NUM_SQUARES):
+                if squares[row][col] != self.drawn[row][col]:
+                    dirty.add((row, col))
+        self.framed = []
+        for row, col in sorted(dirty):
+            self.clear_square(row, col)
+            self.draw_piece(row, col)
+        self.drawn = [list(row) for row in squares]
 
     def write_prompt(self, prompt):
         '''
@@ -259,8 +349,9 @@ class Board:
             The overall logic of the UI game
             Verify if the game is end and if the click is within the board,
             then judge if the click is to choose the movable piece/to select
-            a possible move, when a valid move has been made, switch the turn,
-            until the game end
+            a possible move, a piece which has jumped keeps on jumping until
+            its capture path is complete, then switch the turn, until the
+            game end
         Parameters:
             self -- the current Board object
             x -- the x-coordinate when a click happened
@@ -268,49 +359,47 @@ class Board:
         Returns:
             Nothing
         '''
+        if self.thinking is not None:
+            return
         self.pen1.clear()
-        if_game_end, result_prompt = game.game_end()
-        game.current_player = BLACK
+        if_game_end, result_prompt = self.game.game_end()
+        self.game.current_player = BLACK
         if not if_game_end:
-            row, col, inboard = game.click_position(x, y)
+            row, col, inboard = self.game.click_position(x, y)
+            jumping = len(self.game.jump_path) > 1
             if inboard:
-                if game.click_validation(row, col):
-                    if (not game.movable_pieces and not game.possible_moves
-                       and not game.possible_capture_moves):
+                if not jumping and self.game.click_validation(row, col):
+                    if (not self.game.movable_pieces
+                       and not self.game.possible_moves
+                       and not self.game.possible_capture_moves):
                         pass
-                    elif (game.movable_pieces or game.possible_moves
-                          or game.possible_capture_moves):
-                        game.storage_reset()
-                        self.draw_board()
-                        self.draw_pieces()
-                    game.possible_moves = game.non_capture_move(row, col)
-                    game.possible_capture_moves = game.capture_move(row, col)
-                    game.movable_piece = (row, col)
+                    elif (self.game.movable_pieces or self.game.possible_moves
+                          or self.game.possible_capture_moves):
+                        self.game.storage_reset()
+                        self.redraw()
+                    self.game.select_piece(row, col)
                     self.draw_possible_moves_square()
                     self.draw_movable_piece_square()
-                elif game.valid_move(row, col):
-                    game.update_squares(row, col)
-                    game.king_upgrade(row, col)
-                    self.draw_board()
-                    self.draw_pieces()
-                    if (row, col) in game.possible_capture_moves:
-                        game.storage_reset()
-                        if len(game.capture_move(row, col)) > 0:
-                            self.possible_moves = []
-                            self.movable_pieces = [(row, col)]
-                            self.draw_possible_moves_square()
-                            self.draw_movable_piece_square()
-                            return self.click_handler(x, y)
-                    else:
-                        game.storage_reset()
-                    game.switch_turn()
-                    if game.current_player == RED:
+                elif self.game.valid_move(row, col):
+                    self.game.update_squares(row, col)
+                    self.game.king_upgrade(row, col)
+                    self.redraw()
+                    if self.game.continue_jump(row, col):
+                        self.draw_possible_moves_square()
+                        self.draw_movable_piece_square()
+                        return
+                    self.game.storage_reset()
+                    self.game.switch_turn()
+                    if self.game.current_player == RED:
                         self.computer_control()
                 else:
                     self.write_prompt("Not a valid piece/move!")
-                    game.storage_reset()
-                    self.draw_board()
-                    self.draw_pieces()
+                    if not jumping:
+                        self.game.storage_reset()
+                    self.redraw()
+                    if jumping:
+                        self.draw_possible_moves_square()
+                        self.draw_movable_piece_square()
             else:
                 self.write_prompt("Click within the board!")
         else:
@@ -322,47 +411,141 @@ class Board:
         '''
         Method -- computer_control
             The overall logic of computer player
-            Verify if the game is end, then choose the movable piece and
-            a valid move for computer, when a valid move has been made,
-            switch the turn, until the game end
+            Verify if the game is end, then start the computer player's
+            search on the executor's thread and show it is thinking, the move
+            is made by poll_computer once the search is done
         Parameters:
             self -- the current Board object
         Returns:
             Nothing
         '''
         self.pen1.clear()
-        if_game_end, result_prompt = game.game_end()
+        if_game_end, result_prompt = self.game.game_end()
         if not if_game_end:
-            computer_movable, computer_move, ifcapture = game.computer_move()
-            game.computer_update_squares(computer_movable, computer_move,
-                                         ifcapture)
-            move_row, move_col = computer_move[0], computer_move[1]
-            game.king_upgrade(move_row, move_col)
-            self.draw_board()
-            turtle.ontimer(self.draw_pieces(), DELAY_TIME)
-            if (move_row, move_col) == computer_move and ifcapture:
-                possible_capture_moves = game.capture_move(move_row, move_col)
-                while len(possible_capture_moves) > 0:
-                    computer_movable = (move_row, move_col)
-                    computer_move = possible_capture_moves[0]
-                    move_row, move_col = computer_move[0], computer_move[1]
-                    ifcapture = True
-                    game.computer_update_squares(computer_movable,
-                                                 computer_move, ifcapture)
-                    game.king_upgrade(move_row, move_col)
-                    self.draw_board()
-                    turtle.ontimer(self.draw_pieces(), DELAY_TIME)
-                    possible_capture_moves = game.capture_move(move_row,
-                                                               move_col)
-            if_game_end, result_prompt = game.game_end()
-            if not if_game_end:
-                game.switch_turn()
-                self.write_prompt(TURN_REMINDER)
-            else:
-                self.write_result(result_prompt)
-                self.write_prompt(CLOSE_WINDOW)
-                turtle.exitonclick()
+            board = BitBoard.from_squares(self.game.squares,
+                                          self.game.current_player)
+            if self.stopping is not None:
+                wait([self.stopping])
+                self.stopping = None
+            self.game.reset_stop()
+            future = self.executor.submit(self.game.search_move, board=board)
+            self.thinking = future
+            self.write_prompt(THINKING)
+            turtle.ontimer(lambda: self.poll_computer(future), POLL_TIME)
         else:
             self.write_result(result_prompt)
             self.write_prompt(CLOSE_WINDOW)
             turtle.exitonclick()
+
+    def poll_computer(self, future):
+        '''
+        Method -- poll_computer
+            Make the whole move found by the computer player's search, every
+            jump of a capture path at once, which switches the turn, or look
+            again after POLL_TIME if the search is still running
+        Parameters:
+            self -- the current Board object
+            future -- the Future of the search, ignored if it was cancelled
+        Returns:
+            Nothing
+        '''
+        if future is not self.thinking:
+            return
+        if not future.done():
+            turtle.ontimer(lambda: self.poll_computer(future), POLL_TIME)
+            return
+        self.thinking = None
+        self.pen1.clear()
+        self.game.make_move(future.result())
+        self.redraw()
+        if_game_end, result_prompt = self.game.game_end()
+        if not if_game_end:
+            self.write_prompt(TURN_REMINDER)
+        else:
+            self.write_result(result_prompt)
+            self.write_prompt(CLOSE_WINDOW)
+            turtle.exitonclick()
+
+    def cancel_computer(self):
+        '''
+        Method -- cancel_computer
+            Stop the computer player's running search without waiting for
+            it, or cancel it if it has not started, the move it returns is
+            never made
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        if self.thinking is not None:
+            self.thinking.cancel()
+            self.game.stop_search()
+            self.stopping = self.thinking
+            self.thinking = None
+
+    def close(self):
+        '''
+        Method -- close
+            Stop the computer player's search and thread, for when the
+            window is closed
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        self.cancel_computer()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def undo_handler(self):
+        '''
+        Method -- undo_handler
+            Take back the last turns until it is human player's turn again,
+            so the computer player's reply is taken back together with the
+            human player's move, a running search of the computer player is
+            cancelled first
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        self.cancel_computer()
+        if self.game.undo():
+            while self.game.current_player != BLACK and self.game.undo():
+                pass
+        self.refresh()
+
+    def redo_handler(self):
+        '''
+        Method -- redo_handler
+            Make again the turns taken back by undo_handler until it is human
+            player's turn again, the computer player moves if the turns run
+            out on its turn
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        if self.thinking is not None:
+            return
+        if self.game.redo():
+            while self.game.current_player != BLACK and self.game.redo():
+                pass
+        self.refresh()
+        if self.game.current_player != BLACK:
+            self.computer_control()
+
+    def refresh(self):
+        '''
+        Method -- refresh
+            Clear the selected piece and prompts, and draw the board again
+        Parameters:
+            self -- the current Board object
+        Returns:
+            Nothing
+        '''
+        self.game.storage_reset()
+        self.game.movable_piece = []
+        self.pen1.clear()
+        self.pen2.clear()
+        self.redraw()
+        self.write_prompt(TURN_REMINDER)
@@ -0,0 +1,294 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+
+from bitboard import BitBoard, square_index
+from match import MAX_PLIES, MATCH_NODES
+import pdn
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "opening.book")
+BOOK_PLIES = 12
+BOOK_GAMES = 200
+# The file is a header followed by records sorted by hash, each record is
+# a move of the position with that hash: its origin and final square and
+# its weight
+MAGIC = b"CKOB"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<QBBH")
+MAX_WEIGHT = 0xFFFF
+# Weight a move gets for each game the player making it won or drew
+WIN_WEIGHT = 2
+DRAW_WEIGHT = 1
+
+
+def move_squares(move):
+    '''
+    Function -- move_squares
+        Get the squares a book record keeps of a move
+    Parameters:
+        move -- a Move object
+    Returns:
+        The indices of its origin and final square
+    '''
+    return square_index(*move.path[0]), square_index(*move.path[-1])
+
+
+def find_move(board, path):
+    '''
+    Function -- find_move
+        Find the legal move of a board with a given path
+    Parameters:
+        board -- a BitBoard object
+        path -- the (row, col) squares of the move, lists are accepted
+    Returns:
+        A Move object, or None if no legal move has that path
+    '''
+    path = tuple(tuple(square) for square in path)
+    for move in board.legal_moves():
+        if move.path == path:
+            return move
+    return None
+
+
+def count_book_moves(games, plies=BOOK_PLIES, skip=0):
+    '''
+    Function -- count_book_moves
+        Weight the moves played in the first plies of a set of games by the
+        result each move's player got from the game
+    Parameters:
+        games -- an iterable of (winner, paths) pairs, the winner is None
+        for a draw and each path is the list of squares of a move
+        plies -- the number of moves of each game to count
+        skip -- the number of first moves of each game to play without
+        counting them, such as the random opening of a self-play game
+    Returns:
+        A dictionary mapping (hash, origin, destination) to a weight
+    '''
+    weights = {}
+    for winner, paths in games:
+        board = BitBoard()
+        for ply, path in enumerate(paths[:plies]):
+            move = find_move(board, path)
+            if move is None:
+                break
+            if ply < skip:
+                board.make_move(move)
+                continue
+            weight = DRAW_WEIGHT
+            if winner is not None:
+                weight = WIN_WEIGHT if winner == board.current_player else 0
+            key = (board.hash_key,) + move_squares(move)
+            weights[key] = weights.get(key, 0) + weight
+            board.make_move(move)
+    return weights
+
+
+def write_book(path, weights):
+    '''
+    Function -- write_book
+        Write weighted book moves to a file sorted by position hash, moves
+        that never won or drew are left out
+    Parameters:
+        path -- the file to write
+        weights -- a dictionary mapping (hash, origin, destination) to a
+        weight
+    Returns:
+        The number of records written
+    '''
+    records = sorted((key, min(weight, MAX_WEIGHT))
+                     for key, weight in weights.items() if weight > 0)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        for (key, origin, destination), weight in records:
+            file.write(RECORD.pack(key, origin, destination, weight))
+    return len(records)
+
+
+class OpeningBook:
+    '''
+    Class -- OpeningBook
+        An opening book file searched through mmap, the records of a
+        position are found by binary search over the sorted hashes
+    Attributes:
+        path -- The path of the file
+        data -- The mmap object of the file
+        count -- The number of records
+    Methods:
+        record_key -- The position hash of a record
+        lookup -- Find the book moves of a position hash
+        choose -- Pick a book move of a position
+        close -- Close the file
+    '''
+
+    def __init__(self, path=BOOK_FILE):
+        '''
+        Constructor -- create a new instance of OpeningBook
+        Parameters:
+            self -- the current OpeningBook object
+            path -- the file written by write_book
+        '''
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError("%s is not an opening book file" % path)
+
+    def record_key(self, number):
+        '''
+        Method -- record_key
+            Get the position hash of a record
+        Parameters:
+            self -- the current OpeningBook object
+            number -- the number of the record
+        Returns:
+            A 64 bit integer
+        '''
+        return struct.unpack_from("<Q", self.data,
+                                  HEADER.size + number * RECORD.size)[0]
+
+    def lookup(self, key):
+        '''
+        Method -- lookup
+            Find the book moves of a position hash
+        Parameters:
+            self -- the current OpeningBook object
+            key -- the Zobrist hash of the position
+        Returns:
+            A list of (origin, destination, weight) tuples, empty if the
+            position is not in the book
+        '''
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.record_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        while low < self.count:
+            record = RECORD.unpack_from(self.data,
+                                        HEADER.size + low * RECORD.size)
+            if record[0] != key:
+                break
+            moves.append(record[1:])
+            low += 1
+        return moves
+
+    def choose(self, board, generator=random):
+        '''
+        Method -- choose
+            Pick a book move of a position at random, in proportion to the
+            weights of its moves
+        Parameters:
+            self -- the current OpeningBook object
+            board -- a BitBoard object
+            generator -- the random generator to pick with
+        Returns:
+            A Move object, or None if the position is not in the book
+        '''
+        entries = self.lookup(board.hash_key)
+        if not entries:
+            return None
+        legal = {move_squares(move): move for move in board.legal_moves()}
+        # a hash collision may bring moves of another position
+        candidates = [(legal[(origin, destination)], weight)
+                      for origin, destination, weight in entries
+                      if (origin, destination) in legal]
+        if not candidates:
+            return None
+        moves, weights = zip(*candidates)
+        return generator.choices(moves, weights)[0]
+
+    def close(self):
+        '''
+        Method -- close
+            Close the file
+        Parameters:
+            self -- the current OpeningBook object
+        Returns:
+            Nothing
+        '''
+        self.data.close()
+
+
+def open_book(path=BOOK_FILE):
+    '''
+    Function -- open_book
+        Open an opening book file if it has been built
+    Parameters:
+        path -- the file written by write_book
+    Returns:
+        An OpeningBook object, or None if there is no such file
+    '''
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def read_games(path):
+    '''
+    Function -- read_games
+        Read the games of a self-play record file
+    Parameters:
+        path -- a file of JSON lines written by selfplay.py, or a PDN file
+        if it ends with .pdn, whose games from the initial position with a
+        result are read
+    Yields:
+        A (winner, paths) pair for each game
+    '''
+    with open(path) as file:
+        if path.endswith(pdn.PDN_SUFFIX):
+            for game in pdn.read_games(file):
+                if "FEN" not in game.tags and game.result != pdn.UNFINISHED:
+                    yield pdn.game_winner(game), [
+                        move.path for move in pdn.game_moves(game)]
+            return
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record["winner"], record["moves"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build an opening book from self-play games.")
+    parser.add_argument("--input", help="self-play records to read instead "
+                                        "of playing new games")
+    parser.add_argument("--games", type=int, default=BOOK_GAMES)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--opening-plies", type=int, default=4,
+                        help="random moves each new game starts with, "
+                             "they are not counted as book moves")
+    parser.add_argument("--nodes", type=int, default=MATCH_NODES)
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES)
+    parser.add_argument("--output", default=BOOK_FILE)
+    args = parser.parse_args()
+    skip = 0
+    if args.input:
+        games = read_games(args.input)
+    else:
+        skip = args.opening_plies
+        # selfplay plays on GameState, which opens the book itself
+        from selfplay import selfplay
+        games = ((record.winner, [move.path for move in record.moves])
+                 for record in selfplay(args.games, args.workers, 0,
+                                        args.opening_plies, MAX_PLIES,
+                                        args.nodes))
+    count = write_book(args.output,
+                       count_book_moves(games, args.plies, skip))
+    print("%d book moves written to %s" % (count, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import sys
+import threading
+import time
+
+from bitboard import BitBoard
+from book import open_book
+from evaluation import DEFAULT_EVALUATION
+from notation import from_fen, to_fen
+from pdn import move_text, parse_move
+from search import Search, SEARCH_TIME_MS, MAX_DEPTH
+from tablebase import open_tablebase
+from transposition import TranspositionTable
+
+ENGINE_NAME = "Checkers_Game"
+ENGINE_AUTHOR = "Xiaoxi Yang"
+# Options of go followed by a number, and the go argument each one sets
+GO_OPTIONS = {"movetime": "time_ms", "nodes": "node_budget",
+              "depth": "max_depth"}
+NO_MOVE = "none"
+
+
+class Engine:
+    '''
+    Class -- Engine
+        The computer player behind a line based text protocol in the style
+        of the UCI and CheckerBoard engine protocols, with no GUI imports so
+        it starts fast and runs as a subprocess of other tools:
+            engine -- reply with the engine's id lines and "engineok"
+            isready -- reply "readyok" at once, every earlier command has
+            been carried out but a search started by go keeps running
+            newgame -- forget what earlier searches learned
+            position startpos|fen <FEN> [moves <move> ...] -- set the
+            position, moves are written in PDN notation
+            go [movetime <ms>] [nodes <n>] [depth <d>] [infinite] -- search
+            the position in the background, then reply "info ..." and
+            "bestmove <move>", or "bestmove none" if there is no move
+            stop -- end the search now and reply with its best move
+            fen -- reply with the position in FEN notation
+            quit -- stop the search and leave
+    Attributes:
+        output -- The text file replies are written to
+        board -- The BitBoard object of the current position
+        search -- The Search object of the computer player
+        book -- An OpeningBook, or None
+        thread -- The threading.Thread of the running search, or None
+        lock -- A threading.Lock held while a reply is written, replies come
+        from both the protocol thread and the search thread
+    Methods:
+        reply -- Write reply lines
+        handle -- Carry out one command line
+        set_position -- Carry out a position command
+        go -- Start a search in the background
+        think -- Search the position and reply with the best move
+        stop -- Stop the running search and wait for its reply
+        run -- Carry out the commands of an input until quit
+    '''
+
+    def __init__(self, output=sys.stdout):
+        '''
+        Constructor -- create a new instance of Engine
+        Parameters:
+            self -- the current Engine object
+            output -- the text file replies are written to
+        '''
+        self.output = output
+        self.board = BitBoard()
+        self.search = Search(DEFAULT_EVALUATION, TranspositionTable(),
+                             open_tablebase())
+        self.book = open_book()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def reply(self, *lines):
+        '''
+        Method -- reply
+            Write reply lines and flush them, so a tool reading the pipe
+            sees them at once
+        Parameters:
+            self -- the current Engine object
+            lines -- the strings to write, one per line
+        Returns:
+            Nothing
+        '''
+        with self.lock:
+            for line in lines:
+                self.output.write(line + "\n")
+            self.output.flush()
+
+    def handle(self, line):
+        '''
+        Method -- handle
+            Carry out one command line, unknown commands and bad arguments
+            are answered with an "error" line
+        Parameters:
+            self -- the current Engine object
+            line -- the command line
+        Returns:
+            False if the command is quit, True otherwise
+        '''
+        words = line.split()
+        if not words:
+            return True
+        command, arguments = words[0], words[1:]
+        try:
+            if command == "engine":
+                self.reply("id name " + ENGINE_NAME,
+                           "id author " + ENGINE_AUTHOR, "engineok")
+            elif command == "isready":
+                self.reply("readyok")
+            elif command == "newgame":
+                self.stop()
+                self.search.table.clear()
+            elif command == "position":
+                self.stop()
+                self.set_position(arguments)
+            elif command == "go":
+                self.go(arguments)
+            elif command == "stop":
+                self.stop()
+            elif command == "fen":
+                self.reply("fen " + to_fen(self.board))
+            elif command == "quit":
+                self.stop()
+                return False
+            else:
+                self.reply("error unknown command " + command)
+        except ValueError as error:
+            self.reply("error %s" % error)
+        return True
+
+    def set_position(self, arguments):
+        '''
+        Method -- set_position
+            Set the current position from the arguments of a position
+            command, it is left unchanged if they are not valid
+        Parameters:
+            self -- the current Engine object
+            arguments -- a list of strings, "startpos" or "fen" and a FEN
+            string, then optionally "moves" and PDN moves
+        Returns:
+            Nothing, raises ValueError if the arguments are not valid
+        '''
+        moves = []
+        if "moves" in arguments:
+            split = arguments.index("moves")
+            arguments, moves = arguments[:split], arguments[split + 1:]
+        if arguments == ["startpos"]:
+            board = BitBoard()
+        elif len(arguments) == 2 and arguments[0] == "fen":
+            board = from_fen(arguments[1])
+        else:
+            raise ValueError("position needs startpos or fen <FEN>")
+        for text in moves:
+            board.make_move(parse_move(board, text))
+        self.board = board
+
+    def go(self, arguments):
+        '''
+        Method -- go
+            Start searching the current position in another thread, so
+            stop can still be read, a search already running is stopped
+            first
+        Parameters:
+            self -- the current Engine object
+            arguments -- a list of strings, options of GO_OPTIONS each
+            followed by a number, or "infinite"; with no option the search
+            takes SEARCH_TIME_MS
+        Returns:
+            Nothing, raises ValueError if the arguments are not valid
+        '''
+        options = {"time_ms": None, "node_budget": None,
+                   "max_depth": MAX_DEPTH}
+        words = iter(arguments)
+        limited = False
+        for word in words:
+            if word in GO_OPTIONS:
+                value = next(words, "")
+                if not value.isdigit():
+                    raise ValueError("%s needs a number" % word)
+                options[GO_OPTIONS[word]] = int(value)
+                limited = True
+            elif word == "infinite":
+                limited = True
+            else:
+                raise ValueError("unknown go option " + word)
+        if not limited:
+            options["time_ms"] = SEARCH_TIME_MS
+        self.stop()
+        self.search.stopped = False
+        self.thread = threading.Thread(target=self.think,
+                                       args=(self.board.copy(),),
+                                       kwargs=options, daemon=True)
+        self.thread.start()
+
+    def think(self, board, time_ms, node_budget, max_depth):
+        '''
+        Method -- think
+            Search a position and reply with the best move, moves of the
+            opening book are played without a search
+        Parameters:
+            self -- the current Engine object
+            board -- a BitBoard object of the position
+            time_ms -- the time budget in milliseconds, or None
+            node_budget -- the node budget, or None
+            max_depth -- the deepest search to try
+        Returns:
+            Nothing
+        '''
+        move = self.book.choose(board) if self.book is not None else None
+        if move is not None:
+            self.reply("info book", "bestmove " + move_text(move))
+            return
+        start = time.perf_counter()
+        move, score, depth = self.search.iterative_deepening(
+            board, time_ms, node_budget, max_depth)
+        milliseconds = int((time.perf_counter() - start) * 1000)
+        self.reply("info depth %d score %d nodes %d time %d"
+                   % (depth, score, self.search.nodes, milliseconds),
+                   "bestmove " + (move_text(move) if move else NO_MOVE))
+
+    def stop(self):
+        '''
+        Method -- stop
+            Stop the running search, if any, and wait until it has replied
+            with its best move
+        Parameters:
+            self -- the current Engine object
+        Returns:
+            Nothing
+        '''
+        if self.thread is not None:
+            self.search.stop()
+            self.thread.join()
+            self.thread = None
+
+    def run(self, lines):
+        '''
+        Method -- run
+            Carry out commands until quit or the end of the input, a search
+            still running at the end of the input is finished
+        Parameters:
+            self -- the current Engine object
+            lines -- an iterable of command lines, such as sys.stdin
+        Returns:
+            Nothing
+        '''
+        for line in lines:
+            if not self.handle(line):
+                return
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+def main():
+    Engine().run(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+from bitboard import bit_count, bit_indices, row_mask, BLACK, NUM_SQUARES,\
+    HALF_ROW
+
+MAN_VALUE = 100
+KING_VALUE = 160
+ADVANCE_VALUE = 3
+BACK_RANK_VALUE = 10
+BLACK_BACK_RANK = row_mask([0])
+RED_BACK_RANK = row_mask([NUM_SQUARES - 1])
+
+
+def material_evaluation(board):
+    '''
+    Function -- material_evaluation
+        Score a position by counting men and kings only
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        An integer score from the point of view of the current player,
+        positive when the current player is ahead
+    '''
+    own, opponent = board.player_masks()
+    kings = board.kings
+    return (MAN_VALUE * (bit_count(own & ~kings)
+                         - bit_count(opponent & ~kings))
+            + KING_VALUE * (bit_count(own & kings)
+                            - bit_count(opponent & kings)))
+
+
+def positional_evaluation(board):
+    '''
+    Function -- positional_evaluation
+        Score a position by material, advancement of men towards the last
+        row and men still guarding the back rank
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        An integer score from the point of view of the current player,
+        positive when the current player is ahead
+    '''
+    black_men = board.black & ~board.kings
+    red_men = board.red & ~board.kings
+    advance = 0
+    for index in bit_indices(black_men):
+        advance += index // HALF_ROW
+    for index in bit_indices(red_men):
+        advance -= NUM_SQUARES - 1 - index // HALF_ROW
+    back_rank = (bit_count(black_men & BLACK_BACK_RANK)
+                 - bit_count(red_men & RED_BACK_RANK))
+    score = ADVANCE_VALUE * advance + BACK_RANK_VALUE * back_rank
+    if board.current_player != BLACK:
+        score = -score
+    return material_evaluation(board) + score
+
+
+DEFAULT_EVALUATION = positional_evaluation
+
@@ -3,6 +3,17 @@ Xiaoxi Yang
 Code for project_Checkers Game
 '''
 import random
+from collections import namedtuple
+
+from bitboard import BitBoard, Move
+from book import open_book
+from evaluation import DEFAULT_EVALUATION
+import notation
+from parallel import ParallelSearch
+from search import Search, SEARCH_TIME_MS
+from tablebase import open_tablebase
+from transposition import TranspositionTable
+from zobrist import SIDE_KEY, hash_squares, square_key
 
 NUM_SQUARES = 8
 SQUARE = 50
@@ -13,6 +24,55 @@ EMPTY = "empty"
 KING = "king"
 PLAYER = [BLACK, RED]
 SQUARE_COLORS = ("light gray", "white")
+DIRECTIONS = {BLACK: ((1, -1), (1, 1)),
+              RED: ((-1, -1), (-1, 1)),
+              BLACK + KING: ((1, -1), (1, 1), (-1, -1), (-1, 1)),
+              RED + KING: ((1, -1), (1, 1), (-1, -1), (-1, 1))}
+
+
+def build_move_tables():
+    '''
+    Function -- build_move_tables
+        Calculate, for each piece and each dark square of the board, the
+        squares a step can reach and the (jumped over, landing) squares of a
+        jump, off board squares left out
+    Parameters:
+        None
+    Returns:
+        Two dictionaries keyed by piece, each value is a nested list indexed
+        by row and col holding a tuple of squares or of pairs of squares
+    '''
+    step_table = {}
+    jump_table = {}
+    for piece, directions in DIRECTIONS.items():
+        steps = [[() for _ in range(NUM_SQUARES)] for _ in range(NUM_SQUARES)]
+        jumps = [[() for _ in range(NUM_SQUARES)] for _ in range(NUM_SQUARES)]
+        for row in range(NUM_SQUARES):
+            for col in range(NUM_SQUARES):
+                if row % 2 == col % 2:
+                    continue
+                steps[row][col] = tuple(
+                    (row + item[0], col + item[1]) for item in directions
+                    if 0 <= row + item[0] < NUM_SQUARES
+                    and 0 <= col + item[1] < NUM_SQUARES)
+                jumps[row][col] = tuple(
+                    ((row + item[0], col + item[1]),
+                     (row + 2 * item[0], col + 2 * item[1]))
+                    for item in directions
+                    if 0 <= row + 2 * item[0] < NUM_SQUARES
+                    and 0 <= col + 2 * item[1] < NUM_SQUARES)
+        step_table[piece] = steps
+        jump_table[piece] = jumps
+    return step_table, jump_table
+
+
+# Built once at import, so generating moves needs no bounds checks
+STEP_TABLE, JUMP_TABLE = build_move_tables()
+# Everything needed to take a move back: the Move itself (from, to and
+# captured squares), the captured pieces, whether the moving man was upgraded
+# as king, the change of the Zobrist hash and whether the move ended a turn
+UndoRecord = namedtuple("UndoRecord", ["move", "captured", "promoted",
+                                       "hash_delta", "switched"])
 
 
 class GameState:
@@ -31,8 +91,33 @@ class GameState:
         possible valid movable pieces
         movable_piece = A list storing the location of human player's selected
         movable piece
+        evaluate -- The static evaluation function used by the computer
+        player's search
+        table -- The TranspositionTable kept by the computer player's search
+        from one move to the next, or None if the game is not searching
+        book -- The OpeningBook the computer player picks its first moves
+        from, or None if it has not been built or the game is not searching
+        tablebase -- The Tablebase probed by the computer player's search,
+        or None if it has not been built or the game is not searching
+        parallel -- A ParallelSearch used by the computer player's search
+        instead of a single process, or None
+        search -- The Search object of the computer player's single process
+        search, made by its first search_move
+        board_key -- The Zobrist hash of the pieces on the board, kept up to
+        date by every move
+        history -- A stack of UndoRecord, one for each move or step made
+        redo_stack -- A stack of UndoRecord taken back by undo
+        jump_moves -- A list storing the legal Move objects of human player's
+        selected piece which still agree with the steps made this turn
+        jump_path -- A list storing the squares visited by human player's
+        selected piece this turn
     Methods:
         set_squares -- Set the initial state of each square on the board
+        set_position -- Set the board to a given position and player to move
+        to_fen -- Write the position in FEN notation
+        set_fen -- Set the board to a position written in FEN notation
+        to_bytes -- Encode the position in 13 bytes
+        set_bytes -- Set the board to a position encoded by to_bytes
         click_position -- Calculate corresponding row and col by giving
         coordinates
         click_validation -- Check if the click position(piece) belongs to the
@@ -43,6 +128,14 @@ class GameState:
         capture_move -- Calculate all possible capture moves of current piece
         move_options -- Calculate all possible moves(capture and non capture)
         and possible movable pieces of specific player -- human/computer
+        capture_sequences -- Calculate every complete capture path of current
+        piece
+        iter_moves -- Generate the legal moves of the current player one at a
+        time, capture moves first
+        legal_moves -- Calculate all legal moves of the current player
+        has_any_legal_move -- Check if the current player can move
+        select_piece -- Keep the legal moves of human player's selected piece
+        continue_jump -- Calculate where human player's piece can jump next
         movable_validation -- Calculate all the valid movable pieces of human
         player (must capture if possible)
         valid_move -- Check if the selected move is valid
@@ -53,17 +146,31 @@ class GameState:
         storage_reset -- Reset human player's movable and possible moves list
         as empty
         switch_turn -- Switch the current player
-        computer_move -- Calculate which move to make for computer player
-        computer_update_squares -- Update the state of each square on the
-        board in nested list after computer player's move
+        use_workers -- Split the computer player's search across processes
+        searcher -- Get the search object search_move runs
+        search_move -- Calculate the whole move to make for computer player
+        reset_stop -- Forget a stop_search which came after the last search
+        stop_search -- Stop a search_move running in another thread
         game_end -- Check if the game ends or not
+        hash_key -- The Zobrist hash of the position and current player
+        apply_move -- Move the pieces of a move on the board
+        restore_move -- Move the pieces of an undo record back
+        record_step -- Make one step of a turn and keep it for undo
+        make_move -- Make a move and switch the current player
+        unmake_move -- Take back the last move made
+        undo -- Take back the last turn of a player
+        redo_fits -- Check that a move taken back by undo can be made again
+        redo -- Make again the last turn taken back by undo
     '''
 
-    def __init__(self):
+    def __init__(self, searching=True):
         '''
         Constructor -- create a new instance of GameState
         Parameters:
             self -- the current GameState object
+            searching -- False for a game whose computer moves are searched
+            elsewhere, it keeps no transposition table and opens no book or
+            tablebase, so many games fit in one process
         '''
         self.squares = [[0 for _ in range(NUM_SQUARES)] for _ in
                         range(NUM_SQUARES)]
@@ -73,6 +180,16 @@ class GameState:
         self.possible_capture_moves = []
         self.movable_pieces = []
         self.movable_piece = []
+        self.evaluate = DEFAULT_EVALUATION
+        self.table = TranspositionTable() if searching else None
+        self.book = open_book() if searching else None
+        self.tablebase = open_tablebase() if searching else None
+        self.parallel = None
+        self.search = None
+        self.history = []
+        self.redo_stack = []
+        self.jump_moves = []
+        self.jump_path = []
 
     def set_squares(self):
         '''
@@ -91,6 +208,77 @@ class GameState:
                 elif row % 2 != col % 2 and row > INITIAL_ROWS + 1:
                     color = RED
                 self.squares[row][col] = color
+        self.board_key = hash_squares(self.squares, BLACK)
+
+    def set_position(self, squares, current_player):
+        '''
+        Method -- set_position
+            Set the board to a given position and player to move, forgetting
+            the moves made so far
+        Parameters:
+            self -- the current GameState object
+            squares -- a nested list in the format of squares
+            current_player -- the color of the player to move
+        Returns:
+            Nothing
+        '''
+        self.squares = [list(row) for row in squares]
+        self.current_player = current_player
+        self.board_key = hash_squares(self.squares, BLACK)
+        self.history = []
+        self.redo_stack = []
+        self.storage_reset()
+        self.movable_piece = []
+
+    def to_fen(self):
+        '''
+        Method -- to_fen
+            Write the position and player to move in FEN notation
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            A string, see notation.to_fen
+        '''
+        return notation.to_fen(
+            BitBoard.from_squares(self.squares, self.current_player))
+
+    def set_fen(self, text):
+        '''
+        Method -- set_fen
+            Set the board to a position written in FEN notation
+        Parameters:
+            self -- the current GameState object
+            text -- a string read by notation.from_fen
+        Returns:
+            Nothing, raises ValueError if text is not a position
+        '''
+        board = notation.from_fen(text)
+        self.set_position(board.to_squares(), board.current_player)
+
+    def to_bytes(self):
+        '''
+        Method -- to_bytes
+            Encode the position and player to move in 13 bytes
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            A bytes object, see notation.to_bytes
+        '''
+        return notation.to_bytes(
+            BitBoard.from_squares(self.squares, self.current_player))
+
+    def set_bytes(self, data):
+        '''
+        Method -- set_bytes
+            Set the board to a position encoded by to_bytes
+        Parameters:
+            self -- the current GameState object
+            data -- a bytes-like object of 13 bytes
+        Returns:
+            Nothing
+        '''
+        board = notation.from_bytes(data)
+        self.set_position(board.to_squares(), board.current_player)
 
     def click_position(self, x, y):
         '''
@@ -148,15 +336,8 @@ class GameState:
         Returns:
             A list storing the possible move directions of current piece
         '''
-        direction = []
-        if self.squares[row][col] == BLACK:
-            direction = [[1, -1], [1, 1]]
-        elif self.squares[row][col] == RED:
-            direction = [[-1, -1], [-1, 1]]
-        elif (self.squares[row][col] == BLACK + KING
-              or self.squares[row][col] == RED + KING):
-            direction = [[1, -1], [1, 1], [-1, -1], [-1, 1]]
-        return direction
+        return [list(item) for item in
+                DIRECTIONS.get(self.squares[row][col], ())]
 
     def non_capture_move(self, row, col):
         '''
@@ -171,11 +352,12 @@ class GameState:
             current piece
         '''
         possible_moves = []
-        direction = self.move_direction(row, col)
-        for item in direction:
-            new_row, new_col = row + item[0], col + item[1]
-            if (0 <= new_row < NUM_SQUARES and 0 <= new_col < NUM_SQUARES and
-               self.squares[new_row][new_col] == EMPTY):
+        steps = STEP_TABLE.get(self.squares[row][col])
+        if steps is None:
+            return possible_moves
+        squares = self.squares
+        for new_row, new_col in steps[row][col]:
+            if squares[new_row][new_col] == EMPTY:
                 possible_moves.append((new_row, new_col))
         return possible_moves
 
@@ -192,18 +374,16 @@ class GameState:
             current piece
         '''
         possible_capture_moves = []
-        direction = self.move_direction(row, col)
-        for item in direction:
-            new_row, new_col = row + item[0], col + item[1]
-            if (0 <= new_row < NUM_SQUARES and 0 <= new_col < NUM_SQUARES
-               and self.squares[new_row][new_col] != EMPTY and
-               self.squares[new_row][new_col] != self.current_player and
-               self.squares[new_row][new_col] != self.current_player + KING):
-                capture_row, capture_col = new_row + item[0], new_col + item[1]
-                if (0 <= capture_row < NUM_SQUARES and
-                   0 <= capture_col < NUM_SQUARES and
-                   self.squares[capture_row][capture_col] == EMPTY):
-                    possible_capture_moves.append((capture_row, capture_col))
+        jumps = JUMP_TABLE.get(self.squares[row][col])
+        if jumps is None:
+            return possible_capture_moves
+        squares = self.squares
+        own = (self.current_player, self.current_player + KING)
+        for (new_row, new_col), (capture_row, capture_col) in jumps[row][col]:
+            if (squares[new_row][new_col] != EMPTY and
+               squares[new_row][new_col] not in own and
+               squares[capture_row][capture_col] == EMPTY):
+                possible_capture_moves.append((capture_row, capture_col))
         return possible_capture_moves
 
     def move_options(self):
@@ -243,6 +423,150 @@ class GameState:
         return non_capture_options, non_capture_movable_options,\
             capture_options, capture_movable_options
 
+    def capture_sequences(self, row, col):
+        '''
+        Method -- capture_sequences
+            Calculate every complete capture path of current piece, a man
+            arriving at the last row is upgraded as king and its move ends
+            there
+        Parameters:
+            self -- the current GameState object
+            row -- the current piece's row position
+            col -- the current piece's col position
+        Returns:
+            A list of Move objects, one for each way to jump until no
+            capture is left
+        '''
+        sequences = []
+        for land_row, land_col in self.capture_move(row, col):
+            step = Move(((row, col), (land_row, land_col)),
+                        (((row + land_row) // 2, (col + land_col) // 2),))
+            # jump on the board to find the next jumps, then jump back
+            record = self.apply_move(step)
+            rest = []
+            if not record.promoted:
+                rest = self.capture_sequences(land_row, land_col)
+            self.restore_move(record)
+            if not rest:
+                sequences.append(step)
+            for move in rest:
+                sequences.append(Move(step.path[:1] + move.path,
+                                      step.captures + move.captures))
+        return sequences
+
+    def iter_moves(self):
+        '''
+        Method -- iter_moves
+            Generate the legal moves of the current player one at a time,
+            capture moves first, non capture moves are only looked for when
+            there is no capture move; the board must not change while the
+            moves are being generated
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            A generator of Move objects, in the same order as
+            BitBoard.iter_moves
+        '''
+        color = [self.current_player, self.current_player + KING]
+        captured = False
+        for row in range(0, NUM_SQUARES):
+            for col in range(0, NUM_SQUARES):
+                if self.squares[row][col] in color:
+                    for move in self.capture_sequences(row, col):
+                        captured = True
+                        yield move
+        if captured:
+            return
+        for row in range(0, NUM_SQUARES):
+            for col in range(0, NUM_SQUARES):
+                if self.squares[row][col] in color:
+                    for item in self.non_capture_move(row, col):
+                        yield Move(((row, col), item), ())
+
+    def legal_moves(self):
+        '''
+        Method -- legal_moves
+            Calculate all legal moves of the current player, capture moves
+            are mandatory and are enumerated as complete capture paths
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            A list of Move objects, in the same order as
+            BitBoard.legal_moves
+        '''
+        return list(self.iter_moves())
+
+    def has_any_legal_move(self):
+        '''
+        Method -- has_any_legal_move
+            Check if the current player can move, stopping at the first
+            piece found with a move
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            True or False if the current player has a legal move or not
+        '''
+        color = [self.current_player, self.current_player + KING]
+        for row in range(0, NUM_SQUARES):
+            for col in range(0, NUM_SQUARES):
+                if (self.squares[row][col] in color and
+                   (self.non_capture_move(row, col)
+                    or self.capture_move(row, col))):
+                    return True
+        return False
+
+    def select_piece(self, row, col):
+        '''
+        Method -- select_piece
+            Keep the legal moves of human player's selected piece and where
+            it can go first
+        Parameters:
+            self -- the current GameState object
+            row -- the selected piece's row position
+            col -- the selected piece's col position
+        Returns:
+            Nothing
+        '''
+        self.movable_piece = (row, col)
+        self.jump_path = [(row, col)]
+        self.jump_moves = [move for move in self.legal_moves()
+                           if move.path[0] == (row, col)]
+        self.possible_moves = [move.path[1] for move in self.jump_moves
+                               if not move.captures]
+        self.possible_capture_moves = []
+        for move in self.jump_moves:
+            if move.captures and move.path[1] not in\
+               self.possible_capture_moves:
+                self.possible_capture_moves.append(move.path[1])
+
+    def continue_jump(self, move_row, move_col):
+        '''
+        Method -- continue_jump
+            Calculate where human player's piece can jump next, after it has
+            landed on a square
+        Parameters:
+            self -- the current GameState object
+            move_row -- the landing square's row position
+            move_col -- the landing square's col position
+        Returns:
+            True if the piece has to keep on jumping, False if its move is
+            complete
+        '''
+        self.jump_path.append((move_row, move_col))
+        steps = len(self.jump_path)
+        self.jump_moves = [move for move in self.jump_moves
+                           if len(move.path) > steps
+                           and list(move.path[:steps]) == self.jump_path]
+        if not self.jump_moves:
+            return False
+        self.movable_piece = (move_row, move_col)
+        self.possible_moves = []
+        self.possible_capture_moves = []
+        for move in self.jump_moves:
+            if move.path[steps] not in self.possible_capture_moves:
+                self.possible_capture_moves.append(move.path[steps])
+        return True
+
     def movable_validation(self):
         '''
         Method -- movable_validation
@@ -254,13 +578,10 @@ class GameState:
             A list storing all locations of human player's possible valid
             movable pieces
         '''
-        player_non_capture_moves, player_non_capture_movable_options,\
-            player_capture_options, player_capture_movable_options \
-            = self.move_options()
-        if len(player_capture_options) > 0:
-            self.movable_pieces = player_capture_movable_options
-        elif len(player_non_capture_moves) > 0:
-            self.movable_pieces = player_non_capture_movable_options
+        self.movable_pieces = []
+        for move in self.iter_moves():
+            if move.path[0] not in self.movable_pieces:
+                self.movable_pieces.append(move.path[0])
         return self.movable_pieces
 
     def valid_move(self, move_row, move_col):
@@ -297,19 +618,13 @@ class GameState:
         if self.movable_piece:
             movable_row, movable_col = self.movable_piece[0],\
                 self.movable_piece[1]
+            path = ((movable_row, movable_col), (move_row, move_col))
             if self.possible_capture_moves:
                 delete_row, delete_col = (move_row + movable_row) // 2,\
                     (move_col + movable_col) // 2
-                self.squares[delete_row][delete_col] = EMPTY
-                self.squares[movable_row][movable_col],\
-                    self.squares[move_row][move_col] =\
-                    self.squares[move_row][move_col],\
-                    self.squares[movable_row][movable_col]
+                self.record_step(Move(path, ((delete_row, delete_col),)))
             elif not self.possible_capture_moves and self.possible_moves:
-                self.squares[movable_row][movable_col],\
-                    self.squares[move_row][move_col] =\
-                    self.squares[move_row][move_col],\
-                    self.squares[movable_row][movable_col]
+                self.record_step(Move(path, ()))
         return self.squares
 
     def king_upgrade(self, move_row, move_col):
@@ -326,8 +641,12 @@ class GameState:
         if (self.squares[move_row][move_col] == BLACK and
            move_row == NUM_SQUARES - 1) or (self.squares[move_row][move_col]
            == RED and move_row == 0):
+            self.board_key ^= square_key(self.squares[move_row][move_col],
+                                         move_row, move_col)
             self.squares[move_row][move_col] =\
                 self.squares[move_row][move_col] + KING
+            self.board_key ^= square_key(self.squares[move_row][move_col],
+                                         move_row, move_col)
 
     def storage_reset(self):
         '''
@@ -341,11 +660,13 @@ class GameState:
         self.movable_pieces = []
         self.possible_moves = []
         self.possible_capture_moves = []
+        self.jump_moves = []
+        self.jump_path = []
 
     def switch_turn(self):
         '''
         Method -- switch_turn
-            Switch the current player
+            Switch the current player, the last step made ends the turn
         Parameters:
             self -- the current GameState object
         Returns:
@@ -353,153 +674,101 @@ class GameState:
         '''
         self.current_player = PLAYER[(PLAYER.index(self.current_player) + 1)
                                      % 2]
+        if self.history and not self.history[-1].switched:
+            self.history[-1] = self.history[-1]._replace(switched=True)
 
-    def computer_move(self):
-        '''
-        Method -- computer_move
-            Calculate which move to make for computer player
-        Parameters:
-            self -- the current GameState object
-        Returns:
-            Two lists storing location of computer player's valid movable
-            piece choice and valid move choice, and a boolean representing if
-            the move choice is a capture one or not
-        '''
-        dict_moves = {}
-        computer_non_capture_moves, computer_non_capture_movables,\
-            computer_capture_moves, computer_capture_movables = self.move_options()
-        if computer_capture_moves:
-            for i, computer_move in enumerate(computer_capture_moves):
-                movable_row, movable_col = computer_capture_movables[i][0], computer_capture_movables[i][1]
-                move_row, move_col = computer_move[0], computer_move[1]
-                destination_move = computer_move
-                dict_moves[((movable_row, movable_col), (move_row, move_col))] = 1
-                capture_piece1_row, capture_piece1_col = (movable_row + move_row) // 2, (movable_col + move_col) // 2
-                capture_piece1_origin = self.squares[capture_piece1_row][capture_piece1_col]
-                self.squares[capture_piece1_row][capture_piece1_col] = EMPTY
-                # update squares for computer capture move
-                self.squares[movable_row][movable_col], self.squares[move_row][move_col] =\
-                self.squares[move_row][move_col], self.squares[movable_row][movable_col]
-                # identify if there is a continuous jump
-                computer_possible_continuous_capture_moves = self.capture_move(move_row, move_col)
-                if len(computer_possible_continuous_capture_moves) > 0:
-                    dict_moves[((movable_row, movable_col), (move_row, move_col))] += 2
-                    ind = random.choice(list(range(len(computer_possible_continuous_capture_moves))))
-                    destination_move = computer_possible_continuous_capture_moves[ind]
-                    destination_row, destination_col = destination_move[0], destination_move[1]
-                    capture_piece2_row, capture_piece2_col = (move_row + destination_row) // 2, (move_col + destination_col) // 2
-                    capture_piece2_origin = self.squares[capture_piece2_row][capture_piece2_col]
-                    self.squares[capture_piece2_row][capture_piece2_col] = EMPTY
-                    # update squares for computer capture move(continuous jump)
-                    self.squares[move_row][move_col], self.squares[destination_row][destination_col] =\
-                    self.squares[destination_row][destination_col], self.squares[move_row][move_col]
-                # judge if human will capture back
-                self.current_player = BLACK
-                _, _, human_capture_moves, human_capture_movables = self.move_options()
-                if human_capture_moves:
-                    for i, human_move in enumerate(human_capture_moves):
-                        human_move_row, human_move_col = human_move[0], human_move[1]
-                        human_movable_row, human_movable_col = human_capture_movables[i][0], human_capture_movables[i][1]
-                        delete_row, delete_col = (human_movable_row + human_move_row) // 2, (human_movable_col + human_move_col) // 2
-                        possible_deleted_pieces = []
-                        possible_deleted_pieces.append((delete_row, delete_col))
-                        # update squares for human capture move
-                        self.squares[human_movable_row][human_movable_col], self.squares[human_move_row][human_move_col] =\
-                        self.squares[human_move_row][human_move_col], self.squares[human_movable_row][human_movable_col]
-                        # judge if human will have a continuous capture
-                        human_possible_continuous_capture_moves = self.capture_move(human_move_row, human_move_col)
-                        if len(human_possible_continuous_capture_moves) > 0:
-                            dict_moves[((movable_row, movable_col), (move_row, move_col))] -= 1
-                        # update squares back for human move
-                        self.squares[human_move_row][human_move_col], self.squares[human_movable_row][human_movable_col] =\
-                        self.squares[human_movable_row][human_movable_col], self.squares[human_move_row][human_move_col]
-                    if destination_move in possible_deleted_pieces:
-                        dict_moves[((movable_row, movable_col), (move_row, move_col))] -= 1
-                self.current_player = RED
-                # update squares back to orginal
-                if len(computer_possible_continuous_capture_moves) > 0:
-                    self.squares[destination_row][destination_col], self.squares[movable_row][movable_col] =\
-                    self.squares[movable_row][movable_col], self.squares[destination_row][destination_col]
-                    self.squares[capture_piece2_row][capture_piece2_col] = capture_piece2_origin
-                else:
-                    self.squares[move_row][move_col], self.squares[movable_row][movable_col] =\
-                    self.squares[movable_row][movable_col], self.squares[move_row][move_col]
-                    self.squares[capture_piece1_row][capture_piece1_col] = capture_piece1_origin
-                    
-        if not computer_capture_moves and computer_non_capture_moves:
-            for i, computer_move in enumerate(computer_non_capture_moves):
-                movable_row, movable_col = computer_non_capture_movables[i][0], computer_non_capture_movables[i][1]
-                move_row, move_col = computer_move[0], computer_move[1]
-                dict_moves[((movable_row, movable_col), (move_row, move_col))] = 0
-                self.squares[movable_row][movable_col], self.squares[move_row][move_col] =\
-                self.squares[move_row][move_col], self.squares[movable_row][movable_col]
-                # judge if human will capture back
-                self.current_player = BLACK
-                _, _, human_capture_moves, human_capture_movables = self.move_options()
-                if human_capture_moves:
-                    for i, human_move in enumerate(human_capture_moves):
-                        human_move_row, human_move_col = human_move[0], human_move[1]
-                        human_movable_row, human_movable_col = human_capture_movables[i][0], human_capture_movables[i][1]
-                        delete_row, delete_col = (human_movable_row + human_move_row) // 2, (human_movable_col + human_move_col) // 2
-                        possible_deleted_pieces = []
-                        possible_deleted_pieces.append((delete_row, delete_col))
-                        # update squares for human capture move
-                        self.squares[human_movable_row][human_movable_col], self.squares[human_move_row][human_move_col] =\
-                        self.squares[human_move_row][human_move_col], self.squares[human_movable_row][human_movable_col]
-                        # update squares for human capture move(continuous jump)
-                        human_possible_continuous_capture_moves = self.capture_move(human_move_row, human_move_col)
-                        if len(human_possible_continuous_capture_moves) > 0:
-                            dict_moves[((movable_row, movable_col), (move_row, move_col))] -= 1
-                        # update squares back for human move
-                        self.squares[human_movable_row][human_movable_col], self.squares[human_move_row][human_move_col] =\
-                        self.squares[human_move_row][human_move_col], self.squares[human_movable_row][human_movable_col]
-                    if computer_move in possible_deleted_pieces:
-                        dict_moves[((movable_row, movable_col), (move_row, move_col))] -= 1
-                self.current_player = RED
-                # update squares back to orginal
-                self.squares[move_row][move_col], self.squares[movable_row][movable_col] =\
-                self.squares[movable_row][movable_col], self.squares[move_row][move_col]
-
-        final_computer_move_path = max(dict_moves, key=lambda i: dict_moves[i])
-        final_computer_movable = final_computer_move_path[0]
-        final_computer_move = final_computer_move_path[1]
-        if final_computer_move in computer_capture_moves:
-            ifcapture = True
-        else:
-            ifcapture = False
-        return final_computer_movable, final_computer_move, ifcapture
+    def use_workers(self, workers):
+        '''
+        Method -- use_workers
+            Split the root moves of the computer player's search across
+            worker processes, or go back to searching in this process
+        Parameters:
+            self -- the current GameState object
+            workers -- the number of worker processes, one per core if None,
+            1 searches in this process
+        Returns:
+            Nothing
+        '''
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+        if workers != 1:
+            path = None
+            if self.tablebase is not None:
+                path = self.tablebase.path
+            self.parallel = ParallelSearch(workers, self.evaluate,
+                                           tablebase_path=path)
 
-    def computer_update_squares(self, computer_movable, computer_move,
-                                ifcapture):
+    def searcher(self):
         '''
-        Method -- computer_update_squares
-            Update the state of each square on the board in nested list after
-            computer player's move
+        Method -- searcher
+            Get the search object search_move runs, the ParallelSearch after
+            use_workers, otherwise a Search made by the first call
         Parameters:
             self -- the current GameState object
-            computer_movable -- the computer player's movable piece
-            computer_move -- the computer player's move piece
-            ifcapture -- Boolean to represent if computer palyer's move is a
-            capture move or a non capture move
         Returns:
-            A nested list storing the newest state of each square on the board
+            A Search or ParallelSearch object
         '''
-        movable_row, movable_col = computer_movable[0], computer_movable[1]
-        move_row, move_col = computer_move[0], computer_move[1]
-        if ifcapture:
-            delete_row, delete_col = (move_row + movable_row) // 2,\
-                (move_col + movable_col) // 2
-            self.squares[delete_row][delete_col] = EMPTY
-            self.squares[movable_row][movable_col],\
-                self.squares[move_row][move_col] =\
-                self.squares[move_row][move_col],\
-                self.squares[movable_row][movable_col]
-        else:
-            self.squares[movable_row][movable_col],\
-                self.squares[move_row][move_col] =\
-                self.squares[move_row][move_col],\
-                self.squares[movable_row][movable_col]
-        return self.squares
+        if self.parallel is not None:
+            return self.parallel
+        if self.search is None:
+            self.search = Search(self.evaluate, self.table, self.tablebase)
+        return self.search
+
+    def search_move(self, time_ms=SEARCH_TIME_MS, node_budget=None,
+                    board=None, generator=random):
+        '''
+        Method -- search_move
+            Calculate the whole move to make for computer player, every jump
+            of a capture path included, with an iteratively deepened
+            alpha-beta search, split across worker processes after
+            use_workers, positions in the opening book are not searched
+        Parameters:
+            self -- the current GameState object
+            time_ms -- the time budget of the search in milliseconds, or None
+            node_budget -- the node budget of the search, or None, of each
+            root move when the search is split across worker processes
+            board -- a BitBoard of the position to search, so a search in
+            another thread does not read squares, the game's position if None
+            generator -- the random generator book moves are picked with
+        Returns:
+            A Move object, or None if computer player cannot move
+        '''
+        if board is None:
+            board = BitBoard.from_squares(self.squares, self.current_player)
+        if self.book is not None:
+            move = self.book.choose(board, generator)
+            if move is not None:
+                return move
+        move, _, _ = self.searcher().iterative_deepening(board, time_ms,
+                                                         node_budget)
+        return move
+
+    def reset_stop(self):
+        '''
+        Method -- reset_stop
+            Forget a stop_search which came after the last search had ended,
+            called before a search_move is handed to another thread, so a
+            stop_search coming before that thread starts still stops it
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            Nothing
+        '''
+        self.searcher().stopped = False
+
+    def stop_search(self):
+        '''
+        Method -- stop_search
+            Stop a search_move running in another thread, which then returns
+            the best move of its last completed depth, workers of a search
+            split across processes stop too
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            Nothing
+        '''
+        self.searcher().stop()
 
     def game_end(self):
         '''
@@ -511,8 +780,8 @@ class GameState:
             A boolean to represent if the game ends and the result prompt to
             show which player wins the game
         '''
-        black_count = 0
-        red_count = 0
+        black_found = False
+        red_found = False
         result_prompt = " "
         if_game_end = False
         BLACK_WIN = "Game Over! You win!"
@@ -521,30 +790,206 @@ class GameState:
             for col in range(0, NUM_SQUARES):
                 if (self.squares[row][col] == BLACK or
                    self.squares[row][col] == BLACK + KING):
-                    black_count += 1
+                    black_found = True
                 elif (self.squares[row][col] == RED or
                       self.squares[row][col] == RED + KING):
-                    red_count += 1
-        if black_count == 0:
+                    red_found = True
+            if black_found and red_found:
+                break
+        if not black_found:
             result_prompt = RED_WIN
             if_game_end = True
-            return if_game_end, result_prompt
-        elif red_count == 0:
+        elif not red_found:
             result_prompt = BLACK_WIN
             if_game_end = True
-            return if_game_end, result_prompt
-        else:
-            _, non_capture_movable_options, _, capture_movable_options =\
-                self.move_options()
-            movable_pieces =\
-                non_capture_movable_options + capture_movable_options
-            if self.current_player == BLACK and len(movable_pieces) == 0:
+        elif not self.has_any_legal_move():
+            if self.current_player == BLACK:
                 result_prompt = RED_WIN
-                if_game_end = True
-                return if_game_end, result_prompt
-            elif self.current_player == RED and len(movable_pieces) == 0:
-                result_prompt = BLACK_WIN
-                if_game_end = True
-                return if_game_end, result_prompt
             else:
-                return if_game_end, result_prompt
+                result_prompt = BLACK_WIN
+            if_game_end = True
+        return if_game_end, result_prompt
+
+    @property
+    def hash_key(self):
+        '''
+        Property -- hash_key
+            The Zobrist hash of the position and current player, the player
+            is folded in when read so current_player can be set directly
+        '''
+        if self.current_player != BLACK:
+            return self.board_key ^ SIDE_KEY
+        return self.board_key
+
+    def apply_move(self, move):
+        '''
+        Method -- apply_move
+            Move the pieces of a move on the board, a man arriving at the last
+            row is upgraded as king
+        Parameters:
+            self -- the current GameState object
+            move -- a Move object
+        Returns:
+            An UndoRecord of the move which has not ended the turn yet
+        '''
+        (origin_row, origin_col), (target_row, target_col) =\
+            move.path[0], move.path[-1]
+        piece = self.squares[origin_row][origin_col]
+        delta = square_key(piece, origin_row, origin_col)
+        captured = []
+        for row, col in move.captures:
+            captured.append(self.squares[row][col])
+            delta ^= square_key(self.squares[row][col], row, col)
+            self.squares[row][col] = EMPTY
+        last_row = NUM_SQUARES - 1 if piece == BLACK else 0
+        promoted = (piece in PLAYER and
+                    any(row == last_row for row, _ in move.path[1:]))
+        if promoted:
+            piece = piece + KING
+        self.squares[origin_row][origin_col] = EMPTY
+        self.squares[target_row][target_col] = piece
+        delta ^= square_key(piece, target_row, target_col)
+        self.board_key ^= delta
+        return UndoRecord(move, tuple(captured), promoted, delta, False)
+
+    def restore_move(self, record):
+        '''
+        Method -- restore_move
+            Move the pieces of an undo record back
+        Parameters:
+            self -- the current GameState object
+            record -- the UndoRecord of the last move applied
+        Returns:
+            Nothing
+        '''
+        (origin_row, origin_col), (target_row, target_col) =\
+            record.move.path[0], record.move.path[-1]
+        piece = self.squares[target_row][target_col]
+        if record.promoted:
+            piece = piece[:-len(KING)]
+        self.squares[target_row][target_col] = EMPTY
+        self.squares[origin_row][origin_col] = piece
+        for (row, col), captured in zip(record.move.captures,
+                                        record.captured):
+            self.squares[row][col] = captured
+        self.board_key ^= record.hash_delta
+
+    def record_step(self, move):
+        '''
+        Method -- record_step
+            Make one step of a turn without switching the current player, and
+            keep it for undo, switch_turn ends the turn
+        Parameters:
+            self -- the current GameState object
+            move -- a Move object
+        Returns:
+            Nothing
+        '''
+        self.history.append(self.apply_move(move))
+        self.redo_stack = []
+
+    def make_move(self, move):
+        '''
+        Method -- make_move
+            Make a move and switch the current player, the turns taken back
+            by undo can no longer be made again
+        Parameters:
+            self -- the current GameState object
+            move -- a Move object of the current player
+        Returns:
+            Nothing
+        '''
+        self.history.append(self.apply_move(move)._replace(switched=True))
+        self.redo_stack = []
+        self.current_player = PLAYER[(PLAYER.index(self.current_player) + 1)
+                                     % 2]
+
+    def unmake_move(self):
+        '''
+        Method -- unmake_move
+            Take back the last move or step made
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            The UndoRecord taken back
+        '''
+        record = self.history.pop()
+        self.restore_move(record)
+        if record.switched:
+            self.current_player =\
+                PLAYER[(PLAYER.index(self.current_player) + 1) % 2]
+        return record
+
+    def undo(self):
+        '''
+        Method -- undo
+            Take back the last turn of a player, every step of it, the
+            selected piece and its jump are forgotten; the steps of a turn
+            still in progress are taken back without being kept for redo,
+            as a redo would leave a piece in the middle of its jump
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            True if a turn was taken back, False if there is nothing to undo
+        '''
+        self.storage_reset()
+        self.movable_piece = []
+        if not self.history:
+            return False
+        if not self.history[-1].switched:
+            while self.history and not self.history[-1].switched:
+                self.unmake_move()
+            return True
+        self.redo_stack.append(self.unmake_move())
+        while self.history and not self.history[-1].switched:
+            self.redo_stack.append(self.unmake_move())
+        return True
+
+    def redo_fits(self, record):
+        '''
+        Method -- redo_fits
+            Check that a move taken back by undo can be made again: its piece
+            belongs to the current player and is still on its origin, the
+            pieces it captured are still there and its target is empty
+        Parameters:
+            self -- the current GameState object
+            record -- an UndoRecord of the redo stack
+        Returns:
+            True if the move fits the board, False otherwise
+        '''
+        (origin_row, origin_col), (target_row, target_col) =\
+            record.move.path[0], record.move.path[-1]
+        piece = self.squares[origin_row][origin_col]
+        if (piece not in (self.current_player, self.current_player + KING)
+           or self.squares[target_row][target_col] != EMPTY):
+            return False
+        return all(self.squares[row][col] == captured
+                   for (row, col), captured in zip(record.move.captures,
+                                                   record.captured))
+
+    def redo(self):
+        '''
+        Method -- redo
+            Make again the last turn taken back by undo, if the board still
+            holds the position it was taken back from, the selected piece
+            and its jump are forgotten
+        Parameters:
+            self -- the current GameState object
+        Returns:
+            True if a turn was made again, False if there is nothing to redo
+            or the turn no longer fits the board
+        '''
+        self.storage_reset()
+        self.movable_piece = []
+        if not self.redo_stack or not self.redo_fits(self.redo_stack[-1]):
+            self.redo_stack = []
+            return False
+        while self.redo_stack:
+            record = self.redo_stack.pop()
+            self.history.append(self.apply_move(record.move)._replace(
+                switched=record.switched))
+            if record.switched:
+                self.current_player =\
+                    PLAYER[(PLAYER.index(self.current_player) + 1) % 2]
+                break
+        return True
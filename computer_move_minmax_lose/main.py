@@ -12,7 +12,12 @@ def main():
     # Click handling
     screen = turtle.Screen()
     screen.onclick(board.click_handler)
+    # Undo and redo the last turns
+    screen.onkey(board.undo_handler, "u")
+    screen.onkey(board.redo_handler, "r")
+    screen.listen()
     turtle.done()
+    board.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,465 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import math
+import random
+import time
+
+from bitboard import BitBoard, BLACK, RED
+from evaluation import material_evaluation, positional_evaluation
+from search import Search
+
+MAX_PLIES = 200
+MATCH_GAMES = 100
+MATCH_NODES = 2000
+ELO_SCALE = 400
+# Normal quantile of a two-sided 95% confidence interval
+CONFIDENCE_Z = 1.96
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.05
+SPRT_PRIOR = 0.5
+
+
+def search_engine(evaluate=positional_evaluation, time_ms=None,
+                  node_budget=MATCH_NODES, batch_evaluate=None):
+    '''
+    Function -- search_engine
+        Make an engine which picks its moves with an iteratively deepened
+        alpha-beta search, the same search as GameState.search_move
+    Parameters:
+        evaluate -- the static evaluation function of the search
+        time_ms -- the time budget of each move in milliseconds, or None
+        node_budget -- the node budget of each move, or None, a node budget
+        keeps the games reproducible whatever the load of the machine
+        batch_evaluate -- a function scoring a list of BitBoard objects in
+        one call, or None
+    Returns:
+        A function taking a BitBoard object and returning a Move object
+    '''
+    search = Search(evaluate, batch_evaluate=batch_evaluate)
+
+    def engine(board):
+        move, _, _ = search.iterative_deepening(board, time_ms, node_budget)
+        return move
+    return engine
+
+
+def random_engine(seed=None):
+    '''
+    Function -- random_engine
+        Make an engine which plays like computer_move_random_choice, it takes
+        the first capture if it has one and a random move otherwise
+    Parameters:
+        seed -- the seed of the engine's random generator, or None
+    Returns:
+        A function taking a BitBoard object and returning a Move object
+    '''
+    generator = random.Random(seed)
+
+    def engine(board):
+        moves = board.legal_moves()
+        if not moves:
+            return None
+        elif moves[0].captures:
+            return moves[0]
+        return generator.choice(moves)
+    return engine
+
+
+def linear_engine(seed=None):
+    '''
+    Function -- linear_engine
+        Make a search engine scoring the leaves of each node in one batch
+        with the linear evaluation of batch_evaluation.py
+    Parameters:
+        seed -- unused, every engine of ENGINES takes a seed
+    Returns:
+        A function taking a BitBoard object and returning a Move object
+    '''
+    # batch_evaluation needs numpy, which the other engines do without
+    from batch_evaluation import evaluate_boards, linear_evaluation
+    return search_engine(linear_evaluation, batch_evaluate=evaluate_boards)
+
+
+def tree_engine(seed=None, playouts=None, batch_size=1):
+    '''
+    Function -- tree_engine
+        Make an engine which picks its moves with Monte Carlo tree search
+    Parameters:
+        seed -- the seed of the engine's random generators, or None
+        playouts -- the number of playouts of each move, the default of
+        mcts_engine if None
+        batch_size -- the number of playouts run at once from each new
+        position
+    Returns:
+        A function taking a BitBoard object and returning a Move object
+    '''
+    # mcts needs numpy, which the other engines do without
+    from mcts import mcts_engine, PLAYOUTS
+    return mcts_engine(playouts or PLAYOUTS, seed=seed,
+                       batch_size=batch_size)
+
+
+ENGINES = {
+    "search": lambda seed: search_engine(positional_evaluation),
+    "material": lambda seed: search_engine(material_evaluation),
+    "linear": linear_engine,
+    "random": random_engine,
+    "mcts": tree_engine,
+    "mcts-batch": lambda seed: tree_engine(seed, 10000, 256),
+}
+
+
+def random_opening(generator, plies):
+    '''
+    Function -- random_opening
+        Play random moves from the initial position so a match does not
+        repeat the same game over and over
+    Parameters:
+        generator -- a random.Random object
+        plies -- the number of random moves to play
+    Returns:
+        A list of Move objects, shorter than plies if the game ended
+    '''
+    board = BitBoard()
+    opening = []
+    for _ in range(plies):
+        moves = board.legal_moves()
+        if not moves:
+            break
+        move = generator.choice(moves)
+        board.make_move(move)
+        opening.append(move)
+    return opening
+
+
+def play_game(black_engine, red_engine, opening=(), max_plies=MAX_PLIES):
+    '''
+    Function -- play_game
+        Play one game between two engines without drawing anything
+    Parameters:
+        black_engine -- the engine playing black, it moves first
+        red_engine -- the engine playing red
+        opening -- Move objects played before the engines take over
+        max_plies -- the number of moves after which the game is a draw
+    Returns:
+        The color of the winner, or None for a draw, and the list of Move
+        objects of the game
+    '''
+    board = BitBoard()
+    moves = list(opening)
+    for move in moves:
+        board.make_move(move)
+    engines = {BLACK: black_engine, RED: red_engine}
+    while len(moves) < max_plies:
+        if not board.has_any_legal_move():
+            winner = BLACK if board.current_player == RED else RED
+            return winner, moves
+        # engines get a copy so they cannot change the game's board
+        move = engines[board.current_player](board.copy())
+        board.make_move(move)
+        moves.append(move)
+    return None, moves
+
+
+def elo_difference(score):
+    '''
+    Function -- elo_difference
+        Convert an expected score into an Elo rating difference
+    Parameters:
+        score -- the expected score between 0 and 1, a draw scoring half
+    Returns:
+        The Elo difference, infinite when the score is 0 or 1
+    '''
+    if score <= 0:
+        return -math.inf
+    elif score >= 1:
+        return math.inf
+    return -ELO_SCALE * math.log10(1 / score - 1)
+
+
+def expected_score(elo):
+    '''
+    Function -- expected_score
+        Convert an Elo rating difference into an expected score
+    Parameters:
+        elo -- the Elo difference
+    Returns:
+        The expected score between 0 and 1
+    '''
+    return 1 / (1 + 10 ** (-elo / ELO_SCALE))
+
+
+def sprt_bounds(alpha=SPRT_ALPHA, beta=SPRT_BETA):
+    '''
+    Function -- sprt_bounds
+        Calculate the log-likelihood ratio bounds of a sequential
+        probability ratio test
+    Parameters:
+        alpha -- the probability of accepting elo1 when elo0 is true
+        beta -- the probability of accepting elo0 when elo1 is true
+    Returns:
+        The lower bound, below which elo0 is accepted, and the upper bound,
+        above which elo1 is accepted
+    '''
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+class MatchStats:
+    '''
+    Class -- MatchStats
+        The running result of a match from the point of view of its first
+        engine
+    Attributes:
+        wins -- The number of games the first engine won
+        draws -- The number of drawn games
+        losses -- The number of games the first engine lost
+        plies -- The number of moves played in every game together
+        seconds -- The time the games took
+    Methods:
+        add -- Count the result of one game
+        games -- The number of games played
+        score -- The average score of the first engine
+        variance -- The variance of the score of one game
+        elo -- The Elo difference between the engines and its 95% margin
+        llr -- The log-likelihood ratio of elo1 against elo0
+        sprt -- Decide a sequential probability ratio test
+        report -- Describe the result in one line
+    '''
+
+    def __init__(self):
+        '''
+        Constructor -- create a new instance of MatchStats
+        Parameters:
+            self -- the current MatchStats object
+        '''
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.plies = 0
+        self.seconds = 0.0
+
+    def add(self, score, plies, seconds):
+        '''
+        Method -- add
+            Count the result of one game
+        Parameters:
+            self -- the current MatchStats object
+            score -- 1, 0.5 or 0 for a win, draw or loss of the first engine
+            plies -- the number of moves of the game
+            seconds -- the time the game took
+        Returns:
+            Nothing
+        '''
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        self.plies += plies
+        self.seconds += seconds
+
+    def games(self):
+        '''
+        Method -- games
+            Get the number of games played
+        Parameters:
+            self -- the current MatchStats object
+        Returns:
+            An integer
+        '''
+        return self.wins + self.draws + self.losses
+
+    def score(self, prior=0):
+        '''
+        Method -- score
+            Get the average score of the first engine
+        Parameters:
+            self -- the current MatchStats object
+            prior -- pseudo games added to each of win, draw and loss
+        Returns:
+            A float between 0 and 1, 0.5 before any game is played
+        '''
+        games = self.games() + 3 * prior
+        if not games:
+            return 0.5
+        return (self.wins + prior + (self.draws + prior) / 2) / games
+
+    def variance(self, prior=0):
+        '''
+        Method -- variance
+            Get the variance of the score of one game
+        Parameters:
+            self -- the current MatchStats object
+            prior -- pseudo games added to each of win, draw and loss
+        Returns:
+            A float
+        '''
+        games = self.games() + 3 * prior
+        if not games:
+            return 0.0
+        mean = self.score(prior)
+        return ((self.wins + prior) * (1 - mean) ** 2
+                + (self.draws + prior) * (0.5 - mean) ** 2
+                + (self.losses + prior) * mean ** 2) / games
+
+    def elo(self):
+        '''
+        Method -- elo
+            Get the Elo difference between the engines
+        Parameters:
+            self -- the current MatchStats object
+        Returns:
+            The Elo difference and the half width of its 95% confidence
+            interval
+        '''
+        score = self.score()
+        if not 0 < score < 1:
+            return elo_difference(score), math.inf
+        deviation = math.sqrt(self.variance() / self.games())
+        low = elo_difference(score - CONFIDENCE_Z * deviation)
+        high = elo_difference(score + CONFIDENCE_Z * deviation)
+        return elo_difference(score), (high - low) / 2
+
+    def llr(self, elo0, elo1):
+        '''
+        Method -- llr
+            Get the log-likelihood ratio of elo1 against elo0, with the game
+            scores taken as normally distributed, half a pseudo game of each
+            result keeps a one-sided match from having no variance
+        Parameters:
+            self -- the current MatchStats object
+            elo0 -- the Elo difference of the null hypothesis
+            elo1 -- the Elo difference of the alternative hypothesis
+        Returns:
+            A float, 0 while the result says nothing yet
+        '''
+        if not self.games():
+            return 0.0
+        score0, score1 = expected_score(elo0), expected_score(elo1)
+        return (self.games() * (score1 - score0)
+                * (2 * self.score(SPRT_PRIOR) - score0 - score1)
+                / (2 * self.variance(SPRT_PRIOR)))
+
+    def sprt(self, elo0, elo1, alpha=SPRT_ALPHA, beta=SPRT_BETA):
+        '''
+        Method -- sprt
+            Decide a sequential probability ratio test
+        Parameters:
+            self -- the current MatchStats object
+            elo0 -- the Elo difference of the null hypothesis
+            elo1 -- the Elo difference of the alternative hypothesis
+            alpha -- the probability of accepting elo1 when elo0 is true
+            beta -- the probability of accepting elo0 when elo1 is true
+        Returns:
+            "H0" or "H1" when a hypothesis is accepted, or None when more
+            games are needed
+        '''
+        lower, upper = sprt_bounds(alpha, beta)
+        llr = self.llr(elo0, elo1)
+        if llr <= lower:
+            return "H0"
+        elif llr >= upper:
+            return "H1"
+        return None
+
+    def report(self):
+        '''
+        Method -- report
+            Describe the result in one line
+        Parameters:
+            self -- the current MatchStats object
+        Returns:
+            A string
+        '''
+        elo, margin = self.elo()
+        games = self.games()
+        return ("games %d  W %d D %d L %d  score %.3f  Elo %+.1f +/- %.1f  "
+                "%.2f games/s  %.0f plies/game"
+                % (games, self.wins, self.draws, self.losses, self.score(),
+                   elo, margin, games / max(self.seconds, 1e-9),
+                   self.plies / max(games, 1)))
+
+
+def run_match(first_engine, second_engine, games=MATCH_GAMES,
+              opening_plies=0, max_plies=MAX_PLIES, sprt=None, seed=None,
+              progress=None):
+    '''
+    Function -- run_match
+        Play a match between two engines, they swap colors after every game
+        and each pair of games starts from the same opening
+    Parameters:
+        first_engine -- the engine whose results are counted
+        second_engine -- its opponent
+        games -- the largest number of games to play
+        opening_plies -- the number of random moves each opening starts with
+        max_plies -- the number of moves after which a game is a draw
+        sprt -- a tuple (elo0, elo1, alpha, beta), the match stops as soon as
+        the test accepts a hypothesis, or None to play every game
+        seed -- the seed of the random openings, or None
+        progress -- a function called with the MatchStats object after each
+        game, or None
+    Returns:
+        The MatchStats object and the accepted hypothesis, None if no test
+        was run or it was not decided
+    '''
+    generator = random.Random(seed)
+    stats = MatchStats()
+    opening = []
+    for game in range(games):
+        if game % 2 == 0:
+            opening = random_opening(generator, opening_plies)
+        first_color = BLACK if game % 2 == 0 else RED
+        engines = (first_engine, second_engine)
+        if first_color == RED:
+            engines = (second_engine, first_engine)
+        start = time.perf_counter()
+        winner, moves = play_game(engines[0], engines[1], opening, max_plies)
+        score = 0.5 if winner is None else float(winner == first_color)
+        stats.add(score, len(moves), time.perf_counter() - start)
+        if progress is not None:
+            progress(stats)
+        if sprt is not None:
+            decision = stats.sprt(*sprt)
+            if decision is not None:
+                return stats, decision
+    return stats, None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play a headless match between two engines.")
+    parser.add_argument("first", choices=list(ENGINES))
+    parser.add_argument("second", choices=list(ENGINES))
+    parser.add_argument("--games", type=int, default=MATCH_GAMES)
+    parser.add_argument("--opening-plies", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--sprt", type=float, nargs=2,
+                        metavar=("ELO0", "ELO1"),
+                        help="stop when a hypothesis is accepted")
+    parser.add_argument("--alpha", type=float, default=SPRT_ALPHA)
+    parser.add_argument("--beta", type=float, default=SPRT_BETA)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+    sprt = None
+    if args.sprt:
+        sprt = (args.sprt[0], args.sprt[1], args.alpha, args.beta)
+    progress = None if args.quiet else lambda stats: print(stats.report())
+    stats, decision = run_match(ENGINES[args.first](args.seed),
+                                ENGINES[args.second](args.seed), args.games,
+                                args.opening_plies, args.max_plies, sprt,
+                                args.seed, progress)
+    print(stats.report())
+    if sprt is not None:
+        print("SPRT [%g, %g] LLR %.2f (%.2f, %.2f): %s"
+              % (sprt[0], sprt[1], stats.llr(sprt[0], sprt[1]),
+                 *sprt_bounds(sprt[2], sprt[3]),
+                 decision or "undecided"))
+
+
+if __name__ == "__main__":
+    main()
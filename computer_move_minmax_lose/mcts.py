@@ -0,0 +1,313 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import math
+import random
+import time
+
+import numpy as np
+
+from batch_playout import playout_board
+from bitboard import BLACK, RED
+
+PLAYOUTS = 2000
+# Moves after which a playout stops and counts as a draw
+PLAYOUT_PLIES = 150
+EXPLORATION = math.sqrt(2)
+# Levels below the old root searched for the new root when reusing a tree,
+# the engine's own move and the opponent's reply
+REUSE_DEPTH = 2
+
+
+def opponent(player):
+    '''
+    Function -- opponent
+        Get the color of the other player
+    Parameters:
+        player -- the color of a player
+    Returns:
+        The color of its opponent
+    '''
+    return RED if player == BLACK else BLACK
+
+
+def random_playout(board, generator, max_plies=PLAYOUT_PLIES):
+    '''
+    Function -- random_playout
+        Finish a game with the policy of computer_move_random_choice, the
+        first capture if there is one and a random move otherwise
+    Parameters:
+        board -- a BitBoard object, it is played on
+        generator -- a random.Random object
+        max_plies -- the number of moves after which the game is a draw
+    Returns:
+        The color of the winner, or None for a draw
+    '''
+    for _ in range(max_plies):
+        moves = board.legal_moves()
+        if not moves:
+            return opponent(board.current_player)
+        move = moves[0] if moves[0].captures else generator.choice(moves)
+        board.make_move(move)
+    return None
+
+
+class Node:
+    '''
+    Class -- Node
+        A position of the Monte Carlo search tree
+    Attributes:
+        move -- The Move object leading to this position, None at the root
+        parent -- The parent Node, None at the root
+        player -- The color of the player who made move
+        key -- The Zobrist hash of the position
+        children -- A list of the expanded child Nodes
+        untried -- A list of the moves not expanded yet, None until the
+        position's moves are generated
+        visits -- The number of playouts through this position
+        score -- The sum of the playout results for player, a draw scoring
+        half
+    Methods:
+        uct -- The upper confidence bound of this position for its parent
+        best_child -- The child with the highest upper confidence bound
+        update -- Count the result of a playout
+        update_batch -- Count the results of a batch of playouts
+    '''
+
+    def __init__(self, move, parent, player, key):
+        '''
+        Constructor -- create a new instance of Node
+        Parameters:
+            self -- the current Node object
+            move -- the Move object leading to this position
+            parent -- the parent Node
+            player -- the color of the player who made move
+            key -- the Zobrist hash of the position
+        '''
+        self.move = move
+        self.parent = parent
+        self.player = player
+        self.key = key
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.score = 0.0
+
+    def uct(self, exploration):
+        '''
+        Method -- uct
+            Calculate the upper confidence bound of this position for its
+            parent's player to choose by
+        Parameters:
+            self -- the current Node object
+            exploration -- the weight of the exploration term
+        Returns:
+            A float
+        '''
+        return (self.score / self.visits + exploration
+                * math.sqrt(math.log(self.parent.visits) / self.visits))
+
+    def best_child(self, exploration):
+        '''
+        Method -- best_child
+            Get the child with the highest upper confidence bound
+        Parameters:
+            self -- the current Node object
+            exploration -- the weight of the exploration term
+        Returns:
+            A Node object
+        '''
+        return max(self.children, key=lambda child: child.uct(exploration))
+
+    def update(self, winner):
+        '''
+        Method -- update
+            Count the result of a playout through this position
+        Parameters:
+            self -- the current Node object
+            winner -- the color of the playout's winner, or None for a draw
+        Returns:
+            Nothing
+        '''
+        self.visits += 1
+        if winner is None:
+            self.score += 0.5
+        elif winner == self.player:
+            self.score += 1
+
+    def update_batch(self, results):
+        '''
+        Method -- update_batch
+            Count the results of a batch of playouts through this position
+        Parameters:
+            self -- the current Node object
+            results -- a dictionary mapping BLACK, RED and None for a draw
+            to the number of playouts with that result
+        Returns:
+            Nothing
+        '''
+        self.visits += sum(results.values())
+        self.score += results[self.player] + results[None] / 2
+
+
+class MCTS:
+    '''
+    Class -- MCTS
+        Monte Carlo tree search with the UCT selection rule and random
+        playouts, the tree of the last move is kept and reused when the
+        game reaches one of its positions
+    Attributes:
+        exploration -- The weight of the exploration term of UCT
+        playout_plies -- The number of moves after which a playout is a draw
+        generator -- The random.Random object of the playouts
+        batch_size -- The number of playouts run at once from each new
+        position with batch_playout, 1 plays them one at a time
+        batch_generator -- The numpy random Generator of batched playouts
+        root -- The root Node of the last search, or None
+        playouts -- The number of playouts of the last search
+    Methods:
+        find_root -- Find the node of a position in the kept tree
+        search -- Run playouts from a position
+        best_move -- Calculate the move of a position within a budget
+    '''
+
+    def __init__(self, exploration=EXPLORATION, playout_plies=PLAYOUT_PLIES,
+                 seed=None, batch_size=1):
+        '''
+        Constructor -- create a new instance of MCTS
+        Parameters:
+            self -- the current MCTS object
+            exploration -- the weight of the exploration term of UCT
+            playout_plies -- the number of moves after which a playout is a
+            draw
+            seed -- the seed of the random generator, or None
+            batch_size -- the number of playouts run at once from each new
+            position, their moves are uniformly random
+        '''
+        self.exploration = exploration
+        self.playout_plies = playout_plies
+        self.generator = random.Random(seed)
+        self.batch_size = batch_size
+        self.batch_generator = np.random.default_rng(seed)
+        self.root = None
+        self.playouts = 0
+
+    def find_root(self, board):
+        '''
+        Method -- find_root
+            Find the node of a position among the kept tree's first levels,
+            so its playouts count for the new search
+        Parameters:
+            self -- the current MCTS object
+            board -- a BitBoard object
+        Returns:
+            A Node object, a new one if the position is not in the tree
+        '''
+        level = [self.root] if self.root is not None else []
+        for _ in range(REUSE_DEPTH + 1):
+            for node in level:
+                if (node.key == board.hash_key
+                   and node.player != board.current_player):
+                    node.parent, node.move = None, None
+                    return node
+            level = [child for node in level for child in node.children]
+        return Node(None, None, opponent(board.current_player),
+                    board.hash_key)
+
+    def search(self, board):
+        '''
+        Method -- search
+            Run playouts from a position: select down the tree by UCT,
+            expand one new position, play randomly to the end and count the
+            results along the path
+        Parameters:
+            self -- the current MCTS object
+            board -- a BitBoard object of the root position, it is not
+            changed
+        Returns:
+            The number of playouts run
+        '''
+        node = self.root
+        board = board.copy()
+        while node.untried == [] and node.children:
+            node = node.best_child(self.exploration)
+            board.make_move(node.move)
+        if node.untried is None:
+            node.untried = board.legal_moves()
+        if node.untried:
+            move = node.untried.pop(
+                self.generator.randrange(len(node.untried)))
+            player = board.current_player
+            board.make_move(move)
+            child = Node(move, node, player, board.hash_key)
+            node.children.append(child)
+            node = child
+        if self.batch_size > 1:
+            results = playout_board(board, self.batch_size,
+                                    self.playout_plies, self.batch_generator)
+            while node is not None:
+                node.update_batch(results)
+                node = node.parent
+            return self.batch_size
+        winner = random_playout(board, self.generator, self.playout_plies)
+        while node is not None:
+            node.update(winner)
+            node = node.parent
+        return 1
+
+    def best_move(self, board, playouts=PLAYOUTS, time_ms=None):
+        '''
+        Method -- best_move
+            Calculate the move of a position, the most visited move after
+            running playouts until the budget runs out
+        Parameters:
+            self -- the current MCTS object
+            board -- a BitBoard object
+            playouts -- the number of playouts to run, or None
+            time_ms -- the time budget in milliseconds, or None
+        Returns:
+            A Move object, or None if the current player cannot move, raises
+            ValueError if there is neither a playout nor a time budget
+        '''
+        if playouts is None and time_ms is None:
+            raise ValueError("MCTS needs a playout or a time budget")
+        moves = board.legal_moves()
+        if len(moves) <= 1:
+            self.root = None
+            return moves[0] if moves else None
+        self.root = self.find_root(board)
+        deadline = float("inf")
+        if time_ms is not None:
+            deadline = time.perf_counter() + time_ms / 1000
+        self.playouts = 0
+        while ((playouts is None or self.playouts < playouts)
+               and time.perf_counter() < deadline):
+            self.playouts += self.search(board)
+        if not self.root.children:
+            return moves[0]
+        return max(self.root.children, key=lambda child: child.visits).move
+
+
+def mcts_engine(playouts=PLAYOUTS, time_ms=None, seed=None, batch_size=1):
+    '''
+    Function -- mcts_engine
+        Make an engine which picks its moves with Monte Carlo tree search,
+        for match.py
+    Parameters:
+        playouts -- the number of playouts of each move, or None
+        time_ms -- the time budget of each move in milliseconds, or None
+        seed -- the seed of the random generator, or None
+        batch_size -- the number of playouts run at once from each new
+        position
+    Returns:
+        A function taking a BitBoard object and returning a Move object,
+        raises ValueError if there is neither a playout nor a time budget
+    '''
+    if playouts is None and time_ms is None:
+        raise ValueError("MCTS needs a playout or a time budget")
+    tree = MCTS(seed=seed, batch_size=batch_size)
+
+    def engine(board):
+        return tree.best_move(board, playouts, time_ms)
+    return engine
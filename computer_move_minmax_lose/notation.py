@@ -0,0 +1,111 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import struct
+
+from bitboard import BitBoard, bit_indices, BLACK, RED, DARK_SQUARES
+
+# Black is "B" as in PDN, red plays the side PDN calls white
+COLOR_LETTERS = {BLACK: "B", RED: "W"}
+LETTER_COLORS = {letter: color for color, letter in COLOR_LETTERS.items()}
+KING_LETTER = "K"
+# Three 32 bit masks, black, red and kings, then the player to move
+BINARY = struct.Struct("<IIIB")
+PLAYER_CODES = {BLACK: 0, RED: 1}
+CODE_PLAYERS = {code: color for color, code in PLAYER_CODES.items()}
+
+
+def color_squares(pieces, kings):
+    '''
+    Function -- color_squares
+        Write the pieces of one color as a list of square numbers
+    Parameters:
+        pieces -- a bitmask of the pieces of the color
+        kings -- a bitmask of the kings
+    Returns:
+        A string of comma separated square numbers, kings have the king
+        letter before their number
+    '''
+    return ",".join((KING_LETTER if kings >> index & 1 else "")
+                    + str(index + 1) for index in bit_indices(pieces))
+
+
+def to_fen(board):
+    '''
+    Function -- to_fen
+        Write a position in the FEN notation of PDN, squares are numbered
+        from 1 to 32 in the order of bitboard.square_index, so black starts
+        on squares 1 to 12, e.g. "B:W21,22,K30:B1,2,K5"
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        A string
+    '''
+    return "%s:W%s:B%s" % (COLOR_LETTERS[board.current_player],
+                           color_squares(board.red, board.kings),
+                           color_squares(board.black, board.kings))
+
+
+def from_fen(text):
+    '''
+    Function -- from_fen
+        Read a position written in the FEN notation of PDN
+    Parameters:
+        text -- a string such as "B:W21,22,K30:B1,2,K5", the two colors may
+        come in either order and a final "." is allowed
+    Returns:
+        A BitBoard object, raises ValueError if the text is not a position
+    '''
+    fields = text.strip().rstrip(".").split(":")
+    if len(fields) != 3 or fields[0] not in LETTER_COLORS:
+        raise ValueError("not a FEN position: %r" % text)
+    masks = {BLACK: 0, RED: 0}
+    kings = 0
+    for field in fields[1:]:
+        if not field or field[0] not in LETTER_COLORS:
+            raise ValueError("not a FEN position: %r" % text)
+        color = LETTER_COLORS[field[0]]
+        for square in filter(None, field[1:].split(",")):
+            king = square.startswith(KING_LETTER)
+            number = int(square[1:] if king else square)
+            if not 1 <= number <= DARK_SQUARES:
+                raise ValueError("no square %d in %r" % (number, text))
+            bit = 1 << (number - 1)
+            if (masks[BLACK] | masks[RED]) & bit:
+                raise ValueError("square %d used twice in %r"
+                                 % (number, text))
+            masks[color] |= bit
+            if king:
+                kings |= bit
+    return BitBoard.from_masks(masks[BLACK], masks[RED], kings,
+                               LETTER_COLORS[fields[0]])
+
+
+def to_bytes(board):
+    '''
+    Function -- to_bytes
+        Encode a position as BINARY.size (13) bytes
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        A bytes object
+    '''
+    return BINARY.pack(board.black, board.red, board.kings,
+                       PLAYER_CODES[board.current_player])
+
+
+def from_bytes(data):
+    '''
+    Function -- from_bytes
+        Decode a position encoded by to_bytes
+    Parameters:
+        data -- a bytes-like object of BINARY.size bytes
+    Returns:
+        A BitBoard object, raises ValueError if the masks overlap or the
+        player is unknown
+    '''
+    black, red, kings, player = BINARY.unpack(data)
+    if black & red or kings & ~(black | red) or player not in CODE_PLAYERS:
+        raise ValueError("not an encoded position: %r" % bytes(data))
+    return BitBoard.from_masks(black, red, kings, CODE_PLAYERS[player])
@@ -0,0 +1,240 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from evaluation import DEFAULT_EVALUATION
+from search import Search, SearchTimeout, order_moves, MAX_DEPTH, MAX_PLY,\
+    SEARCH_TIME_MS, WIN_SCORE
+from tablebase import Tablebase
+from transposition import SharedTranspositionTable, TABLE_MEMORY_MB
+
+# Search object and shared alpha of a worker process, set by init_worker
+_worker_search = None
+_shared_alpha = None
+
+
+def init_worker(evaluate, shared_alpha, stop_flag, table_name,
+                tablebase_path):
+    '''
+    Function -- init_worker
+        Set up a worker process with a Search object of its own, attached to
+        the transposition table every worker shares
+    Parameters:
+        evaluate -- the static evaluation function
+        shared_alpha -- a multiprocessing.Value holding the best root score
+        found so far at the current depth
+        stop_flag -- a multiprocessing.Value stopping every worker's search
+        when set
+        table_name -- the name of the SharedTranspositionTable
+        tablebase_path -- the tablebase file to probe, or None
+    Returns:
+        Nothing
+    '''
+    global _worker_search, _shared_alpha
+    tablebase = None
+    if tablebase_path is not None:
+        tablebase = Tablebase(tablebase_path)
+    _worker_search = Search(evaluate, SharedTranspositionTable(
+        name=table_name), tablebase, stop_flag=stop_flag)
+    _shared_alpha = shared_alpha
+
+
+def search_root_move(board, move_index, depth, deadline, node_budget):
+    '''
+    Function -- search_root_move
+        Search one root move in a worker process, the window starts at the
+        best score any worker has found so far and the worker raises it
+        when the move scores better
+    Parameters:
+        board -- a BitBoard object of the root position
+        move_index -- the index of the move in board.legal_moves()
+        depth -- the search depth of the root position in plies
+        deadline -- the time.time() value at which the search stops, or None
+        node_budget -- the node budget of this move, or None
+    Returns:
+        The move index, its score or None if the budget ran out, True if the
+        score is exact and False if it only bounds the score from above, and
+        the number of nodes visited
+    '''
+    search = _worker_search
+    board.make_move(board.legal_moves()[move_index])
+    search.nodes = 0
+    if deadline is not None:
+        search.deadline = time.perf_counter() + deadline - time.time()
+    if node_budget is not None:
+        search.node_limit = node_budget
+    alpha = _shared_alpha.value
+    try:
+        score = -search.negamax(board, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+    except SearchTimeout:
+        return move_index, None, False, search.nodes
+    finally:
+        search.deadline = float("inf")
+        search.node_limit = float("inf")
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return move_index, score, score > alpha, search.nodes
+
+
+class ParallelSearch:
+    '''
+    Class -- ParallelSearch
+        Iteratively deepened search which splits the root moves of each
+        depth across worker processes, the workers share the best root score
+        so later moves are searched with a narrower window, and share one
+        transposition table so no subtree is searched twice
+    Attributes:
+        workers -- The number of worker processes
+        shared_alpha -- A multiprocessing.Value of the best root score of the
+        current depth
+        stop_flag -- A multiprocessing.Value set by stop, every worker reads
+        it with its clock
+        table -- The SharedTranspositionTable of every worker
+        executor -- The ProcessPoolExecutor running the workers
+        nodes -- The number of positions visited by the last search
+        stopped -- True once stop is called, until the search returns
+    Methods:
+        stop -- Stop a search running in another thread
+        iterative_deepening -- Calculate the best move of a position within
+        a time or node budget
+        close -- Stop the worker processes and free the shared table
+    '''
+
+    def __init__(self, workers=None, evaluate=DEFAULT_EVALUATION,
+                 memory_mb=TABLE_MEMORY_MB, tablebase_path=None):
+        '''
+        Constructor -- create a new instance of ParallelSearch
+        Parameters:
+            self -- the current ParallelSearch object
+            workers -- the number of worker processes, one per core if None
+            evaluate -- the static evaluation function
+            memory_mb -- the memory cap of the shared transposition table
+            tablebase_path -- the tablebase file the workers probe, or None
+        '''
+        self.workers = workers or os.cpu_count() or 1
+        self.shared_alpha = multiprocessing.Value("i", -WIN_SCORE - 1)
+        self.stop_flag = multiprocessing.Value("b", 0)
+        self.table = SharedTranspositionTable(memory_mb)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=init_worker,
+            initargs=(evaluate, self.shared_alpha, self.stop_flag,
+                      self.table.name, tablebase_path))
+        self.nodes = 0
+
+    @property
+    def stopped(self):
+        '''
+        Method -- stopped
+            Check if stop has been called since the last search returned
+        Parameters:
+            self -- the current ParallelSearch object
+        Returns:
+            True if the stop flag is set, False otherwise
+        '''
+        return bool(self.stop_flag.value)
+
+    @stopped.setter
+    def stopped(self, value):
+        '''
+        Method -- stopped
+            Set or clear the stop flag read by every worker
+        Parameters:
+            self -- the current ParallelSearch object
+            value -- True to stop the search, False to let the next one run
+        Returns:
+            Nothing
+        '''
+        self.stop_flag.value = int(value)
+
+    def stop(self):
+        '''
+        Method -- stop
+            Stop a search running in another thread, every worker stops at
+            its next look at the clock and the search returns the best move
+            of its last completed depth
+        Parameters:
+            self -- the current ParallelSearch object
+        Returns:
+            Nothing
+        '''
+        self.stopped = True
+
+    def iterative_deepening(self, board, time_ms=SEARCH_TIME_MS,
+                            node_budget=None, max_depth=MAX_DEPTH):
+        '''
+        Method -- iterative_deepening
+            Calculate the best move of a position by searching one ply
+            deeper at a time, each depth searches its root moves in parallel
+            with the best move of the previous depth first
+        Parameters:
+            self -- the current ParallelSearch object
+            board -- a BitBoard object
+            time_ms -- the time budget in milliseconds, or None
+            node_budget -- the node budget of each root move, or None
+            max_depth -- the deepest search to try
+        Returns:
+            The best Move object of the last completed depth, its score and
+            that depth, the move is None if the current player cannot move
+        '''
+        self.nodes = 0
+        moves = board.legal_moves()
+        if len(moves) <= 1:
+            return (moves[0] if moves else None), 0, 0
+        self.table.new_search()
+        deadline = None
+        if time_ms is not None:
+            deadline = time.time() + time_ms / 1000
+        root = board.copy()
+        order = order_moves(moves)
+        best, best_score, best_depth = moves[order[0]], 0, 0
+        try:
+            for depth in range(1, max_depth + 1):
+                if self.stopped:
+                    break
+                self.shared_alpha.value = -WIN_SCORE - 1
+                futures = [self.executor.submit(search_root_move, root,
+                                                index, depth, deadline,
+                                                node_budget)
+                           for index in order]
+                scores = {}
+                completed = 0
+                for future in as_completed(futures):
+                    index, score, exact, nodes = future.result()
+                    self.nodes += nodes
+                    completed += score is not None
+                    # a move that failed low scores at most the alpha it was
+                    # given, so it cannot beat the move which raised that
+                    # alpha
+                    if exact:
+                        scores[index] = score
+                if completed < len(moves):
+                    break
+                index = max(scores, key=lambda i: scores[i])
+                best, best_score, best_depth =\
+                    moves[index], scores[index], depth
+                order.remove(index)
+                order.insert(0, index)
+                if abs(best_score) > WIN_SCORE - MAX_PLY:
+                    break
+        finally:
+            self.stopped = False
+        return best, best_score, best_depth
+
+    def close(self):
+        '''
+        Method -- close
+            Stop the worker processes and free the shared transposition
+            table
+        Parameters:
+            self -- the current ParallelSearch object
+        Returns:
+            Nothing
+        '''
+        self.executor.shutdown()
+        self.table.close()
@@ -0,0 +1,273 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import re
+from collections import namedtuple
+
+from bitboard import BitBoard, square_index, BLACK, RED
+import notation
+
+PDN_SUFFIX = ".pdn"
+# Results as PDN writes them, "1-0" is a win of black, the player moving
+# first; the draughts scores "2-0", "0-2" and "1-1" are read as well
+RESULTS = {BLACK: "1-0", RED: "0-1", None: "1/2-1/2"}
+UNFINISHED = "*"
+RESULT_WINNERS = {"1-0": BLACK, "0-1": RED, "1/2-1/2": None,
+                  "2-0": BLACK, "0-2": RED, "1-1": None}
+CAPTURE_SEPARATOR = "x"
+MOVE_SEPARATOR = "-"
+LINE_LENGTH = 79
+TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN = re.compile(r'\s*(\{|\(|\)|\[[^\]]*\]|[^\s{}()\[\]]+)')
+MOVE = re.compile(r'(?:\d+\.+)?(\d+(?:[-x]\d+)+)[!?]*$')
+SQUARES = re.compile(r'\d+(?:[-x]\d+)+$')
+
+PdnGame = namedtuple("PdnGame", ["tags", "moves", "result"])
+
+
+def move_text(move):
+    '''
+    Function -- move_text
+        Write a move in PDN notation, squares are numbered as in notation.py
+        and every landing square of a multi-jump is written, e.g. "9x18x27"
+    Parameters:
+        move -- a Move object
+    Returns:
+        A string
+    '''
+    separator = CAPTURE_SEPARATOR if move.captures else MOVE_SEPARATOR
+    return separator.join(str(square_index(*square) + 1)
+                          for square in move.path)
+
+
+def parse_move(position, text):
+    '''
+    Function -- parse_move
+        Find the legal move written in PDN notation, a capture may be
+        written with its origin and final square only if no other capture
+        shares them
+    Parameters:
+        position -- an object with a legal_moves method, a BitBoard or a
+        GameState
+        text -- a string such as "11-15" or "9x18x27"
+    Returns:
+        A Move object, raises ValueError if the text is not exactly one legal
+        move
+    '''
+    if SQUARES.match(text) is None:
+        raise ValueError("not a move %r" % text)
+    squares = [int(square) for square in re.split("[-x]", text)]
+    capture = CAPTURE_SEPARATOR in text
+    found = []
+    for move in position.legal_moves():
+        path = [square_index(*square) + 1 for square in move.path]
+        if (bool(move.captures) == capture and path[0] == squares[0]
+                and path[-1] == squares[-1]
+                and (len(squares) == 2 or path == squares)):
+            found.append(move)
+    if len(found) != 1:
+        raise ValueError("%s move %r" % ("ambiguous" if found else "illegal",
+                                         text))
+    return found[0]
+
+
+def quote(value):
+    '''
+    Function -- quote
+        Write the value of a tag pair
+    Parameters:
+        value -- a string
+    Returns:
+        The value in double quotes, with its quotes and backslashes escaped
+    '''
+    return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def game_text(moves, result=UNFINISHED, tags=None):
+    '''
+    Function -- game_text
+        Write a game in PDN, its tag pairs then its numbered moves wrapped to
+        LINE_LENGTH columns
+    Parameters:
+        moves -- a list of Move objects
+        result -- the result string, one of RESULTS or UNFINISHED
+        tags -- a dictionary of tag pairs, the Result tag is added, a FEN
+        tag gives the starting position and the player moving first
+    Returns:
+        A string ending with a blank line
+    '''
+    tags = dict(tags or {})
+    tags["Result"] = result
+    lines = ["[%s %s]" % (name, quote(str(value)))
+             for name, value in tags.items()]
+    first = BLACK
+    if "FEN" in tags:
+        first = notation.from_fen(tags["FEN"]).current_player
+    tokens = []
+    # a move number stays on the line of its move
+    for ply, move in enumerate(moves, 0 if first == BLACK else 1):
+        if ply % 2 == 0:
+            tokens.append("%d. %s" % (ply // 2 + 1, move_text(move)))
+        elif not tokens:
+            tokens.append("%d... %s" % (ply // 2 + 1, move_text(move)))
+        else:
+            tokens.append(move_text(move))
+    tokens.append(result)
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = line + " " + token if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+def write_game(file, moves, result=UNFINISHED, tags=None):
+    '''
+    Function -- write_game
+        Append one game to an open PDN file
+    Parameters:
+        file -- a text file object
+        moves -- a list of Move objects
+        result -- the result string, one of RESULTS or UNFINISHED
+        tags -- a dictionary of tag pairs
+    Returns:
+        Nothing
+    '''
+    file.write(game_text(moves, result, tags))
+
+
+def read_tokens(lines):
+    '''
+    Function -- read_tokens
+        Split PDN text into tokens one line at a time, comments and
+        variations are skipped
+    Parameters:
+        lines -- an iterable of strings, such as an open file
+    Yields:
+        The strings of tag pairs and movetext tokens
+    '''
+    comment = False
+    variation = 0
+    for line in lines:
+        position = 0
+        while position < len(line):
+            if comment:
+                end = line.find("}", position)
+                if end < 0:
+                    break
+                comment, position = False, end + 1
+                continue
+            match = TOKEN.match(line, position)
+            if match is None:
+                break
+            token, position = match.group(1), match.end()
+            if token == "{":
+                comment = True
+            elif token == "(":
+                variation += 1
+            elif token == ")":
+                variation = max(variation - 1, 0)
+            elif not variation:
+                yield token
+
+
+def read_games(lines):
+    '''
+    Function -- read_games
+        Read the games of a PDN file one at a time, so a file of any size
+        is read in constant memory
+    Parameters:
+        lines -- an iterable of strings, such as an open file
+    Yields:
+        A PdnGame for each game, its tags a dictionary, its moves a list of
+        move strings and its result UNFINISHED if the game has none
+    '''
+    tags, moves = {}, []
+    for token in read_tokens(lines):
+        if token.startswith("["):
+            if moves:
+                yield PdnGame(tags, moves, tags.get("Result", UNFINISHED))
+                tags, moves = {}, []
+            match = TAG.match(token)
+            if match is not None:
+                tags[match.group(1)] = re.sub(r'\\(.)', r'\1',
+                                              match.group(2))
+        elif token in RESULT_WINNERS or token == UNFINISHED:
+            yield PdnGame(tags, moves, token)
+            tags, moves = {}, []
+        else:
+            match = MOVE.match(token)
+            if match is not None:
+                moves.append(match.group(1))
+    if tags or moves:
+        yield PdnGame(tags, moves, tags.get("Result", UNFINISHED))
+
+
+def start_board(game):
+    '''
+    Function -- start_board
+        Get the starting position of a game
+    Parameters:
+        game -- a PdnGame
+    Returns:
+        A BitBoard object, the position of the FEN tag or the initial one
+    '''
+    if "FEN" in game.tags:
+        return notation.from_fen(game.tags["FEN"])
+    return BitBoard()
+
+
+def game_moves(game):
+    '''
+    Function -- game_moves
+        Replay the moves of a game on a BitBoard
+    Parameters:
+        game -- a PdnGame
+    Returns:
+        A list of Move objects, raises ValueError at the first move which is
+        not legal
+    '''
+    board = start_board(game)
+    moves = []
+    for text in game.moves:
+        move = parse_move(board, text)
+        board.make_move(move)
+        moves.append(move)
+    return moves
+
+
+def replay(game, state):
+    '''
+    Function -- replay
+        Set a GameState to the starting position of a game and make its
+        moves, so they can be undone one by one
+    Parameters:
+        game -- a PdnGame
+        state -- a GameState object
+    Returns:
+        The list of Move objects made, raises ValueError at the first move
+        which is not legal
+    '''
+    board = start_board(game)
+    state.set_position(board.to_squares(), board.current_player)
+    moves = game_moves(game)
+    for move in moves:
+        state.make_move(move)
+    return moves
+
+
+def game_winner(game):
+    '''
+    Function -- game_winner
+        Get the winner of a game from its result
+    Parameters:
+        game -- a PdnGame
+    Returns:
+        The color of the winner, None for a draw, raises KeyError if the
+        game has no result
+    '''
+    return RESULT_WINNERS[game.result]
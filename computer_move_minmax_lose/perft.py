@@ -0,0 +1,219 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import time
+
+from bitboard import BitBoard
+from game_state import GameState
+
+NUM_SQUARES = 8
+BLACK = "black"
+RED = "dark red"
+EMPTY = "empty"
+KING = "king"
+# Published leaf counts of 8x8 checkers from the initial position, black to
+# move, by depth starting at 1
+REFERENCE_COUNTS = [7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680,
+                    18391564, 85242128]
+# Positions as (black men, black kings, red men, red kings, player to move)
+# with their leaf counts by depth; the counts were recorded when GameState
+# and BitBoard first agreed on them and guard against regressions
+STORED_POSITIONS = {
+    "kings": (((1, 2),), ((3, 4), (4, 1)), ((6, 3), (5, 6)), ((2, 5),),
+              BLACK, [1, 4, 31, 107, 779, 2364]),
+    "multi-jump": (((0, 5), (2, 1), (2, 3)), (),
+                   ((3, 2), (3, 6), (5, 2), (5, 4), (5, 6)), ((6, 5),),
+                   BLACK, [2, 16, 95, 614, 2955, 15984]),
+    "crowning": (((5, 2), (6, 5), (1, 0)), ((3, 0),),
+                 ((6, 3), (2, 5), (1, 4)), ((4, 7),),
+                 RED, [1, 1, 5, 35, 187, 1307]),
+}
+GENERATORS = ("bitboard", "game_state")
+
+
+def squares_from_pieces(black, black_kings, red, red_kings):
+    '''
+    Function -- squares_from_pieces
+        Build a nested list of squares from the locations of each kind of
+        piece
+    Parameters:
+        black -- locations (row, col) of black men
+        black_kings -- locations of black kings
+        red -- locations of red men
+        red_kings -- locations of red kings
+    Returns:
+        A nested list in the format of GameState.squares
+    '''
+    squares = [[EMPTY for _ in range(NUM_SQUARES)] for _ in
+               range(NUM_SQUARES)]
+    pieces = ((black, BLACK), (black_kings, BLACK + KING), (red, RED),
+              (red_kings, RED + KING))
+    for locations, piece in pieces:
+        for row, col in locations:
+            squares[row][col] = piece
+    return squares
+
+
+def make_position(generator, name=None):
+    '''
+    Function -- make_position
+        Build the initial position or a stored position with one of the move
+        generators
+    Parameters:
+        generator -- "bitboard" or "game_state"
+        name -- a key of STORED_POSITIONS, or None for the initial position
+    Returns:
+        A BitBoard or GameState object
+    '''
+    position = BitBoard() if generator == "bitboard" else GameState()
+    if name is None:
+        return position
+    black, black_kings, red, red_kings, player, _ = STORED_POSITIONS[name]
+    squares = squares_from_pieces(black, black_kings, red, red_kings)
+    if generator == "bitboard":
+        return BitBoard.from_squares(squares, player)
+    position.set_position(squares, player)
+    return position
+
+
+def reference_counts(name=None):
+    '''
+    Function -- reference_counts
+        Get the known leaf counts of a position
+    Parameters:
+        name -- a key of STORED_POSITIONS, or None for the initial position
+    Returns:
+        A list of leaf counts by depth starting at 1
+    '''
+    if name is None:
+        return REFERENCE_COUNTS
+    return STORED_POSITIONS[name][-1]
+
+
+def perft(position, depth):
+    '''
+    Function -- perft
+        Count the leaf nodes of the move tree of a position, a multi-jump
+        capture path counts as one move
+    Parameters:
+        position -- a BitBoard or GameState object, moves are made and taken
+        back on it
+        depth -- the depth of the tree in plies
+    Returns:
+        The number of positions reached after exactly depth moves
+    '''
+    if depth == 0:
+        return 1
+    moves = position.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+
+def divide(position, depth):
+    '''
+    Function -- divide
+        Count the leaf nodes below each move of a position, used to find
+        the move on which two generators disagree
+    Parameters:
+        position -- a BitBoard or GameState object
+        depth -- the depth of the tree in plies, at least 1
+    Returns:
+        A dictionary mapping each Move object to its leaf count
+    '''
+    counts = {}
+    for move in position.legal_moves():
+        position.make_move(move)
+        counts[move] = perft(position, depth - 1)
+        position.unmake_move()
+    return counts
+
+
+def benchmark(generator, name, depth):
+    '''
+    Function -- benchmark
+        Time perft of a position with one of the move generators
+    Parameters:
+        generator -- "bitboard" or "game_state"
+        name -- a key of STORED_POSITIONS, or None for the initial position
+        depth -- the depth of the tree in plies
+    Returns:
+        The number of leaf nodes and the time taken in seconds
+    '''
+    position = make_position(generator, name)
+    start = time.perf_counter()
+    nodes = perft(position, depth)
+    return nodes, time.perf_counter() - start
+
+
+def compare_generators(name, depth):
+    '''
+    Function -- compare_generators
+        Check that both move generators give the same moves and leaf counts
+        below each move of a position
+    Parameters:
+        name -- a key of STORED_POSITIONS, or None for the initial position
+        depth -- the depth of the tree in plies, at least 1
+    Returns:
+        A list of (move, bitboard count, game_state count) tuples for the
+        moves the generators disagree on, empty if they agree
+    '''
+    first = divide(make_position(GENERATORS[0], name), depth)
+    second = divide(make_position(GENERATORS[1], name), depth)
+    mismatches = []
+    for move in list(first) + [move for move in second if move not in first]:
+        if first.get(move) != second.get(move):
+            mismatches.append((move, first.get(move), second.get(move)))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count and time leaf nodes of the move generators.")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--generator", choices=GENERATORS + ("both",),
+                        default="both")
+    parser.add_argument("--position", default="all",
+                        choices=["all", "initial"] + list(STORED_POSITIONS))
+    parser.add_argument("--compare", action="store_true",
+                        help="also compare both generators move by move")
+    args = parser.parse_args()
+    names = [None] + list(STORED_POSITIONS)
+    if args.position == "initial":
+        names = [None]
+    elif args.position != "all":
+        names = [args.position]
+    generators = GENERATORS if args.generator == "both" else\
+        (args.generator,)
+    failed = False
+    for name in names:
+        counts = reference_counts(name)
+        for depth in range(1, args.depth + 1):
+            for generator in generators:
+                nodes, seconds = benchmark(generator, name, depth)
+                expected = counts[depth - 1] if depth <= len(counts) else None
+                status = "-"
+                if expected is not None:
+                    status = "ok" if nodes == expected else "FAIL"
+                    failed = failed or nodes != expected
+                print("%-10s %-10s depth %2d %12d nodes %8.3f s %10.0f n/s %s"
+                      % (name or "initial", generator, depth, nodes, seconds,
+                         nodes / max(seconds, 1e-9), status))
+        if args.compare:
+            mismatches = compare_generators(name, args.depth)
+            for move, first, second in mismatches:
+                print("mismatch", move, first, second)
+            failed = failed or bool(mismatches)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import time
+
+from evaluation import DEFAULT_EVALUATION
+from tablebase import WIN, LOSS
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+WIN_SCORE = 100000
+MAX_PLY = 1000
+SEARCH_DEPTH = 6
+MAX_DEPTH = 64
+SEARCH_TIME_MS = 500
+# The clock is read once every CHECK_INTERVAL + 1 nodes
+CHECK_INTERVAL = 255
+
+
+class SearchTimeout(Exception):
+    '''
+    Class -- SearchTimeout
+        Raised inside a search when its time or node budget runs out
+    '''
+
+
+def score_to_table(score, ply):
+    '''
+    Function -- score_to_table
+        Convert a win or loss score from distance to the root into distance
+        to the stored position, so it stays right wherever it is probed
+    Parameters:
+        score -- the score of a position
+        ply -- the distance in plies from the root position
+    Returns:
+        The score to save in the transposition table
+    '''
+    if score > WIN_SCORE - MAX_PLY:
+        return score + ply
+    elif score < -WIN_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    '''
+    Function -- score_from_table
+        Convert a win or loss score read from the transposition table back
+        into distance to the root
+    Parameters:
+        score -- the score saved in the transposition table
+        ply -- the distance in plies from the root position
+    Returns:
+        The score of the position for the current search
+    '''
+    if score > WIN_SCORE - MAX_PLY:
+        return score - ply
+    elif score < -WIN_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+def tablebase_score(result, plies, ply):
+    '''
+    Function -- tablebase_score
+        Convert the value of a position from the tablebase into a score
+    Parameters:
+        result -- DRAW, WIN or LOSS for the player to move
+        plies -- the number of plies to the end of the game
+        ply -- the distance in plies from the root position
+    Returns:
+        The score of the position, scored like a win or loss found by the
+        search
+    '''
+    if result == WIN:
+        return WIN_SCORE - ply - plies
+    elif result == LOSS:
+        return -WIN_SCORE + ply + plies
+    return 0
+
+
+def order_moves(moves, first=-1):
+    '''
+    Function -- order_moves
+        Sort moves so that a known best move comes first, followed by the
+        longest capture paths
+    Parameters:
+        moves -- a list of Move objects
+        first -- the index of the move to search first, or -1
+    Returns:
+        A list of indices into moves in search order
+    '''
+    order = sorted(range(len(moves)), key=lambda i: len(moves[i].captures),
+                   reverse=True)
+    if 0 <= first < len(moves):
+        order.remove(first)
+        order.insert(0, first)
+    return order
+
+
+class Search:
+    '''
+    Class -- Search
+        Depth limited negamax search with alpha-beta pruning and a
+        transposition table
+    Attributes:
+        evaluate -- A static evaluation function, scores a BitBoard from the
+        point of view of its current player
+        table -- A TranspositionTable shared by every search of this object
+        tablebase -- A Tablebase giving the exact score of positions with
+        few pieces, or None
+        batch_evaluate -- A function scoring a list of BitBoard objects in
+        one call, used for every child of a node one ply above the leaves,
+        or None to call evaluate on each leaf
+        nodes -- The number of positions visited since the search started
+        root_move -- The best Move object found at the root position
+        deadline -- The time.perf_counter() value at which the search stops
+        node_limit -- The number of nodes at which the search stops
+        stopped -- True once stop is called, until the search returns
+        stop_flag -- A multiprocessing.Value which stops the search when set,
+        read with the clock, so one flag stops searches in many processes,
+        or None
+    Methods:
+        check_budget -- Stop the search if its budget has run out
+        stop -- Stop a search running in another thread
+        leaf_scores -- Score the quiet children of a node in one batch
+        negamax -- Calculate the score of a position by searching its moves
+        best_move -- Calculate the best move of a position at a fixed depth
+        iterative_deepening -- Calculate the best move of a position within
+        a time or node budget
+    '''
+
+    def __init__(self, evaluate=DEFAULT_EVALUATION, table=None,
+                 tablebase=None, batch_evaluate=None, stop_flag=None):
+        '''
+        Constructor -- create a new instance of Search
+        Parameters:
+            self -- the current Search object
+            evaluate -- the static evaluation function
+            table -- a TranspositionTable, a new one is made if None
+            tablebase -- a Tablebase, or None
+            batch_evaluate -- a function scoring a list of BitBoard objects,
+            or None
+            stop_flag -- a multiprocessing.Value stopping the search when
+            set, or None
+        '''
+        self.evaluate = evaluate
+        self.table = table if table is not None else TranspositionTable()
+        self.tablebase = tablebase
+        self.batch_evaluate = batch_evaluate
+        self.nodes = 0
+        self.root_move = None
+        self.deadline = float("inf")
+        self.node_limit = float("inf")
+        self.stopped = False
+        self.stop_flag = stop_flag
+
+    def check_budget(self):
+        '''
+        Method -- check_budget
+            Stop the search if its time or node budget has run out, stop
+            has been called or the stop flag is set
+        Parameters:
+            self -- the current Search object
+        Returns:
+            Nothing, raises SearchTimeout when the budget has run out
+        '''
+        if self.stopped or self.nodes >= self.node_limit or (
+           not self.nodes & CHECK_INTERVAL
+           and (time.perf_counter() >= self.deadline
+                or self.stop_flag is not None and self.stop_flag.value)):
+            raise SearchTimeout()
+
+    def stop(self):
+        '''
+        Method -- stop
+            Stop a search running in another thread at its next node, the
+            search returns the best move of its last completed depth
+        Parameters:
+            self -- the current Search object
+        Returns:
+            Nothing
+        '''
+        self.stopped = True
+
+    def leaf_scores(self, board, moves, ply):
+        '''
+        Method -- leaf_scores
+            Score the children of a node one ply above the leaves, the quiet
+            ones in one call of batch_evaluate
+        Parameters:
+            self -- the current Search object
+            board -- a BitBoard object, moves are made and taken back on it
+            moves -- the legal Move objects of the board
+            ply -- the distance in plies from the root position
+        Returns:
+            A list with the score of each child from the point of view of
+            its own player, None for a child with a capture to search
+        '''
+        scores = [None] * len(moves)
+        quiet, children = [], []
+        for index, move in enumerate(moves):
+            board.make_move(move)
+            first = next(board.iter_moves(), None)
+            if first is None:
+                scores[index] = -WIN_SCORE + ply + 1
+            elif not first.captures:
+                quiet.append(index)
+                children.append(board.copy())
+            board.unmake_move()
+        for index, score in zip(quiet, self.batch_evaluate(children)):
+            scores[index] = score
+        return scores
+
+    def negamax(self, board, depth, alpha, beta, ply):
+        '''
+        Method -- negamax
+            Calculate the score of a position by searching its moves, capture
+            moves are still searched when the depth runs out so that the
+            evaluation is never called in the middle of an exchange
+        Parameters:
+            self -- the current Search object
+            board -- a BitBoard object, moves are made and taken back on it
+            so it holds the same position again when the method returns
+            depth -- the remaining depth in plies
+            alpha -- the lower bound of the search window
+            beta -- the upper bound of the search window
+            ply -- the distance in plies from the root position
+        Returns:
+            The score of the position from the point of view of its current
+            player, wins found closer to the root score higher
+        '''
+        self.nodes += 1
+        self.check_budget()
+        key = board.hash_key
+        entry = self.table.probe(key)
+        table_index = -1
+        if entry is not None:
+            table_depth, flag, score, table_index = entry
+            if table_depth >= depth and ply > 0:
+                score = score_from_table(score, ply)
+                if (flag == EXACT or (flag == LOWER and score >= beta)
+                   or (flag == UPPER and score <= alpha)):
+                    return score
+        if self.tablebase is not None and ply > 0:
+            entry = self.tablebase.probe(board)
+            if entry is not None:
+                return tablebase_score(entry[0], entry[1], ply)
+        if depth <= 0:
+            # captures come first, so the first move tells if any is left
+            first = next(board.iter_moves(), None)
+            if first is None:
+                return -WIN_SCORE + ply
+            elif not first.captures:
+                return self.evaluate(board)
+        moves = board.legal_moves()
+        if not moves:
+            return -WIN_SCORE + ply
+        alpha_origin = alpha
+        best_score, best_index = -WIN_SCORE - 1, -1
+        leaves = [None] * len(moves)
+        if depth == 1 and self.batch_evaluate is not None:
+            leaves = self.leaf_scores(board, moves, ply)
+        for index in order_moves(moves, table_index):
+            if leaves[index] is not None:
+                self.nodes += 1
+                score = -leaves[index]
+            else:
+                board.make_move(moves[index])
+                try:
+                    score = -self.negamax(board, depth - 1, -beta, -alpha,
+                                          ply + 1)
+                finally:
+                    board.unmake_move()
+            if score > best_score:
+                best_score, best_index = score, index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        flag = EXACT
+        if best_score <= alpha_origin:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        self.table.store(key, max(depth, 0), flag,
+                         score_to_table(best_score, ply), best_index)
+        if ply == 0:
+            self.root_move = moves[best_index]
+        return best_score
+
+    def best_move(self, board, depth=SEARCH_DEPTH):
+        '''
+        Method -- best_move
+            Calculate the best move of a position at a fixed depth
+        Parameters:
+            self -- the current Search object
+            board -- a BitBoard object
+            depth -- the search depth in plies
+        Returns:
+            The best Move object and its score, the move is None if the
+            current player cannot move
+        '''
+        self.root_move = None
+        score = self.negamax(board, depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+        return self.root_move, score
+
+    def iterative_deepening(self, board, time_ms=SEARCH_TIME_MS,
+                            node_budget=None, max_depth=MAX_DEPTH):
+        '''
+        Method -- iterative_deepening
+            Calculate the best move of a position by searching one ply
+            deeper at a time until the time or node budget runs out, the
+            transposition table carries the best moves of each depth over to
+            the next one
+        Parameters:
+            self -- the current Search object
+            board -- a BitBoard object
+            time_ms -- the time budget in milliseconds, or None
+            node_budget -- the node budget, or None
+            max_depth -- the deepest search to try
+        Returns:
+            The best Move object of the last completed depth, its score and
+            that depth, the move is None if the current player cannot move
+        '''
+        self.nodes = 0
+        moves = board.legal_moves()
+        if len(moves) <= 1:
+            return (moves[0] if moves else None), 0, 0
+        self.table.new_search()
+        if time_ms is not None:
+            self.deadline = time.perf_counter() + time_ms / 1000
+        if node_budget is not None:
+            self.node_limit = node_budget
+        # fall back on the first move in search order if no depth completes
+        best, best_score, best_depth = moves[order_moves(moves)[0]], 0, 0
+        try:
+            for depth in range(1, max_depth + 1):
+                move, score = self.best_move(board, depth)
+                best, best_score, best_depth = move, score, depth
+                if abs(score) > WIN_SCORE - MAX_PLY:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = float("inf")
+            self.node_limit = float("inf")
+            self.stopped = False
+        return best, best_score, best_depth
@@ -0,0 +1,145 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import json
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bitboard import BLACK, RED
+from game_state import GameState
+from match import random_opening, MAX_PLIES, MATCH_NODES
+from pdn import write_game, PDN_SUFFIX, RESULTS
+
+SELFPLAY_GAMES = 100
+# Games kept in flight per worker, enough to keep every worker busy while
+# finished records are handed back
+GAMES_PER_WORKER = 2
+
+GameRecord = namedtuple("GameRecord", ["index", "winner", "moves",
+                                       "seconds"])
+
+
+def play_selfplay_game(index, seed, opening_plies=0, max_plies=MAX_PLIES,
+                       node_budget=MATCH_NODES):
+    '''
+    Function -- play_selfplay_game
+        Play one game of the computer player against itself, run inside a
+        worker process with a GameState of its own
+    Parameters:
+        index -- the number of the game in the self-play run
+        seed -- the seed of the run, the random moves of each game, its
+        opening and its book moves, depend only on the seed and its index
+        opening_plies -- the number of random moves the game starts with
+        max_plies -- the number of moves after which the game is a draw
+        node_budget -- the node budget of each move
+    Returns:
+        A GameRecord, its winner is None for a draw
+    '''
+    start = time.perf_counter()
+    game = GameState()
+    # a string seed, so no two (seed, index) pairs share a generator
+    generator = random.Random("%d-%d" % (seed, index))
+    moves = random_opening(generator, opening_plies)
+    for move in moves:
+        game.make_move(move)
+    winner = None
+    while len(moves) < max_plies:
+        if not game.has_any_legal_move():
+            winner = BLACK if game.current_player == RED else RED
+            break
+        move = game.search_move(None, node_budget, generator=generator)
+        game.make_move(move)
+        moves.append(move)
+    return GameRecord(index, winner, moves, time.perf_counter() - start)
+
+
+def selfplay(games=SELFPLAY_GAMES, workers=None, seed=0, opening_plies=0,
+             max_plies=MAX_PLIES, node_budget=MATCH_NODES):
+    '''
+    Function -- selfplay
+        Play games of the computer player against itself in a pool of
+        worker processes, a whole game per task
+    Parameters:
+        games -- the number of games to play
+        workers -- the number of worker processes, one per core if None
+        seed -- the seed of the random openings
+        opening_plies -- the number of random moves each game starts with
+        max_plies -- the number of moves after which a game is a draw
+        node_budget -- the node budget of each move
+    Yields:
+        A GameRecord for each game as soon as it is finished, so records
+        may come back out of order
+    '''
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        index = 0
+        while index < games or pending:
+            # submit lazily so a long run does not queue every game at once
+            while index < games and len(pending) < workers * GAMES_PER_WORKER:
+                pending.add(executor.submit(play_selfplay_game, index, seed,
+                                            opening_plies, max_plies,
+                                            node_budget))
+                index += 1
+            future = next(as_completed(pending))
+            pending.remove(future)
+            yield future.result()
+
+
+def record_to_json(record):
+    '''
+    Function -- record_to_json
+        Convert a game record into one line of JSON
+    Parameters:
+        record -- a GameRecord
+    Returns:
+        A string without a line break, each move is written as its list of
+        [row, col] squares
+    '''
+    return json.dumps({"index": record.index, "winner": record.winner,
+                       "moves": [move.path for move in record.moves]})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play the computer player against itself on every "
+                    "core.")
+    parser.add_argument("--games", type=int, default=SELFPLAY_GAMES)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--nodes", type=int, default=MATCH_NODES)
+    parser.add_argument("--output", help="file to write game records to, "
+                                         "PDN if it ends with .pdn and one "
+                                         "JSON line per game otherwise")
+    args = parser.parse_args()
+    output = open(args.output, "w") if args.output else None
+    results = {BLACK: 0, RED: 0, None: 0}
+    start = time.perf_counter()
+    try:
+        for record in selfplay(args.games, args.workers, args.seed,
+                               args.opening_plies, args.max_plies,
+                               args.nodes):
+            results[record.winner] += 1
+            if output is not None and args.output.endswith(PDN_SUFFIX):
+                write_game(output, record.moves, RESULTS[record.winner],
+                           {"Event": "selfplay", "Round": record.index + 1})
+            elif output is not None:
+                output.write(record_to_json(record) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+    seconds = time.perf_counter() - start
+    print("games %d  black %d  red %d  draws %d  %.2f s  %.2f games/s"
+          % (args.games, results[BLACK], results[RED], results[None],
+             seconds, args.games / max(seconds, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
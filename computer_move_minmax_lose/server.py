@@ -0,0 +1,436 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import asyncio
+import json
+import logging
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import BLACK, RED
+from book import open_book
+from evaluation import DEFAULT_EVALUATION
+from game_state import GameState
+from notation import from_bytes
+from pdn import move_text, parse_move
+from search import Search, SEARCH_TIME_MS
+from tablebase import open_tablebase
+from transposition import TranspositionTable
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# Sessions unused for this long are closed, checked every EVICT_INTERVAL
+IDLE_SECONDS = 300
+EVICT_INTERVAL = 10
+MAX_SESSIONS = 10000
+# Computer moves waiting for or running in the pool, per worker, more wait
+# in the event loop without holding any pool resources
+QUEUE_PER_WORKER = 2
+
+# Search and book of a worker process, set by init_worker
+_worker_search = None
+_worker_book = None
+
+
+def init_worker():
+    '''
+    Function -- init_worker
+        Set up a worker process with a search and book of its own, shared by
+        every session whose computer moves it searches
+    Parameters:
+        None
+    Returns:
+        Nothing
+    '''
+    global _worker_search, _worker_book
+    _worker_search = Search(DEFAULT_EVALUATION, TranspositionTable(),
+                            open_tablebase())
+    _worker_book = open_book()
+
+
+def search_position(data, time_ms, node_budget):
+    '''
+    Function -- search_position
+        Calculate the computer player's move of a position in a worker
+        process
+    Parameters:
+        data -- the position encoded by notation.to_bytes
+        time_ms -- the time budget in milliseconds, or None
+        node_budget -- the node budget, or None
+    Returns:
+        The path of the move, or None if the player to move cannot move
+    '''
+    board = from_bytes(data)
+    move = None
+    if _worker_book is not None:
+        move = _worker_book.choose(board)
+    if move is None:
+        move, _, _ = _worker_search.iterative_deepening(board, time_ms,
+                                                        node_budget)
+    return move.path if move is not None else None
+
+
+class ServerError(Exception):
+    '''
+    Class -- ServerError
+        Raised by a request the server cannot carry out, its message is sent
+        back to the client
+    '''
+
+
+def request_number(request, name, default=None):
+    '''
+    Function -- request_number
+        Read a whole number field of a request
+    Parameters:
+        request -- a dictionary decoded from a JSON line
+        name -- the name of the field
+        default -- the value of a missing or null field
+    Returns:
+        The number or default, raises ServerError if the field is not a
+        positive whole number or null
+    '''
+    value = request.get(name)
+    if value is None:
+        return default
+    if type(value) is not int or value <= 0:
+        raise ServerError("%s must be a positive whole number" % name)
+    return value
+
+
+def request_text(request, name, required=True):
+    '''
+    Function -- request_text
+        Read a string field of a request
+    Parameters:
+        request -- a dictionary decoded from a JSON line
+        name -- the name of the field
+        required -- False if the field may be missing or null
+    Returns:
+        The string, or None if an optional field is missing, raises
+        ServerError if the field is not a string
+    '''
+    value = request.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise ServerError("%s must be a string" % name)
+    return value
+
+
+class Session:
+    '''
+    Class -- Session
+        One game hosted by the server
+    Attributes:
+        game -- The GameState object of the game, it does not search
+        lock -- An asyncio.Lock held while a request changes the game
+        last_used -- The event loop time of the last request
+    Methods:
+        state -- Describe the game for a reply
+    '''
+
+    def __init__(self, now):
+        '''
+        Constructor -- create a new instance of Session
+        Parameters:
+            self -- the current Session object
+            now -- the event loop time
+        '''
+        self.game = GameState(searching=False)
+        self.lock = asyncio.Lock()
+        self.last_used = now
+
+    def state(self):
+        '''
+        Method -- state
+            Describe the game for a reply
+        Parameters:
+            self -- the current Session object
+        Returns:
+            A dictionary with the position in FEN notation, the player to
+            move, the legal moves in PDN notation and the winner, None while
+            the game goes on
+        '''
+        moves = [move_text(move) for move in self.game.legal_moves()]
+        winner = None
+        if not moves:
+            winner = RED if self.game.current_player == BLACK else BLACK
+        return {"fen": self.game.to_fen(),
+                "player": self.game.current_player,
+                "moves": moves, "winner": winner}
+
+
+class GameServer:
+    '''
+    Class -- GameServer
+        An asyncio server hosting many games over JSON lines, each request
+        is an object with a "command" and each reply an object with "ok";
+        the computer player's moves are searched in a bounded process pool
+        so the event loop never waits on a search:
+            new [fen] -- start a game, reply with its "session"
+            state session -- describe the game
+            move session move -- make a move written in PDN notation
+            computer session [time_ms] [nodes] -- let the computer player
+            move
+            undo session / redo session -- take back or make again a turn
+            close session -- end the game
+    Attributes:
+        sessions -- A dictionary mapping session ids to Session objects
+        executor -- The ProcessPoolExecutor searching computer moves
+        slots -- An asyncio.Semaphore bounding the searches handed to the
+        pool
+        time_ms -- The default time budget of a computer move
+        idle_seconds -- The time after which an unused session is closed
+        max_sessions -- The largest number of open sessions
+    Methods:
+        session -- Find the session of a request
+        computer_move -- Search and make the computer player's move
+        handle_request -- Carry out one request
+        handle_connection -- Serve the requests of one client
+        evict_idle -- Close unused sessions every EVICT_INTERVAL seconds
+        serve -- Listen for clients until cancelled
+        close -- Shut the process pool down
+    '''
+
+    def __init__(self, workers=None, time_ms=SEARCH_TIME_MS,
+                 idle_seconds=IDLE_SECONDS, max_sessions=MAX_SESSIONS):
+        '''
+        Constructor -- create a new instance of GameServer
+        Parameters:
+            self -- the current GameServer object
+            workers -- the number of worker processes, one per core if None
+            time_ms -- the default time budget of a computer move
+            idle_seconds -- the time after which an unused session is closed
+            max_sessions -- the largest number of open sessions
+        '''
+        workers = workers or os.cpu_count() or 1
+        self.sessions = {}
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=init_worker)
+        self.slots = asyncio.Semaphore(workers * QUEUE_PER_WORKER)
+        self.time_ms = time_ms
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+
+    def session(self, request):
+        '''
+        Method -- session
+            Find the session of a request and mark it used
+        Parameters:
+            self -- the current GameServer object
+            request -- a dictionary with a "session" id
+        Returns:
+            A Session object, raises ServerError if there is no such session
+        '''
+        key = request_text(request, "session")
+        session = self.sessions.get(key)
+        if session is None:
+            raise ServerError("no session %r" % key)
+        session.last_used = asyncio.get_running_loop().time()
+        return session
+
+    async def computer_move(self, session, time_ms, node_budget):
+        '''
+        Method -- computer_move
+            Search the computer player's move in the process pool and make
+            it, the game is locked meanwhile so no other move slips in
+        Parameters:
+            self -- the current GameServer object
+            session -- a Session object
+            time_ms -- the time budget in milliseconds, or None
+            node_budget -- the node budget, or None
+        Returns:
+            The move made in PDN notation, raises ServerError if the player
+            to move cannot move
+        '''
+        loop = asyncio.get_running_loop()
+        async with session.lock:
+            game = session.game
+            async with self.slots:
+                path = await loop.run_in_executor(
+                    self.executor, search_position, game.to_bytes(),
+                    time_ms, node_budget)
+            if path is None:
+                raise ServerError("the game is over")
+            move = next(move for move in game.legal_moves()
+                        if move.path == path)
+            game.make_move(move)
+            session.last_used = loop.time()
+            return move_text(move)
+
+    async def handle_request(self, request):
+        '''
+        Method -- handle_request
+            Carry out one request
+        Parameters:
+            self -- the current GameServer object
+            request -- a dictionary decoded from a JSON line
+        Returns:
+            The reply dictionary, raises ServerError or ValueError if the
+            request cannot be carried out
+        '''
+        command = request.get("command")
+        if command == "new":
+            if len(self.sessions) >= self.max_sessions:
+                raise ServerError("too many sessions")
+            fen = request_text(request, "fen", required=False)
+            session = Session(asyncio.get_running_loop().time())
+            if fen:
+                session.game.set_fen(fen)
+            key = secrets.token_hex(8)
+            self.sessions[key] = session
+            return dict(session.state(), session=key)
+        elif command == "close":
+            self.session(request)
+            del self.sessions[request["session"]]
+            return {}
+        session = self.session(request)
+        if command == "state":
+            return session.state()
+        elif command == "move":
+            async with session.lock:
+                session.game.make_move(
+                    parse_move(session.game, request_text(request, "move")))
+            return session.state()
+        elif command == "computer":
+            move = await self.computer_move(
+                session, request_number(request, "time_ms", self.time_ms),
+                request_number(request, "nodes"))
+            return dict(session.state(), move=move)
+        elif command in ("undo", "redo"):
+            async with session.lock:
+                getattr(session.game, command)()
+            return session.state()
+        raise ServerError("unknown command %r" % command)
+
+    async def handle_connection(self, reader, writer):
+        '''
+        Method -- handle_connection
+            Serve the requests of one client one at a time, each reply
+            carries the "id" of its request if it has one; a request failing
+            in an unexpected way is logged and answered with an error, so
+            the connection stays up
+        Parameters:
+            self -- the current GameServer object
+            reader -- the asyncio.StreamReader of the connection
+            writer -- the asyncio.StreamWriter of the connection
+        Returns:
+            Nothing
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ServerError("a request is a JSON object")
+                    reply = await self.handle_request(request)
+                    reply["ok"] = True
+                except (ServerError, ValueError) as error:
+                    reply = {"ok": False, "error": str(error)}
+                except Exception:
+                    logging.exception("request %r failed", request)
+                    reply = {"ok": False, "error": "internal error"}
+                if isinstance(request, dict) and "id" in request:
+                    reply["id"] = request["id"]
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # the client left, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def evict_idle(self):
+        '''
+        Method -- evict_idle
+            Close the sessions unused for idle_seconds every EVICT_INTERVAL
+            seconds, until cancelled, so memory does not grow with games
+            clients have left
+        Parameters:
+            self -- the current GameServer object
+        Returns:
+            Nothing
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(EVICT_INTERVAL)
+            oldest = loop.time() - self.idle_seconds
+            for key, session in list(self.sessions.items()):
+                if session.last_used < oldest and not session.lock.locked():
+                    del self.sessions[key]
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT, path=None):
+        '''
+        Method -- serve
+            Listen for clients until cancelled
+        Parameters:
+            self -- the current GameServer object
+            host -- the TCP host to listen on
+            port -- the TCP port to listen on
+            path -- a Unix socket path to listen on instead of TCP, or None
+        Returns:
+            Nothing
+        '''
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection,
+                                                     path)
+        else:
+            server = await asyncio.start_server(self.handle_connection,
+                                                host, port)
+        eviction = asyncio.create_task(self.evict_idle())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction.cancel()
+
+    def close(self):
+        '''
+        Method -- close
+            Shut the process pool down
+        Parameters:
+            self -- the current GameServer object
+        Returns:
+            Nothing
+        '''
+        self.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Host many checkers games over JSON lines.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", help="Unix socket path to listen on "
+                                       "instead of TCP")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--time-ms", type=int, default=SEARCH_TIME_MS)
+    parser.add_argument("--idle-seconds", type=int, default=IDLE_SECONDS)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+
+    async def run():
+        server = GameServer(args.workers, args.time_ms, args.idle_seconds,
+                            args.max_sessions)
+        try:
+            await server.serve(args.host, args.port, args.unix)
+        finally:
+            server.close()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import argparse
+import mmap
+import os
+import struct
+import time
+from itertools import combinations
+from math import comb
+
+from bitboard import BitBoard, bit_count, bit_indices, PLAYER, HALF_ROW,\
+    DARK_SQUARES
+
+TABLEBASE_PIECES = 3
+TABLEBASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "endgame.tb")
+# Men never stand on their own last row, so each color's men have one row
+# fewer to stand on
+MAN_SQUARES = DARK_SQUARES - HALF_ROW
+# The file starts with a header and a directory entry for each slice, the
+# one byte values of every slice follow
+MAGIC = b"CKTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+DIRECTORY_ENTRY = struct.Struct("<4BQQ")
+DRAW, WIN, LOSS = range(3)
+# A value byte is 0 for a draw, the number of plies to a win, or LOSS_BASE
+# plus the number of plies to a loss; longer distances are stored as
+# MAX_DISTANCE, the result stays exact but the distance is then a floor
+LOSS_BASE = 128
+MAX_DISTANCE = LOSS_BASE - 1
+# Each slice's moves are generated in this many parts per worker, so the
+# workers share the slices of a level evenly
+PARTS_PER_WORKER = 4
+
+# Tables of slices solved so far, set in each worker by init_solver
+_solved = {}
+
+
+def encode(result, plies):
+    '''
+    Function -- encode
+        Encode the value of a position as one byte
+    Parameters:
+        result -- DRAW, WIN or LOSS for the player to move
+        plies -- the number of plies to the end of the game
+    Returns:
+        An integer between 0 and 255, distances over MAX_DISTANCE are
+        encoded as MAX_DISTANCE
+    '''
+    plies = min(plies, MAX_DISTANCE)
+    if result == WIN:
+        return plies
+    elif result == LOSS:
+        return LOSS_BASE + plies
+    return 0
+
+
+def decode(value):
+    '''
+    Function -- decode
+        Decode a value byte made by encode
+    Parameters:
+        value -- an integer between 0 and 255
+    Returns:
+        A tuple (result, plies)
+    '''
+    if value >= LOSS_BASE:
+        return LOSS, value - LOSS_BASE
+    elif value:
+        return WIN, value
+    return DRAW, 0
+
+
+def rank(indices):
+    '''
+    Function -- rank
+        Number a set of squares among all sets of the same size
+    Parameters:
+        indices -- the square indices in increasing order
+    Returns:
+        An integer from 0 to comb(squares, len(indices)) - 1
+    '''
+    return sum(comb(index, place + 1) for place, index in enumerate(indices))
+
+
+def slice_key(board):
+    '''
+    Function -- slice_key
+        Get the slice of a position, the number of each kind of piece
+    Parameters:
+        board -- a BitBoard object
+    Returns:
+        A tuple (black men, black kings, red men, red kings)
+    '''
+    kings = board.kings
+    return (bit_count(board.black & ~kings), bit_count(board.black & kings),
+            bit_count(board.red & ~kings), bit_count(board.red & kings))
+
+
+def slice_size(key):
+    '''
+    Function -- slice_size
+        Get the number of values in the table of a slice, sets of squares
+        that overlap are numbered too and never probed
+    Parameters:
+        key -- a tuple (black men, black kings, red men, red kings)
+    Returns:
+        An integer
+    '''
+    black_men, black_kings, red_men, red_kings = key
+    return (comb(MAN_SQUARES, black_men) * comb(MAN_SQUARES, red_men)
+            * comb(DARK_SQUARES, black_kings)
+            * comb(DARK_SQUARES, red_kings) * len(PLAYER))
+
+
+def position_index(key, board):
+    '''
+    Function -- position_index
+        Get the place of a position in the table of its slice
+    Parameters:
+        key -- the slice_key of the board
+        board -- a BitBoard object
+    Returns:
+        An integer below slice_size(key)
+    '''
+    _, black_kings, red_men, red_kings = key
+    kings = board.kings
+    index = rank(list(bit_indices(board.black & ~kings)))
+    index = index * comb(MAN_SQUARES, red_men) + rank(
+        [square - HALF_ROW for square in bit_indices(board.red & ~kings)])
+    index = index * comb(DARK_SQUARES, black_kings) + rank(
+        list(bit_indices(board.black & kings)))
+    index = index * comb(DARK_SQUARES, red_kings) + rank(
+        list(bit_indices(board.red & kings)))
+    return index * len(PLAYER) + PLAYER.index(board.current_player)
+
+
+def slice_positions(key):
+    '''
+    Function -- slice_positions
+        Generate every position of a slice
+    Parameters:
+        key -- a tuple (black men, black kings, red men, red kings)
+    Yields:
+        A BitBoard object for each arrangement of the pieces and each player
+        to move
+    '''
+    black_men, black_kings, red_men, red_kings = key
+    for black_set in combinations(range(MAN_SQUARES), black_men):
+        black = sum(1 << square for square in black_set)
+        for red_set in combinations(range(HALF_ROW, DARK_SQUARES), red_men):
+            red = sum(1 << square for square in red_set)
+            if black & red:
+                continue
+            for black_king_set in combinations(range(DARK_SQUARES),
+                                               black_kings):
+                black_king = sum(1 << square for square in black_king_set)
+                if black_king & (black | red):
+                    continue
+                for red_king_set in combinations(range(DARK_SQUARES),
+                                                 red_kings):
+                    red_king = sum(1 << square for square in red_king_set)
+                    if red_king & (black | red | black_king):
+                        continue
+                    for player in PLAYER:
+                        yield BitBoard.from_masks(
+                            black | black_king, red | red_king,
+                            black_king | red_king, player)
+
+
+def tablebase_slices(max_pieces=TABLEBASE_PIECES):
+    '''
+    Function -- tablebase_slices
+        List the slices with both colors on the board and at most max_pieces
+        pieces, grouped into levels a slice only depends on earlier levels
+        of: a capture leaves fewer pieces and a crowning fewer men
+    Parameters:
+        max_pieces -- the largest number of pieces
+    Returns:
+        A list of levels, each one a list of slice keys
+    '''
+    levels = {}
+    for pieces in range(2, max_pieces + 1):
+        for black in range(1, pieces):
+            red = pieces - black
+            for black_men in range(black + 1):
+                for red_men in range(red + 1):
+                    key = (black_men, black - black_men, red_men,
+                           red - red_men)
+                    levels.setdefault((pieces, black_men + red_men),
+                                      []).append(key)
+    return [levels[level] for level in sorted(levels)]
+
+
+def init_solver(solved):
+    '''
+    Function -- init_solver
+        Give a worker process the tables of the slices solved so far
+    Parameters:
+        solved -- a dictionary mapping slice keys to their value bytes
+    Returns:
+        Nothing
+    '''
+    global _solved
+    _solved = solved
+
+
+def expand_slice(key, part=0, parts=1):
+    '''
+    Function -- expand_slice
+        Make the moves of one part of the positions of a slice, moves
+        leaving the slice are looked up in the tables of solved slices
+    Parameters:
+        key -- a tuple (black men, black kings, red men, red kings)
+        part -- the part to expand, the positions whose number in
+        slice_positions order leaves this remainder divided by parts
+        parts -- the number of parts the slice is split into
+    Returns:
+        A list of tuples (index, inside, outside) for each position of the
+        part, inside the indices of the children in the slice, outside the
+        (result, plies) values of the other children
+    '''
+    expanded = []
+    for number, board in enumerate(slice_positions(key)):
+        if number % parts != part:
+            continue
+        inside, outside = [], []
+        for move in board.legal_moves():
+            board.make_move(move)
+            if not board.black or not board.red:
+                outside.append((LOSS, 0))
+            else:
+                child_key = slice_key(board)
+                child_index = position_index(child_key, board)
+                if child_key == key:
+                    inside.append(child_index)
+                else:
+                    outside.append(decode(_solved[child_key][child_index]))
+            board.unmake_move()
+        expanded.append((position_index(key, board), inside, outside))
+    return expanded
+
+
+def solve_slice(key, expanded):
+    '''
+    Function -- solve_slice
+        Calculate the value of every position of a slice by retrograde
+        analysis: positions are settled in order of their distance to the
+        end, and each settled position is passed back to the positions
+        with a move to it, a loss makes them won one ply later and a win
+        settles them as lost once all their moves lead to wins; positions
+        never settled are draws
+    Parameters:
+        key -- a tuple (black men, black kings, red men, red kings)
+        expanded -- the (index, inside, outside) tuples of every position of
+        the slice, made by expand_slice
+    Returns:
+        The slice key and a bytes object of its values
+    '''
+    parents = {}
+    # moves into the slice not yet settled as wins, and the longest win
+    unsettled, longest = {}, {}
+    # positions to settle, by their distance to the end
+    pending = {}
+    for index, inside, outside in expanded:
+        for child in inside:
+            parents.setdefault(child, []).append(index)
+        unsettled[index] = len(inside)
+        longest[index] = -1
+        for result, plies in outside:
+            if result == WIN:
+                longest[index] = max(longest[index], plies)
+                continue
+            if result == LOSS:
+                pending.setdefault(plies + 1, []).append((index, WIN))
+            # a move not leading to a win means the position is never lost
+            unsettled[index] = -1
+        if not inside and unsettled[index] == 0:
+            pending.setdefault(longest[index] + 1, []).append((index, LOSS))
+    solved = {}
+    plies = 0
+    while pending:
+        for index, result in pending.pop(plies, []):
+            if index in solved:
+                continue
+            solved[index] = result, plies
+            for parent in parents.get(index, []):
+                if result == LOSS:
+                    pending.setdefault(plies + 1, []).append((parent, WIN))
+                elif unsettled[parent] > 0:
+                    unsettled[parent] -= 1
+                    longest[parent] = max(longest[parent], plies)
+                    if unsettled[parent] == 0:
+                        pending.setdefault(longest[parent] + 1, []).append(
+                            (parent, LOSS))
+        plies += 1
+    values = bytearray(slice_size(key))
+    for index, (result, distance) in solved.items():
+        values[index] = encode(result, distance)
+    return key, bytes(values)
+
+
+def build_tablebase(max_pieces=TABLEBASE_PIECES, path=TABLEBASE_FILE,
+                    workers=None, progress=None):
+    '''
+    Function -- build_tablebase
+        Solve every slice of at most max_pieces pieces and write them to a
+        file, the moves of every slice of a level are made in parallel, in
+        PARTS_PER_WORKER parts per worker, and each slice is then solved
+    Parameters:
+        max_pieces -- the largest number of pieces
+        path -- the file to write
+        workers -- the number of worker processes, one per core if None
+        progress -- a function called with each solved slice key, or None
+    Returns:
+        A dictionary mapping slice keys to their value bytes
+    '''
+    # only building needs a pool, the engine probing the file starts faster
+    # without it
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    parts = workers * PARTS_PER_WORKER
+    solved = {}
+    for level in tablebase_slices(max_pieces):
+        if workers == 1:
+            init_solver(solved)
+            expanded = {key: expand_slice(key) for key in level}
+        else:
+            # a new pool for each level, so its workers get the slices
+            # solved by the levels before
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=init_solver,
+                                     initargs=(solved,)) as executor:
+                futures = {key: [executor.submit(expand_slice, key, part,
+                                                 parts)
+                                 for part in range(parts)]
+                           for key in level}
+                expanded = {key: [position for future in futures[key]
+                                  for position in future.result()]
+                            for key in level}
+        for key in level:
+            _, solved[key] = solve_slice(key, expanded.pop(key))
+            if progress is not None:
+                progress(key)
+    write_tablebase(path, max_pieces, solved)
+    return solved
+
+
+def write_tablebase(path, max_pieces, solved):
+    '''
+    Function -- write_tablebase
+        Write solved slices to a file, a header and a directory of the
+        slices followed by their values
+    Parameters:
+        path -- the file to write
+        max_pieces -- the largest number of pieces of the slices
+        solved -- a dictionary mapping slice keys to their value bytes
+    Returns:
+        Nothing
+    '''
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(solved)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, max_pieces, len(solved)))
+        for key, values in solved.items():
+            file.write(DIRECTORY_ENTRY.pack(*key, offset, len(values)))
+            offset += len(values)
+        for values in solved.values():
+            file.write(values)
+
+
+class Tablebase:
+    '''
+    Class -- Tablebase
+        An endgame tablebase file probed through mmap, so only the pages of
+        the slices reached by a search are read into memory
+    Attributes:
+        path -- The path of the file
+        max_pieces -- The largest number of pieces of a position in the file
+        data -- The mmap object of the file
+        slices -- A dictionary mapping slice keys to the offset of their
+        values in the file
+    Methods:
+        probe -- Look up the value of a position
+        close -- Close the file
+    '''
+
+    def __init__(self, path=TABLEBASE_FILE):
+        '''
+        Constructor -- create a new instance of Tablebase
+        Parameters:
+            self -- the current Tablebase object
+            path -- the file written by build_tablebase
+        '''
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = HEADER.unpack_from(
+            self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError("%s is not a tablebase file" % path)
+        self.slices = {}
+        for number in range(count):
+            entry = DIRECTORY_ENTRY.unpack_from(
+                self.data, HEADER.size + number * DIRECTORY_ENTRY.size)
+            self.slices[entry[:4]] = entry[4]
+
+    def probe(self, board):
+        '''
+        Method -- probe
+            Look up the value of a position
+        Parameters:
+            self -- the current Tablebase object
+            board -- a BitBoard object with both colors on the board
+        Returns:
+            A tuple (result, plies) for the player to move, or None if the
+            position has too many pieces
+        '''
+        if bit_count(board.black | board.red) > self.max_pieces:
+            return None
+        key = slice_key(board)
+        offset = self.slices.get(key)
+        if offset is None:
+            return None
+        return decode(self.data[offset + position_index(key, board)])
+
+    def close(self):
+        '''
+        Method -- close
+            Close the file
+        Parameters:
+            self -- the current Tablebase object
+        Returns:
+            Nothing
+        '''
+        self.data.close()
+
+
+def open_tablebase(path=TABLEBASE_FILE):
+    '''
+    Function -- open_tablebase
+        Open a tablebase file if it has been built
+    Parameters:
+        path -- the file written by build_tablebase
+    Returns:
+        A Tablebase object, or None if there is no such file
+    '''
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build an endgame tablebase by retrograde analysis.")
+    parser.add_argument("--pieces", type=int, default=TABLEBASE_PIECES)
+    parser.add_argument("--output", default=TABLEBASE_FILE)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    solved = build_tablebase(args.pieces, args.output, args.workers,
+                             lambda key: print("solved", key))
+    print("%d slices, %d bytes in %.1f s"
+          % (len(solved), sum(len(values) for values in solved.values()),
+             time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+EXACT, LOWER, UPPER = range(3)
+TABLE_MEMORY_MB = 16
+# Rough size of one entry: the tuple, its 64 bit key and its score
+ENTRY_BYTES = 160
+BUCKET_SIZE = 2
+DEPTH_PREFERRED, ALWAYS_REPLACE = range(BUCKET_SIZE)
+# A shared entry is a data word and a check word of WORD_BYTES each, the
+# data word packs the fields below from its lowest bit up
+WORD_BYTES = 8
+SHARED_ENTRY_BYTES = 2 * WORD_BYTES
+SHARED_HEADER = 1
+DEPTH_BITS, FLAG_BITS, SCORE_BITS, MOVE_BITS, GENERATION_BITS =\
+    8, 2, 20, 8, 8
+DEPTH_MASK = (1 << DEPTH_BITS) - 1
+FLAG_MASK = (1 << FLAG_BITS) - 1
+SCORE_MASK = (1 << SCORE_BITS) - 1
+MOVE_MASK = (1 << MOVE_BITS) - 1
+GENERATION_MASK = (1 << GENERATION_BITS) - 1
+FLAG_SHIFT = DEPTH_BITS
+SCORE_SHIFT = FLAG_SHIFT + FLAG_BITS
+MOVE_SHIFT = SCORE_SHIFT + SCORE_BITS
+GENERATION_SHIFT = MOVE_SHIFT + MOVE_BITS
+# Scores are stored with this offset so they are never negative, no score
+# reaches -SCORE_OFFSET so a data word of 0 always means an empty slot
+SCORE_OFFSET = 1 << (SCORE_BITS - 1)
+
+
+def pack_entry(depth, flag, score, move_index, generation):
+    '''
+    Function -- pack_entry
+        Pack the fields of a search result into one 64 bit word
+    Parameters:
+        depth -- the depth the position was searched to, at most DEPTH_MASK
+        flag -- EXACT, LOWER or UPPER
+        score -- the score of the position
+        move_index -- the index of the best move, or -1 if unknown
+        generation -- the number of the search
+    Returns:
+        A non-zero integer below 2 ** 64
+    '''
+    return (min(depth, DEPTH_MASK) | flag << FLAG_SHIFT
+            | (score + SCORE_OFFSET) << SCORE_SHIFT
+            | ((move_index + 1) & MOVE_MASK) << MOVE_SHIFT
+            | (generation & GENERATION_MASK) << GENERATION_SHIFT)
+
+
+def unpack_entry(data):
+    '''
+    Function -- unpack_entry
+        Unpack a word made by pack_entry
+    Parameters:
+        data -- the packed word
+    Returns:
+        A tuple (depth, flag, score, move_index, generation)
+    '''
+    return (data & DEPTH_MASK, data >> FLAG_SHIFT & FLAG_MASK,
+            (data >> SCORE_SHIFT & SCORE_MASK) - SCORE_OFFSET,
+            (data >> MOVE_SHIFT & MOVE_MASK) - 1,
+            data >> GENERATION_SHIFT & GENERATION_MASK)
+
+
+class TranspositionTable:
+    '''
+    Class -- TranspositionTable
+        A fixed size hash table of search results keyed by Zobrist hash, each
+        bucket holds a depth-preferred slot and an always-replace slot
+    Attributes:
+        size -- The number of buckets, a power of two
+        entries -- A flat list of BUCKET_SIZE * size slots, each one is None
+        or a tuple (key, depth, flag, score, move_index, generation)
+        generation -- The number of the current search, entries of older
+        searches are replaced first
+    Methods:
+        clear -- Empty every slot of the table
+        new_search -- Start a new search so older entries can be replaced
+        probe -- Look up the entry of a position
+        store -- Save the result of a searched position
+    '''
+
+    def __init__(self, memory_mb=TABLE_MEMORY_MB):
+        '''
+        Constructor -- create a new instance of TranspositionTable
+        Parameters:
+            self -- the current TranspositionTable object
+            memory_mb -- the memory cap of the table in megabytes
+        '''
+        buckets = max(1, memory_mb * 1024 * 1024
+                      // (ENTRY_BYTES * BUCKET_SIZE))
+        self.size = 1 << (buckets.bit_length() - 1)
+        self.entries = []
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        '''
+        Method -- clear
+            Empty every slot of the table
+        Parameters:
+            self -- the current TranspositionTable object
+        Returns:
+            Nothing
+        '''
+        self.entries = [None] * (self.size * BUCKET_SIZE)
+        self.generation = 0
+
+    def new_search(self):
+        '''
+        Method -- new_search
+            Start a new search so entries of older searches can be replaced
+            even if they were searched deeper
+        Parameters:
+            self -- the current TranspositionTable object
+        Returns:
+            Nothing
+        '''
+        self.generation += 1
+
+    def probe(self, key):
+        '''
+        Method -- probe
+            Look up the entry of a position
+        Parameters:
+            self -- the current TranspositionTable object
+            key -- the Zobrist hash of the position
+        Returns:
+            A tuple (depth, flag, score, move_index), or None if the position
+            is not in the table
+        '''
+        slot = (key & (self.size - 1)) * BUCKET_SIZE
+        for entry in (self.entries[slot + DEPTH_PREFERRED],
+                      self.entries[slot + ALWAYS_REPLACE]):
+            if entry is not None and entry[0] == key:
+                return entry[1:5]
+        return None
+
+    def store(self, key, depth, flag, score, move_index):
+        '''
+        Method -- store
+            Save the result of a searched position, the depth-preferred slot
+            is only replaced by a deeper or newer result and hands its old
+            entry down to the always-replace slot, any other result goes to
+            the always-replace slot
+        Parameters:
+            self -- the current TranspositionTable object
+            key -- the Zobrist hash of the position
+            depth -- the depth the position was searched to
+            flag -- EXACT, LOWER or UPPER, how score bounds the true score
+            score -- the score of the position
+            move_index -- the index of the best move in the list of legal
+            moves of the position, or -1 if unknown
+        Returns:
+            Nothing
+        '''
+        slot = (key & (self.size - 1)) * BUCKET_SIZE
+        entry = (key, depth, flag, score, move_index, self.generation)
+        preferred = self.entries[slot + DEPTH_PREFERRED]
+        if (preferred is None or preferred[0] == key
+           or preferred[1] <= depth or preferred[5] != self.generation):
+            self.entries[slot + DEPTH_PREFERRED] = entry
+            if preferred is not None and preferred[0] != key:
+                self.entries[slot + ALWAYS_REPLACE] = preferred
+        else:
+            self.entries[slot + ALWAYS_REPLACE] = entry
+
+
+class SharedTranspositionTable:
+    '''
+    Class -- SharedTranspositionTable
+        A transposition table in shared memory which every search process
+        probes and stores into without locks, each slot holds two 64 bit
+        words, the packed data and the key XOR the data, so a slot torn by
+        two processes writing at once no longer matches its key and is
+        ignored
+    Attributes:
+        size -- The number of buckets, a power of two
+        memory -- The multiprocessing.shared_memory.SharedMemory block
+        words -- The block as a memoryview of 64 bit words, the first
+        SHARED_HEADER words hold the search generation, then two words per
+        slot
+        owner -- True if this object made the block and unlinks it on close
+    Methods:
+        name -- The name other processes attach to the block with
+        generation -- The number of the current search
+        clear -- Empty every slot of the table
+        new_search -- Start a new search so older entries can be replaced
+        read -- Read a slot and the key it was stored with
+        write -- Write a slot with its check word
+        probe -- Look up the entry of a position
+        store -- Save the result of a searched position
+        close -- Detach from the block, and free it if this object made it
+    '''
+
+    def __init__(self, memory_mb=TABLE_MEMORY_MB, name=None):
+        '''
+        Constructor -- create a new instance of SharedTranspositionTable
+        Parameters:
+            self -- the current SharedTranspositionTable object
+            memory_mb -- the memory cap of the table in megabytes, unused when
+            attaching to an existing table
+            name -- the name of an existing table to attach to, or None to
+            make a new one
+        '''
+        # only parallel searches share a table, the engine starts faster
+        # without multiprocessing
+        from multiprocessing import shared_memory
+        if name is None:
+            buckets = max(1, memory_mb * 1024 * 1024
+                          // (SHARED_ENTRY_BYTES * BUCKET_SIZE))
+            size = 1 << (buckets.bit_length() - 1)
+            self.memory = shared_memory.SharedMemory(
+                create=True, size=(SHARED_HEADER + size * BUCKET_SIZE * 2)
+                * WORD_BYTES)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.words = self.memory.buf.cast("Q")
+        # the block may be rounded up to whole pages
+        self.size = 1 << (((len(self.words) - SHARED_HEADER)
+                           // (BUCKET_SIZE * 2)).bit_length() - 1)
+        if self.owner:
+            self.clear()
+
+    @property
+    def name(self):
+        '''
+        Method -- name
+            Get the name other processes attach to the table with
+        Parameters:
+            self -- the current SharedTranspositionTable object
+        Returns:
+            A string
+        '''
+        return self.memory.name
+
+    @property
+    def generation(self):
+        '''
+        Method -- generation
+            Get the number of the current search, shared by every process
+        Parameters:
+            self -- the current SharedTranspositionTable object
+        Returns:
+            An integer between 0 and GENERATION_MASK
+        '''
+        return self.words[0]
+
+    def clear(self):
+        '''
+        Method -- clear
+            Empty every slot of the table
+        Parameters:
+            self -- the current SharedTranspositionTable object
+        Returns:
+            Nothing
+        '''
+        self.memory.buf[:] = bytes(len(self.memory.buf))
+
+    def new_search(self):
+        '''
+        Method -- new_search
+            Start a new search so entries of older searches can be replaced
+            even if they were searched deeper, only the process which starts
+            the search calls it
+        Parameters:
+            self -- the current SharedTranspositionTable object
+        Returns:
+            Nothing
+        '''
+        self.words[0] = (self.words[0] + 1) & GENERATION_MASK
+
+    def read(self, slot):
+        '''
+        Method -- read
+            Read the data word of a slot and the key it was stored with
+        Parameters:
+            self -- the current SharedTranspositionTable object
+            slot -- the index of the slot
+        Returns:
+            The key and the data word, the data word is 0 for an empty slot
+        '''
+        word = SHARED_HEADER + slot * 2
+        data = self.words[word + 1]
+        return self.words[word] ^ data, data
+
+    def write(self, slot, key, data):
+        '''
+        Method -- write
+            Write the data word of a slot with its check word
+        Parameters:
+            self -- the current SharedTranspositionTable object
+            slot -- the index of the slot
+            key -- the Zobrist hash of the position
+            data -- the packed data word
+        Returns:
+            Nothing
+        '''
+        word = SHARED_HEADER + slot * 2
+        self.words[word] = key ^ data
+        self.words[word + 1] = data
+
+    def probe(self, key):
+        '''
+        Method -- probe
+            Look up the entry of a position
+        Parameters:
+            self -- the current SharedTranspositionTable object
+            key -- the Zobrist hash of the position
+        Returns:
+            A tuple (depth, flag, score, move_index), or None if the position
+            is not in the table
+        '''
+        slot = (key & (self.size - 1)) * BUCKET_SIZE
+        for offset in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            entry_key, data = self.read(slot + offset)
+            if data and entry_key == key:
+                return unpack_entry(data)[:4]
+        return None
+
+    def store(self, key, depth, flag, score, move_index):
+        '''
+        Method -- store
+            Save the result of a searched position, slots are replaced the
+            same way as in TranspositionTable
+        Parameters:
+            self -- the current SharedTranspositionTable object
+            key -- the Zobrist hash of the position
+            depth -- the depth the position was searched to
+            flag -- EXACT, LOWER or UPPER, how score bounds the true score
+            score -- the score of the position
+            move_index -- the index of the best move in the list of legal
+            moves of the position, or -1 if unknown
+        Returns:
+            Nothing
+        '''
+        slot = (key & (self.size - 1)) * BUCKET_SIZE
+        generation = self.words[0]
+        data = pack_entry(depth, flag, score, move_index, generation)
+        preferred_key, preferred = self.read(slot + DEPTH_PREFERRED)
+        old_depth, _, _, _, old_generation = unpack_entry(preferred)
+        if (not preferred or preferred_key == key or old_depth <= depth
+           or old_generation != generation):
+            self.write(slot + DEPTH_PREFERRED, key, data)
+            if preferred and preferred_key != key:
+                self.write(slot + ALWAYS_REPLACE, preferred_key, preferred)
+        else:
+            self.write(slot + ALWAYS_REPLACE, key, data)
+
+    def close(self):
+        '''
+        Method -- close
+            Detach from the shared memory block, and free it if this object
+            made it
+        Parameters:
+            self -- the current SharedTranspositionTable object
+        Returns:
+            Nothing
+        '''
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
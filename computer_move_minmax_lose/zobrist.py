@@ -0,0 +1,57 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+NUM_SQUARES = 8
+BLACK = "black"
+RED = "dark red"
+KING = "king"
+DARK_SQUARES = NUM_SQUARES * NUM_SQUARES // 2
+ZOBRIST_SEED = 20231127
+HASH_BITS = 64
+
+# Keys are drawn from a fixed seed, so every process and every run hashes a
+# position to the same value
+_generator = random.Random(ZOBRIST_SEED)
+PIECE_KEYS = {piece: [_generator.getrandbits(HASH_BITS)
+                      for _ in range(DARK_SQUARES)]
+              for piece in (BLACK, BLACK + KING, RED, RED + KING)}
+SIDE_KEY = _generator.getrandbits(HASH_BITS)
+
+
+def square_key(piece, row, col):
+    '''
+    Function -- square_key
+        Get the Zobrist key of a piece standing on a dark square
+    Parameters:
+        piece -- the piece in GameState notation, e.g. RED + KING
+        row -- the square's row position
+        col -- the square's col position
+    Returns:
+        A 64 bit integer
+    '''
+    return PIECE_KEYS[piece][row * NUM_SQUARES // 2 + col // 2]
+
+
+def hash_squares(squares, current_player):
+    '''
+    Function -- hash_squares
+        Calculate the Zobrist hash of a position from scratch, incremental
+        updates of the hash after each move start from this value
+    Parameters:
+        squares -- a nested list in the format of GameState.squares
+        current_player -- the color of the player to move
+    Returns:
+        A 64 bit integer, the same for equal positions with the same player
+        to move
+    '''
+    key = 0
+    for row in range(NUM_SQUARES):
+        for col in range(NUM_SQUARES):
+            if squares[row][col] in PIECE_KEYS:
+                key ^= square_key(squares[row][col], row, col)
+    if current_player != BLACK:
+        key ^= SIDE_KEY
+    return key
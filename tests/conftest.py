@@ -0,0 +1,90 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import os
+import sys
+import time
+
+import pytest
+
+# the modules import one another by their flat names
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "computer_move_minmax_lose"))
+
+
+class FakePen:
+    '''
+    Records what a turtle.Turtle would draw, for tests without a display
+    '''
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.position = (0, 0)
+        self.shape_name = None
+
+    def __getattr__(self, name):
+        # pen moves and fills draw nothing worth checking
+        return lambda *args, **kwargs: None
+
+    def setposition(self, x, y=None):
+        self.position = (x, y)
+
+    def shape(self, name=None):
+        if name is not None:
+            self.shape_name = name
+        return self.shape_name
+
+    def stamp(self):
+        self.screen.next_stamp += 1
+        self.screen.stamps[self.screen.next_stamp] = (self.position,
+                                                      self.shape_name)
+        return self.screen.next_stamp
+
+    def clearstamp(self, stamp):
+        del self.screen.stamps[stamp]
+
+    def write(self, text, *args, **kwargs):
+        self.screen.written.append(text)
+
+
+class FakeTurtle:
+    '''
+    Stands in for the turtle module: keeps the stamps on the screen, the
+    text written and the timers set, which run_timers calls
+    '''
+
+    def __init__(self):
+        self.stamps = {}
+        self.next_stamp = 0
+        self.written = []
+        self.timers = []
+
+    def Turtle(self):
+        return FakePen(self)
+
+    def Shape(self, kind):
+        return FakePen(self)
+
+    def ontimer(self, function, milliseconds=0):
+        self.timers.append(function)
+
+    def run_timers(self, limit=1000):
+        while self.timers and limit:
+            self.timers.pop(0)()
+            limit -= 1
+            time.sleep(0.01)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def fake_turtle(monkeypatch):
+    '''
+    Let board.py draw on a FakeTurtle
+    '''
+    import board
+    screen = FakeTurtle()
+    monkeypatch.setattr(board, "turtle", screen)
+    return screen
@@ -0,0 +1,61 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import pytest
+
+from batch_evaluation import evaluate_boards, linear_evaluation,\
+    feature_matrix, board_arrays, FEATURES
+from bitboard import BitBoard, BLACK, RED, KING, STEP_TABLE, bit_indices
+from search import Search
+from test_bitboard import random_walk
+from test_search import random_positions
+
+
+def side_counts(board, color):
+    '''
+    The men, kings and non capture steps of one side, counted square by
+    square
+    '''
+    pieces = board.black if color == BLACK else board.red
+    empty = ~(board.black | board.red)
+    men, kings, steps = 0, 0, 0
+    for index in bit_indices(pieces):
+        king = board.kings >> index & 1
+        kings += king
+        men += 1 - king
+        piece = color + KING if king else color
+        steps += sum(1 for target, _ in STEP_TABLE[piece][index]
+                     if target & empty)
+    return men, kings, steps
+
+
+def test_features_count_both_sides():
+    boards = [board for seed in range(6) for board in random_walk(seed)]
+    matrix = feature_matrix(*board_arrays(boards))
+    men, kings = FEATURES.index("men"), FEATURES.index("kings")
+    mobility = FEATURES.index("mobility")
+    for board, row in zip(boards, matrix):
+        other = RED if board.current_player == BLACK else BLACK
+        own = side_counts(board, board.current_player)
+        opponent = side_counts(board, other)
+        assert row[men] == own[0] - opponent[0]
+        assert row[kings] == own[1] - opponent[1]
+        assert row[mobility] == own[2] - opponent[2]
+
+
+def test_batch_scores_match_single_scores():
+    boards = random_walk(2)
+    assert evaluate_boards(boards) == [linear_evaluation(board)
+                                       for board in boards]
+    assert evaluate_boards([]) == []
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_batched_search_gives_the_same_root_scores(depth):
+    for board in random_positions(12, 30, seed=6):
+        single = Search(linear_evaluation).best_move(board, depth)[1]
+        batched = Search(linear_evaluation,
+                         batch_evaluate=evaluate_boards).best_move(board,
+                                                                   depth)[1]
+        assert batched == single
@@ -0,0 +1,67 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import numpy as np
+
+from bitboard import BitBoard, BLACK, RED
+from batch_playout import play_random_moves, batch_playouts, playout_board,\
+    NO_WINNER
+from test_bitboard import random_walk
+
+COPIES = 200
+
+
+def one_ply(board, generator):
+    '''
+    The positions reached by one batched random move from many copies of a
+    board, as (black, red, kings) tuples, or None where no move was made
+    '''
+    black_to_move = board.current_player == BLACK
+    own, opponent = ((board.black, board.red) if black_to_move
+                     else (board.red, board.black))
+    moved, own, opponent, kings = play_random_moves(
+        np.full(COPIES, own, dtype=np.uint64),
+        np.full(COPIES, opponent, dtype=np.uint64),
+        np.full(COPIES, board.kings, dtype=np.uint64),
+        np.full(COPIES, 0 if black_to_move else 1, dtype=np.intp),
+        generator)
+    if not black_to_move:
+        own, opponent = opponent, own
+    return [(int(black), int(red), int(king)) if made else None
+            for made, black, red, king in zip(moved, own, opponent, kings)]
+
+
+def test_one_ply_matches_legal_moves():
+    generator = np.random.default_rng(0)
+    for seed in range(10):
+        for board in random_walk(seed)[::4]:
+            expected = {(after.black, after.red, after.kings)
+                        for after in map(board.play, board.legal_moves())}
+            reached = one_ply(board, generator)
+            if not expected:
+                assert reached == [None] * COPIES
+                continue
+            assert set(reached) <= expected
+            # every legal move is likely to come up among the copies
+            if len(expected) <= 8:
+                assert set(reached) == expected
+
+
+def test_playouts_are_reproducible():
+    board = BitBoard()
+    first = playout_board(board, 64, generator=np.random.default_rng(3))
+    again = playout_board(board, 64, generator=np.random.default_rng(3))
+    assert first == again
+    assert sum(first.values()) == 64
+    assert set(first) == {BLACK, RED, None}
+
+
+def test_lost_and_unfinished_games():
+    # the black man is blocked, so red wins before any move
+    winner = batch_playouts([1 << 24, BitBoard().black], [3 << 28,
+                            BitBoard().red], [0, 0], [0, 0], max_plies=2)
+    assert winner[0] == 1
+    assert winner[1] == NO_WINNER
+    board = BitBoard.from_masks(1 << 24, 3 << 28, 0, RED)
+    assert playout_board(board, 8)[RED] == 8
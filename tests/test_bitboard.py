@@ -0,0 +1,79 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+from bitboard import BitBoard, BLACK, RED, BLACK_KING_ROW, RED_KING_ROW,\
+    DARK_SQUARES
+from game_state import GameState
+
+
+def random_position(generator, pieces=8):
+    '''
+    A sparse random position with kings, where long jumps and crowning
+    captures are common, no man stands on its own king row
+    '''
+    squares = generator.sample(range(DARK_SQUARES), pieces)
+    black, red, kings = 0, 0, 0
+    for number, index in enumerate(squares):
+        bit = 1 << index
+        if number % 2:
+            black |= bit
+            king_row = BLACK_KING_ROW
+        else:
+            red |= bit
+            king_row = RED_KING_ROW
+        if bit & king_row or generator.random() < 0.25:
+            kings |= bit
+    return BitBoard.from_masks(black, red, kings,
+                               generator.choice((BLACK, RED)))
+
+
+def random_walk(seed, plies=80):
+    '''
+    The positions of one random game from the initial position or a sparse
+    random position, as BitBoard objects with no history
+    '''
+    generator = random.Random(seed)
+    board = BitBoard() if seed % 2 else random_position(generator)
+    positions = [board.copy()]
+    for _ in range(plies):
+        moves = board.legal_moves()
+        if not moves:
+            break
+        board.make_move(generator.choice(moves))
+        positions.append(board.copy())
+    return positions
+
+
+def game_state_of(board):
+    game = GameState(searching=False)
+    game.set_position(board.squares, board.current_player)
+    return game
+
+
+def test_legal_moves_match_game_state():
+    for seed in range(40):
+        for board in random_walk(seed):
+            game = game_state_of(board)
+            assert board.legal_moves() == game.legal_moves()
+            assert board.move_options() == game.move_options()
+            assert board.has_any_legal_move() == game.has_any_legal_move()
+            assert board.game_end() == game.game_end()
+
+
+def test_make_and_unmake_keep_the_hash():
+    for seed in range(40):
+        for board in random_walk(seed):
+            before = (board.black, board.red, board.kings,
+                      board.current_player, board.hash_key)
+            for move in board.legal_moves():
+                board.make_move(move)
+                assert board.hash_key == board.compute_hash()
+                assert not board.black & board.red
+                assert not board.kings & ~(board.black | board.red)
+                board.unmake_move()
+                assert (board.black, board.red, board.kings,
+                        board.current_player, board.hash_key) == before
+
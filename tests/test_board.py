@@ -0,0 +1,175 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import threading
+
+from board import Board
+from game_state import GameState, BLACK, RED
+
+
+def click(board, row, col):
+    board.click_handler((col - 4) * 50 + 25, (row - 4) * 50 + 25)
+
+
+def play_first_move(board):
+    move = board.game.legal_moves()[0]
+    click(board, *move.path[0])
+    click(board, *move.path[-1])
+
+
+def block_executor(board):
+    '''
+    Keep the board's search thread busy until the returned event is set
+    '''
+    release = threading.Event()
+    board.executor.submit(release.wait)
+    return release
+
+
+def test_computer_moves_in_background(fake_turtle):
+    board = Board(GameState(searching=False))
+    try:
+        play_first_move(board)
+        assert board.thinking is not None
+        assert board.game.current_player == RED
+        fake_turtle.run_timers()
+        assert board.thinking is None
+        assert board.game.current_player == BLACK
+        assert len(board.game.history) == 2
+    finally:
+        board.close()
+
+
+def test_cancel_before_search_starts(fake_turtle):
+    board = Board(GameState(searching=False))
+    try:
+        release = block_executor(board)
+        play_first_move(board)
+        future = board.thinking
+        board.undo_handler()
+        release.set()
+        assert future.cancelled()
+        assert board.game.current_player == BLACK
+        assert not board.game.history
+    finally:
+        board.close()
+
+
+def test_stop_before_search_starts(fake_turtle):
+    board = Board(GameState(searching=False))
+    try:
+        release = block_executor(board)
+        play_first_move(board)
+        future = board.thinking
+        # the stop comes before the search thread reaches the search
+        board.game.stop_search()
+        release.set()
+        assert future.result() is not None
+        assert board.game.searcher().nodes <= 1
+    finally:
+        board.close()
+
+
+def test_redo_after_cancel_searches_again(fake_turtle):
+    board = Board(GameState(searching=False))
+    try:
+        play_first_move(board)
+        board.undo_handler()
+        board.redo_handler()
+        assert board.thinking is not None
+        fake_turtle.run_timers()
+        assert board.game.current_player == BLACK
+        assert len(board.game.history) == 2
+        assert board.game.searcher().nodes > 1
+    finally:
+        board.close()
+
+
+def stamped_pieces(screen):
+    '''
+    The shapes stamped on the screen by (row, col) square
+    '''
+    shapes = {}
+    for (x, y), shape in screen.stamps.values():
+        square = ((y - 25) // 50 + 4, (x - 25) // 50 + 4)
+        shapes.setdefault(square, []).append(shape)
+    return shapes
+
+
+def board_pieces(game):
+    return {(row, col): [piece] for row, line in enumerate(game.squares)
+            for col, piece in enumerate(line) if piece != "empty"}
+
+
+def record_cleared(board, monkeypatch):
+    cleared = []
+    clear_square = board.clear_square
+
+    def record(row, col):
+        cleared.append((row, col))
+        clear_square(row, col)
+    monkeypatch.setattr(board, "clear_square", record)
+    return cleared
+
+
+def test_move_redraws_only_changed_squares(fake_turtle, monkeypatch):
+    board = Board(GameState(searching=False))
+    try:
+        cleared = record_cleared(board, monkeypatch)
+        move = board.game.legal_moves()[0]
+        click(board, *move.path[0])
+        framed = set(board.framed)
+        assert move.path[0] in framed and move.path[-1] in framed
+        del cleared[:]
+        click(board, *move.path[-1])
+        assert set(cleared) == framed | set(move.path)
+        assert stamped_pieces(fake_turtle) == board_pieces(board.game)
+    finally:
+        board.close()
+
+
+def test_capture_redraws_the_captured_square(fake_turtle, monkeypatch):
+    game = GameState(searching=False)
+    game.set_fen("B:W14,22,32:B9")
+    board = Board(game)
+    try:
+        cleared = record_cleared(board, monkeypatch)
+        (capture,) = game.legal_moves()
+        origin, first, last = capture.path
+        click(board, *origin)
+        del cleared[:]
+        click(board, *first)
+        assert board.game.jump_path == [origin, first]
+        assert capture.captures[0] in cleared
+        del cleared[:]
+        click(board, *last)
+        # the two framed squares and the piece captured by the last jump
+        assert set(cleared) == {first, last, capture.captures[1]}
+        assert stamped_pieces(fake_turtle) == board_pieces(board.game)
+    finally:
+        board.close()
+
+
+def test_one_pen_and_one_stamp_per_piece(fake_turtle, monkeypatch):
+    pens = []
+    make_pen = fake_turtle.Turtle
+
+    def count_pen():
+        pens.append(make_pen())
+        return pens[-1]
+    monkeypatch.setattr(fake_turtle, "Turtle", count_pen)
+    board = Board(GameState(searching=False))
+    try:
+        started = len(pens)
+        assert len(fake_turtle.stamps) == 24
+        for _ in range(3):
+            play_first_move(board)
+            fake_turtle.run_timers()
+            # the highlight frames are gone once the turn is over
+            assert stamped_pieces(fake_turtle) == board_pieces(board.game)
+        board.undo_handler()
+        assert stamped_pieces(fake_turtle) == board_pieces(board.game)
+        assert len(pens) == started
+    finally:
+        board.close()
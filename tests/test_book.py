@@ -0,0 +1,68 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+from bitboard import BitBoard, BLACK, RED
+from book import count_book_moves, write_book, OpeningBook, move_squares,\
+    WIN_WEIGHT, DRAW_WEIGHT
+
+
+def random_game(seed, plies):
+    generator = random.Random(seed)
+    board = BitBoard()
+    paths = []
+    for _ in range(plies):
+        move = generator.choice(board.legal_moves())
+        paths.append(move.path)
+        board.make_move(move)
+    return paths
+
+
+def test_weights_follow_results():
+    paths = random_game(0, 6)
+    weights = count_book_moves([(BLACK, paths), (None, paths)], plies=4)
+    board = BitBoard()
+    for ply, path in enumerate(paths[:4]):
+        move = next(move for move in board.legal_moves()
+                    if move.path == path)
+        key = (board.hash_key,) + move_squares(move)
+        won = WIN_WEIGHT if board.current_player == BLACK else 0
+        assert weights[key] == won + DRAW_WEIGHT
+        board.make_move(move)
+    assert len(weights) == 4
+
+
+def test_random_opening_is_not_counted():
+    paths = random_game(1, 8)
+    weights = count_book_moves([(RED, paths)], plies=8, skip=4)
+    assert len(weights) == 4
+    board = BitBoard()
+    for path in paths[:4]:
+        board.make_move(next(move for move in board.legal_moves()
+                             if move.path == path))
+    first = next(move for move in board.legal_moves()
+                 if move.path == paths[4])
+    assert (board.hash_key,) + move_squares(first) in weights
+
+
+def test_book_file_choose(tmp_path):
+    games = [(None, random_game(seed, 6)) for seed in range(20)]
+    path = str(tmp_path / "opening.book")
+    assert write_book(path, count_book_moves(games, plies=6)) > 0
+    book = OpeningBook(path)
+    try:
+        board = BitBoard()
+        first_moves = {tuple(paths[0]) for _, paths in games}
+        generator = random.Random(0)
+        for _ in range(20):
+            move = book.choose(board, generator)
+            assert move in board.legal_moves()
+            assert move.path in first_moves
+        # the book keeps only the first six moves of each game
+        for _ in range(6):
+            board.make_move(board.legal_moves()[0])
+        assert book.choose(board, generator) is None
+    finally:
+        book.close()
@@ -0,0 +1,70 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import io
+import os
+import subprocess
+import sys
+import time
+
+import engine
+from engine import Engine, NO_MOVE, ENGINE_NAME, ENGINE_AUTHOR
+
+
+def run(*lines):
+    output = io.StringIO()
+    Engine(output).run(line + "\n" for line in lines)
+    return output.getvalue().splitlines()
+
+
+def test_handshake_and_position():
+    replies = run("engine", "isready", "position startpos moves 9-13 22-18",
+                  "fen", "quit")
+    assert replies[:4] == ["id name " + ENGINE_NAME,
+                           "id author " + ENGINE_AUTHOR, "engineok",
+                           "readyok"]
+    assert "fen B:W18,21,23,24,25,26,27,28,29,30,31,32:"\
+        "B1,2,3,4,5,6,7,8,10,11,12,13" in replies
+
+
+def test_go_replies_with_a_legal_move():
+    replies = run("position startpos", "go nodes 500")
+    assert replies[0].startswith("info")
+    assert replies[1].split()[1] in ("9-13", "9-14", "10-14", "10-15",
+                                     "11-15", "11-16", "12-16")
+
+
+def test_go_without_moves():
+    replies = run("position fen W:W:B1", "go depth 3")
+    assert replies[-1] == "bestmove " + NO_MOVE
+
+
+def test_errors():
+    replies = run("frob", "position startpos moves 1-2", "go nodes x",
+                  "position fen nonsense")
+    assert [reply.split()[0] for reply in replies] == ["error"] * 4
+
+
+def test_isready_during_infinite_search():
+    output = io.StringIO()
+    player = Engine(output)
+    player.handle("position startpos")
+    player.handle("go infinite")
+    start = time.perf_counter()
+    player.handle("isready")
+    assert output.getvalue().splitlines()[-1] == "readyok"
+    assert time.perf_counter() - start < 1
+    player.handle("stop")
+    assert output.getvalue().splitlines()[-1].startswith("bestmove")
+    assert player.thread is None
+
+
+def test_starts_without_numpy_or_multiprocessing():
+    code = ("import sys, engine; print(sorted(name for name in sys.modules "
+            "if name.split('.')[0] in ('numpy', 'multiprocessing', "
+            "'concurrent')))")
+    result = subprocess.run([sys.executable, "-c", code],
+                            cwd=os.path.dirname(engine.__file__),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,162 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+from bitboard import BitBoard
+from game_state import GameState, BLACK, RED, KING, EMPTY, NUM_SQUARES,\
+    DIRECTIONS
+
+
+def game_at(fen):
+    game = GameState(searching=False)
+    game.set_fen(fen)
+    return game
+
+
+def test_branching_jumps_are_complete_paths():
+    game = game_at("B:W14,15,22,23:B10")
+    left, right = game.legal_moves()
+    assert left.path == ((2, 3), (4, 1), (6, 3))
+    assert left.captures == ((3, 2), (5, 2))
+    assert right.path == ((2, 3), (4, 5), (6, 3))
+    assert right.captures == ((3, 4), (5, 4))
+
+
+def test_king_jumps_around_and_back():
+    game = game_at("B:W14,15,22,23,30:BK10")
+    moves = game.legal_moves()
+    assert [len(move.captures) for move in moves] == [4, 4]
+    assert all(move.path[0] == move.path[-1] == (2, 3) for move in moves)
+    game.make_move(moves[0])
+    assert game.to_fen() == "W:W30:BK10"
+
+
+def test_crowning_ends_the_jump():
+    (man_jump,) = game_at("B:W26,27:B22").legal_moves()
+    assert man_jump.path == ((5, 2), (7, 4))
+    (king_jump,) = game_at("B:W26,27:BK22").legal_moves()
+    assert king_jump.path == ((5, 2), (7, 4), (5, 6))
+    game = game_at("B:W26,27:B22")
+    game.make_move(man_jump)
+    assert game.squares[7][4] == BLACK + KING
+
+
+def test_clicks_follow_one_capture_path():
+    game = game_at("B:W14,15,22,23:B10")
+    _, right = game.legal_moves()
+    expected = game_at("B:W14,15,22,23:B10")
+    expected.make_move(right)
+    origin, first, last = right.path
+    game.select_piece(*origin)
+    assert game.possible_capture_moves == [(4, 1), (4, 5)]
+    assert game.valid_move(*first)
+    game.update_squares(*first)
+    game.king_upgrade(*first)
+    assert game.continue_jump(*first)
+    assert game.possible_capture_moves == [last]
+    assert not game.valid_move(4, 1)
+    game.update_squares(*last)
+    game.king_upgrade(*last)
+    assert not game.continue_jump(*last)
+    game.storage_reset()
+    game.switch_turn()
+    assert game.squares == expected.squares
+    assert game.current_player == RED
+    # both steps are one turn for undo
+    assert game.undo()
+    assert game.to_fen() == "B:W14,15,22,23:B10"
+
+
+def test_game_state_paths_match_bitboard():
+    for fen in ("B:W14,15,22,23:B10", "B:W14,15,22,23,30:BK10",
+                "B:W26,27:B22", "W:W14:B10,18,19", "B:W14,22:B9"):
+        game = game_at(fen)
+        board = BitBoard.from_squares(game.squares, game.current_player)
+        assert game.legal_moves() == board.legal_moves()
+
+
+def fail(*args):
+    raise AssertionError("not needed")
+
+
+def test_captures_stop_the_generator_early(monkeypatch):
+    game = game_at("B:W14,22:B9,29")
+    board = BitBoard.from_squares(game.squares, BLACK)
+    monkeypatch.setattr(GameState, "non_capture_move", fail)
+    monkeypatch.setattr(BitBoard, "movers", fail)
+    for position in (game, board):
+        moves = position.iter_moves()
+        first = next(moves)
+        assert first.captures
+        assert [first] + list(moves) == position.legal_moves()
+
+
+def test_game_end_stops_at_the_first_move(monkeypatch):
+    game = GameState(searching=False)
+    board = BitBoard()
+    for name in ("legal_moves", "move_options"):
+        monkeypatch.setattr(GameState, name, fail)
+        monkeypatch.setattr(BitBoard, name, fail)
+    assert game.game_end() == (False, " ")
+    assert board.has_any_legal_move()
+    assert not board.game_end()[0]
+
+
+def test_game_end_when_a_player_cannot_move():
+    # the black man is blocked by red men on the last row
+    game = game_at("B:W29,30:B25")
+    board = BitBoard.from_squares(game.squares, BLACK)
+    assert not game.has_any_legal_move()
+    assert not board.has_any_legal_move()
+    assert list(game.iter_moves()) == list(board.iter_moves()) == []
+    assert game.game_end() == board.game_end() ==\
+        (True, "Game Over! Red player wins!")
+    game.current_player = RED
+    assert game.has_any_legal_move()
+    assert game.game_end() == (False, " ")
+
+
+def on_board(row, col):
+    return 0 <= row < NUM_SQUARES and 0 <= col < NUM_SQUARES
+
+
+def plain_moves(game, row, col):
+    '''
+    The steps and jumps of a piece found by walking its directions, as
+    GameState did before the tables
+    '''
+    piece = game.squares[row][col]
+    own = (game.current_player, game.current_player + KING)
+    steps, jumps = [], []
+    for row_step, col_step in DIRECTIONS.get(piece, ()):
+        over = (row + row_step, col + col_step)
+        land = (row + 2 * row_step, col + 2 * col_step)
+        if not on_board(*over):
+            continue
+        over_piece = game.squares[over[0]][over[1]]
+        if over_piece == EMPTY:
+            steps.append(over)
+        elif (over_piece not in own and on_board(*land)
+              and game.squares[land[0]][land[1]] == EMPTY):
+            jumps.append(land)
+    return steps, jumps
+
+
+def test_tables_match_walking_the_directions():
+    generator = random.Random(3)
+    pieces = [BLACK, RED, BLACK + KING, RED + KING]
+    for _ in range(200):
+        game = GameState(searching=False)
+        for row in range(NUM_SQUARES):
+            for col in range(NUM_SQUARES):
+                if row % 2 != col % 2:
+                    game.squares[row][col] = generator.choice(
+                        pieces + [EMPTY] * 4)
+        game.current_player = generator.choice((BLACK, RED))
+        for row in range(NUM_SQUARES):
+            for col in range(NUM_SQUARES):
+                steps, jumps = plain_moves(game, row, col)
+                assert game.non_capture_move(row, col) == steps
+                assert game.capture_move(row, col) == jumps
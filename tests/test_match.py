@@ -0,0 +1,67 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+import match
+from bitboard import BitBoard, BLACK, RED
+from match import ENGINES, MatchStats, play_game, random_engine,\
+    run_match, search_engine, elo_difference, expected_score
+
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_engines_play_legal_moves(name):
+    engine = ENGINES[name](0)
+    board = BitBoard()
+    # thousands of playouts a move, one move is enough
+    for _ in range(1 if name.startswith("mcts") else 4):
+        move = engine(board.copy())
+        assert move in board.legal_moves()
+        board.make_move(move)
+
+
+def test_games_replay_with_the_same_seed():
+    first = play_game(random_engine(1), random_engine(2), max_plies=60)
+    second = play_game(random_engine(1), random_engine(2), max_plies=60)
+    assert first == second
+    winner, moves = first
+    assert winner in (BLACK, RED, None)
+    board = BitBoard()
+    for move in moves:
+        assert move in board.legal_moves()
+        board.make_move(move)
+
+
+def test_elo():
+    assert elo_difference(0.5) == 0
+    assert elo_difference(expected_score(100)) == pytest.approx(100)
+    assert elo_difference(1) == math.inf
+    stats = MatchStats()
+    for score in (1, 1, 0.5, 0):
+        stats.add(score, 10, 0.1)
+    assert (stats.wins, stats.draws, stats.losses) == (2, 1, 1)
+    assert stats.score() == pytest.approx(0.625)
+
+
+def test_sprt_stops_a_one_sided_match():
+    stats, decision = run_match(search_engine(node_budget=300),
+                                random_engine(0), games=40,
+                                opening_plies=2, sprt=(0, 200, 0.05, 0.05),
+                                seed=0)
+    assert decision == "H1"
+    assert stats.games() < 40
+
+
+def test_import_without_numpy():
+    code = ("import sys, match, book; print(sorted(name for name in "
+            "sys.modules if name.split('.')[0] == 'numpy'))")
+    result = subprocess.run([sys.executable, "-c", code],
+                            cwd=os.path.dirname(match.__file__),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,63 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+import pytest
+
+from bitboard import BitBoard, BLACK, RED
+from game_state import GameState
+from mcts import MCTS, mcts_engine, random_playout
+
+# Three of the black king's four moves let red capture it at once
+SAVING_FEN = "B:W14,22,24:BK15"
+SAVING_MOVE = ((3, 4), (2, 5))
+
+
+def board_at(fen):
+    game = GameState(searching=False)
+    game.set_fen(fen)
+    return BitBoard.from_squares(game.squares, game.current_player)
+
+
+def test_best_move_is_legal_and_counts_playouts():
+    board = BitBoard()
+    tree = MCTS(seed=0)
+    move = tree.best_move(board, 200)
+    assert move in board.legal_moves()
+    assert tree.playouts == 200
+    assert tree.root.visits == 200
+    assert sum(child.visits for child in tree.root.children) == 200
+    assert board.hash_key == BitBoard().hash_key and not board.history
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_avoids_losing_the_last_piece(seed):
+    board = board_at(SAVING_FEN)
+    assert len(board.legal_moves()) == 4
+    assert MCTS(seed=seed).best_move(board, 300).path == SAVING_MOVE
+
+
+def test_tree_is_kept_for_the_next_move():
+    board = BitBoard()
+    tree = MCTS(seed=1)
+    board.make_move(tree.best_move(board, 300))
+    board.make_move(board.legal_moves()[0])
+    root = tree.find_root(board)
+    assert root.visits > 0
+    assert root.parent is None
+
+
+def test_playout_is_reproducible():
+    results = {random_playout(BitBoard(), random.Random(5))
+               for _ in range(3)}
+    assert len(results) == 1
+    assert results <= {BLACK, RED, None}
+
+
+def test_budget_is_required():
+    with pytest.raises(ValueError):
+        MCTS().best_move(BitBoard(), None, None)
+    with pytest.raises(ValueError):
+        mcts_engine(None, None)
@@ -0,0 +1,65 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+import pytest
+
+from bitboard import BitBoard
+from game_state import GameState
+from notation import to_fen, from_fen, to_bytes, from_bytes, BINARY
+
+
+def random_boards(count, seed=0):
+    generator = random.Random(seed)
+    board = BitBoard()
+    for _ in range(count):
+        moves = board.legal_moves()
+        if not moves:
+            board = BitBoard()
+            moves = board.legal_moves()
+        board.make_move(generator.choice(moves))
+        yield board.copy()
+
+
+def same_position(board, other):
+    return ((board.black, board.red, board.kings, board.current_player)
+            == (other.black, other.red, other.kings, other.current_player))
+
+
+def test_initial_fen():
+    assert from_fen(to_fen(BitBoard())).legal_moves() ==\
+        BitBoard().legal_moves()
+    assert to_fen(BitBoard()).startswith("B:W21,")
+
+
+def test_round_trips():
+    for board in random_boards(200):
+        assert same_position(from_fen(to_fen(board)), board)
+        data = to_bytes(board)
+        assert len(data) == BINARY.size
+        assert same_position(from_bytes(data), board)
+
+
+def test_game_state_round_trips():
+    game = GameState(searching=False)
+    for board in random_boards(50, seed=1):
+        game.set_fen(to_fen(board))
+        assert game.to_fen() == to_fen(board)
+        other = GameState(searching=False)
+        other.set_bytes(game.to_bytes())
+        assert other.to_fen() == game.to_fen()
+        assert other.current_player == game.current_player
+
+
+@pytest.mark.parametrize("text", ["", "B:W21", "X:W21:B1", "B:W33:B1",
+                                  "B:W1:B1", "B:W21:Bx"])
+def test_bad_fen(text):
+    with pytest.raises(ValueError):
+        from_fen(text)
+
+
+def test_bad_bytes():
+    with pytest.raises(ValueError):
+        from_bytes(BINARY.pack(1, 1, 0, 0))
@@ -0,0 +1,44 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import threading
+import time
+
+from bitboard import BitBoard
+from parallel import ParallelSearch
+from search import Search
+from test_search import random_positions
+
+
+def test_stop_parallel_search():
+    search = ParallelSearch(2)
+    try:
+        timer = threading.Timer(0.5, search.stop)
+        start = time.perf_counter()
+        timer.start()
+        move, _, depth = search.iterative_deepening(BitBoard(), None)
+        assert time.perf_counter() - start < 10
+        assert move in BitBoard().legal_moves()
+        assert not search.stopped
+    finally:
+        search.close()
+
+
+def test_parallel_score_matches_serial_search():
+    search = ParallelSearch(2)
+    try:
+        for board in random_positions(6, 30, seed=4):
+            for depth in (1, 2, 3):
+                move, score, done = search.iterative_deepening(
+                    board, None, None, depth)
+                assert done == depth
+                assert move in board.legal_moves()
+                _, serial = Search().best_move(board, depth)
+                assert score == serial
+                board.make_move(move)
+                _, reply = Search().best_move(board, depth - 1)
+                board.unmake_move()
+                assert -reply == score
+    finally:
+        search.close()
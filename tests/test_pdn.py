@@ -0,0 +1,75 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import io
+
+import pytest
+
+from bitboard import BitBoard, BLACK, RED
+from game_state import GameState
+from pdn import write_game, read_games, game_moves, replay, parse_move,\
+    move_text, game_winner, RESULTS, UNFINISHED
+from test_bitboard import random_walk
+
+
+def random_game(seed):
+    positions = random_walk(seed, 60)
+    moves = []
+    for before, after in zip(positions, positions[1:]):
+        (move,) = [move for move in before.legal_moves()
+                   if before.play(move).hash_key == after.hash_key]
+        moves.append(move)
+    return moves
+
+
+def test_games_round_trip():
+    file = io.StringIO()
+    games = [random_game(seed) for seed in range(1, 6, 2)]
+    for number, moves in enumerate(games):
+        write_game(file, moves, RESULTS[(BLACK, RED, None)[number]],
+                   {"Event": 'self-play "%d"' % number})
+    file.seek(0)
+    read = list(read_games(file))
+    assert len(read) == len(games)
+    for number, (game, moves) in enumerate(zip(read, games)):
+        assert game.tags["Event"] == 'self-play "%d"' % number
+        assert game_moves(game) == moves
+        assert game_winner(game) == (BLACK, RED, None)[number]
+    assert all(len(line) <= 79 for line in file.getvalue().splitlines())
+
+
+def test_reader_skips_comments_and_variations():
+    text = ['[Event "x"]\n',
+            '1. 11-15 {a comment\n',
+            'over two lines} 22-18 (2. 15-19 {in} 24-20) 2. 15x22 *\n',
+            '[FEN "W:W18:B14"]\n',
+            '1... 18x9 0-1\n']
+    first, second = read_games(text)
+    assert first.moves == ["11-15", "22-18", "15x22"]
+    assert first.result == UNFINISHED
+    assert len(game_moves(first)) == 3
+    assert second.moves == ["18x9"]
+    state = GameState(searching=False)
+    (capture,) = replay(second, state)
+    assert state.to_fen() == "B:W9:B"
+    assert state.undo()
+    assert state.to_fen() == "W:W18:B14"
+
+
+def test_parse_move():
+    board = BitBoard()
+    move = parse_move(board, "11-15")
+    assert move_text(move) == "11-15"
+    game = GameState(searching=False)
+    game.set_fen("B:W14,15,22,23,30:BK10")
+    first, second = game.legal_moves()
+    assert move_text(first) == "10x17x26x19x10"
+    assert parse_move(game, "10x17x26x19x10") == first
+    assert parse_move(game, "10x19x26x17x10") == second
+    with pytest.raises(ValueError, match="ambiguous"):
+        parse_move(game, "10x10")
+    with pytest.raises(ValueError, match="illegal"):
+        parse_move(board, "11-14")
+    with pytest.raises(ValueError, match="not a move"):
+        parse_move(board, "e3-e4")
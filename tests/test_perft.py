@@ -0,0 +1,18 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import pytest
+
+from perft import perft, make_position, reference_counts, GENERATORS,\
+    STORED_POSITIONS
+
+DEPTH = 4
+
+
+@pytest.mark.parametrize("generator", GENERATORS)
+@pytest.mark.parametrize("name", [None] + sorted(STORED_POSITIONS))
+def test_perft_counts(generator, name):
+    position = make_position(generator, name)
+    counts = [perft(position, depth) for depth in range(1, DEPTH + 1)]
+    assert counts == reference_counts(name)[:DEPTH]
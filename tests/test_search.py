@@ -0,0 +1,106 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+import time
+
+import pytest
+
+from bitboard import BitBoard, BLACK
+from evaluation import DEFAULT_EVALUATION
+from game_state import GameState
+from search import Search, WIN_SCORE
+
+
+def plain_negamax(board, depth, ply=0):
+    '''
+    The score of negamax without pruning or a transposition table, captures
+    are searched past the depth as Search does
+    '''
+    moves = board.legal_moves()
+    if not moves:
+        return -WIN_SCORE + ply
+    if depth <= 0 and not moves[0].captures:
+        return DEFAULT_EVALUATION(board)
+    best = -WIN_SCORE - 1
+    for move in moves:
+        board.make_move(move)
+        best = max(best, -plain_negamax(board, depth - 1, ply + 1))
+        board.unmake_move()
+    return best
+
+
+def random_positions(count, plies, seed=0):
+    generator = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = BitBoard()
+        for _ in range(generator.randrange(plies)):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(generator.choice(moves))
+        if len(board.legal_moves()) > 1:
+            positions.append(board)
+    return positions
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_alpha_beta_matches_plain_negamax(depth):
+    for board in random_positions(20, 30):
+        move, score = Search().best_move(board, depth)
+        assert score == plain_negamax(board, depth)
+        board.make_move(move)
+        assert -plain_negamax(board, depth - 1, 1) == score
+
+
+def test_search_move_without_moves():
+    game = GameState(searching=False)
+    game.set_fen("B:W14:B")
+    assert game.search_move(None, 100) is None
+
+
+def test_node_budget_bounds_the_search():
+    board = BitBoard()
+    search = Search()
+    start = (board.black, board.red, board.kings, board.hash_key)
+    move, _, depth = search.iterative_deepening(board, None, 2000)
+    assert move in board.legal_moves()
+    assert depth >= 1
+    assert search.nodes <= 2000
+    assert (board.black, board.red, board.kings, board.hash_key) == start
+    assert not board.history
+
+
+def test_time_budget_bounds_the_search():
+    board = BitBoard()
+    search = Search()
+    started = time.perf_counter()
+    move, _, depth = search.iterative_deepening(board, 50)
+    assert time.perf_counter() - started < 0.5
+    assert move in board.legal_moves()
+    assert 1 <= depth < 64
+    # the budget is not left behind for the next search
+    assert search.deadline == float("inf")
+    assert search.node_limit == float("inf")
+
+
+def test_max_depth_stops_deepening():
+    board = BitBoard()
+    _, score, depth = Search().iterative_deepening(board, None, None, 3)
+    assert depth == 3
+    assert score == plain_negamax(board, 3)
+
+
+def test_single_move_is_not_searched():
+    board = BitBoard.from_squares(GameState(searching=False).squares, BLACK)
+    search = Search()
+    search.iterative_deepening(board, None, 500)
+    assert search.nodes > 0
+    game = GameState(searching=False)
+    game.set_fen("B:W14:B9")
+    board = BitBoard.from_squares(game.squares, BLACK)
+    (capture,) = board.legal_moves()
+    assert search.iterative_deepening(board, None, 500) == (capture, 0, 0)
+    assert search.nodes == 0
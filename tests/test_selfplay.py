@@ -0,0 +1,27 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+from selfplay import play_selfplay_game, selfplay, record_to_json
+
+PLIES = 12
+NODES = 200
+
+
+def test_game_replays_from_seed_and_index():
+    first = play_selfplay_game(3, 7, 4, PLIES, NODES)
+    again = play_selfplay_game(3, 7, 4, PLIES, NODES)
+    assert first.moves == again.moves
+    assert len(first.moves) == PLIES
+    # (1, 7) and (0, 107) once shared seed * SELFPLAY_GAMES + index
+    openings = {tuple(play_selfplay_game(index, seed, 4, 4, NODES).moves)
+                for seed, index in ((7, 3), (8, 3), (1, 7), (0, 107))}
+    assert len(openings) == 4
+
+
+def test_pool_plays_the_same_games():
+    records = sorted(selfplay(3, 2, 5, 2, PLIES, NODES))
+    assert [record.index for record in records] == [0, 1, 2]
+    for record in records:
+        alone = play_selfplay_game(record.index, 5, 2, PLIES, NODES)
+        assert record_to_json(record) == record_to_json(alone)
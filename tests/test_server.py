@@ -0,0 +1,144 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import asyncio
+import json
+
+import pytest
+
+from game_state import EMPTY
+from server import GameServer
+
+
+def run_client(tmp_path, client, server=None):
+    '''
+    Serve on a Unix socket and run an async client function with a send
+    function, which writes one request and returns its reply
+    '''
+    server = server or GameServer(workers=1, time_ms=50)
+    path = str(tmp_path / "server.sock")
+
+    async def run():
+        serving = asyncio.create_task(server.serve(path=path))
+        try:
+            while True:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    await asyncio.sleep(0.01)
+
+            async def send(request):
+                line = request if isinstance(request, str)\
+                    else json.dumps(request)
+                writer.write((line + "\n").encode())
+                await writer.drain()
+                return json.loads(await reader.readline())
+            result = await client(send)
+            writer.close()
+            return result
+        finally:
+            serving.cancel()
+    try:
+        return asyncio.run(run())
+    finally:
+        server.close()
+
+
+def test_game(tmp_path):
+    async def client(send):
+        new = await send({"command": "new", "id": 1})
+        assert new["ok"] and new["id"] == 1 and new["player"] == "black"
+        assert len(new["moves"]) == 7
+        session = new["session"]
+        moved = await send({"command": "move", "session": session,
+                            "move": new["moves"][0]})
+        assert moved["ok"] and moved["player"] == "dark red"
+        # a null budget falls back on the server's time_ms
+        computer = await send({"command": "computer", "session": session,
+                               "time_ms": None})
+        assert computer["ok"] and computer["player"] == "black"
+        closed = await send({"command": "close", "session": session})
+        assert closed["ok"]
+    run_client(tmp_path, client)
+
+
+@pytest.mark.parametrize("request_line, error", [
+    ('not json', "Expecting value"),
+    ('[1]', "a request is a JSON object"),
+    ('{"command": "frob"}', "session must be a string"),
+    ('{"command": "new", "fen": 5}', "fen must be a string"),
+    ('{"command": "new", "fen": "B:W33:B1"}', "no square 33"),
+    ('{"command": "state", "session": ["x"]}', "session must be a string"),
+    ('{"command": "state", "session": "x"}', "no session 'x'"),
+])
+def test_error_replies(tmp_path, request_line, error):
+    async def client(send):
+        reply = await send(request_line)
+        assert not reply["ok"] and error in reply["error"]
+        assert (await send({"command": "new"}))["ok"]
+    run_client(tmp_path, client)
+
+
+def test_move_errors_and_redo(tmp_path):
+    async def client(send):
+        new = await send({"command": "new"})
+        session = new["session"]
+        first, second = new["moves"][:2]
+        replies = [await send(dict(request, session=session))
+                   for request in ({"command": "move", "move": 11},
+                                   {"command": "move", "move": "1-2"},
+                                   {"command": "computer", "time_ms": 0},
+                                   {"command": "move", "move": first},
+                                   {"command": "undo"},
+                                   {"command": "move", "move": second},
+                                   {"command": "redo"})]
+        assert [reply["ok"] for reply in replies] ==\
+            [False, False, False, True, True, True, True]
+        assert replies[0]["error"] == "move must be a string"
+        assert replies[1]["error"] == "illegal move '1-2'"
+        assert replies[2]["error"] ==\
+            "time_ms must be a positive whole number"
+        # the new move dropped the turn taken back, nothing is left to redo
+        assert replies[-1]["fen"] == replies[-2]["fen"]
+    run_client(tmp_path, client)
+
+
+def test_redo_that_no_longer_fits(tmp_path):
+    server = GameServer(workers=1, time_ms=50)
+
+    async def client(send):
+        new = await send({"command": "new"})
+        session = new["session"]
+        await send({"command": "move", "session": session,
+                    "move": "9-13"})
+        undone = await send({"command": "undo", "session": session})
+        assert undone["fen"] == new["fen"]
+        # the position changes behind the redo stack, without a move: the
+        # piece the turn taken back moved is gone
+        game = server.sessions[session].game
+        game.squares[2][1] = EMPTY
+        changed = await send({"command": "state", "session": session})
+        redone = await send({"command": "redo", "session": session})
+        assert redone["ok"] and redone["fen"] == changed["fen"]
+        assert redone["player"] == "black"
+        assert not game.redo_stack
+    run_client(tmp_path, client, server)
+
+
+def test_unexpected_error_keeps_connection(tmp_path):
+    server = GameServer(workers=1, time_ms=50)
+    handle_request = server.handle_request
+
+    async def fail_once(request):
+        if request.get("id") == 7:
+            raise RuntimeError("broken")
+        return await handle_request(request)
+    server.handle_request = fail_once
+
+    async def client(send):
+        reply = await send({"command": "new", "id": 7})
+        assert reply == {"ok": False, "error": "internal error", "id": 7}
+        assert (await send({"command": "new"}))["ok"]
+    run_client(tmp_path, client, server)
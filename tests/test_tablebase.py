@@ -0,0 +1,93 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import functools
+
+import pytest
+
+from bitboard import BitBoard
+from tablebase import build_tablebase, slice_positions, encode, decode,\
+    Tablebase, DRAW, WIN, LOSS, MAX_DISTANCE
+
+
+@functools.lru_cache(maxsize=None)
+def wins_within(black, red, kings, player, plies):
+    '''
+    Check by brute force that the player to move wins within plies
+    '''
+    if plies <= 0:
+        return False
+    board = BitBoard.from_masks(black, red, kings, player)
+    for move in board.legal_moves():
+        board.make_move(move)
+        if loses_within(board.black, board.red, board.kings,
+                        board.current_player, plies - 1):
+            return True
+        board.unmake_move()
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def loses_within(black, red, kings, player, plies):
+    '''
+    Check by brute force that the player to move loses within plies
+    '''
+    if not black or not red:
+        return True
+    board = BitBoard.from_masks(black, red, kings, player)
+    moves = board.legal_moves()
+    if not moves:
+        return True
+    if plies <= 0:
+        return False
+    for move in moves:
+        board.make_move(move)
+        if not wins_within(board.black, board.red, board.kings,
+                           board.current_player, plies - 1):
+            return False
+        board.unmake_move()
+    return True
+
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "endgame.tb")
+    solved = build_tablebase(2, path, workers=1)
+    table = Tablebase(path)
+    yield solved, table, path
+    table.close()
+
+
+def test_two_pieces_match_brute_force(tablebase):
+    solved, table, _ = tablebase
+    longest = max(decode(value)[1] for values in solved.values()
+                  for value in values)
+    for key in solved:
+        for board in slice_positions(key):
+            result, plies = table.probe(board)
+            masks = (board.black, board.red, board.kings,
+                     board.current_player)
+            if result == WIN:
+                assert wins_within(*masks, plies)
+                assert not wins_within(*masks, plies - 1)
+            elif result == LOSS:
+                assert loses_within(*masks, plies)
+                assert plies == 0 or not loses_within(*masks, plies - 1)
+            else:
+                assert not wins_within(*masks, longest + 2)
+                assert not loses_within(*masks, longest + 2)
+
+
+def test_workers_build_the_same_file(tablebase, tmp_path):
+    _, _, path = tablebase
+    other = str(tmp_path / "endgame.tb")
+    build_tablebase(2, other, workers=2)
+    with open(path, "rb") as file, open(other, "rb") as other_file:
+        assert file.read() == other_file.read()
+
+
+def test_long_distances_are_clamped():
+    assert decode(encode(WIN, MAX_DISTANCE + 50)) == (WIN, MAX_DISTANCE)
+    assert decode(encode(LOSS, 300)) == (LOSS, MAX_DISTANCE)
+    assert decode(encode(DRAW, 0)) == (DRAW, 0)
@@ -0,0 +1,89 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+import random
+
+from bitboard import BitBoard
+from game_state import GameState
+from transposition import SharedTranspositionTable, TranspositionTable,\
+    EXACT, LOWER, UPPER, BUCKET_SIZE, ENTRY_BYTES
+from zobrist import hash_squares
+
+
+def test_table_store_probe():
+    table = TranspositionTable(1)
+    table.store(12345, 3, LOWER, 42, 1)
+    assert table.probe(12345) == (3, LOWER, 42, 1)
+    assert table.probe(54321) is None
+
+
+def test_table_size_within_memory_cap():
+    for memory_mb in (1, 3, 16):
+        table = TranspositionTable(memory_mb)
+        assert table.size & (table.size - 1) == 0
+        assert table.size * BUCKET_SIZE * ENTRY_BYTES <= memory_mb << 20
+        assert table.size * BUCKET_SIZE * ENTRY_BYTES * 2 > memory_mb << 20
+
+
+def test_replacement_policy():
+    table = TranspositionTable(1)
+    # three keys falling in the same bucket
+    deep, shallow, other = 7, 7 + table.size, 7 + 2 * table.size
+    table.store(deep, 8, EXACT, 1, 0)
+    table.store(shallow, 2, EXACT, 2, 0)
+    assert table.probe(deep) == (8, EXACT, 1, 0)
+    assert table.probe(shallow) == (2, EXACT, 2, 0)
+    # the always-replace slot takes the newest shallow result
+    table.store(other, 3, EXACT, 3, 0)
+    assert table.probe(deep) == (8, EXACT, 1, 0)
+    assert table.probe(shallow) is None
+    assert table.probe(other) == (3, EXACT, 3, 0)
+    # a deeper result takes the depth-preferred slot and hands the old
+    # entry down
+    table.store(other, 9, LOWER, 4, 1)
+    assert table.probe(other) == (9, LOWER, 4, 1)
+    assert table.probe(deep) == (8, EXACT, 1, 0)
+    # in a new search a shallow result replaces the old deep one
+    table.new_search()
+    table.store(shallow, 1, UPPER, 5, 2)
+    assert table.probe(shallow) == (1, UPPER, 5, 2)
+    assert table.probe(other) == (9, LOWER, 4, 1)
+    assert table.probe(deep) is None
+    table.clear()
+    assert table.probe(other) is None
+
+
+def test_hash_updated_by_moves():
+    generator = random.Random(1)
+    board, game = BitBoard(), GameState(searching=False)
+    for _ in range(60):
+        assert board.hash_key == game.hash_key
+        assert game.hash_key == hash_squares(game.squares,
+                                             game.current_player)
+        moves = board.legal_moves()
+        if not moves:
+            break
+        move = generator.choice(moves)
+        board.make_move(move)
+        game.make_move(move)
+
+
+def test_shared_table_seen_by_attached_table():
+    table = SharedTranspositionTable(1)
+    attached = SharedTranspositionTable(name=table.name)
+    try:
+        generator = random.Random(0)
+        for _ in range(1000):
+            key = generator.getrandbits(64)
+            entry = (generator.randrange(60),
+                     generator.choice((EXACT, LOWER, UPPER)),
+                     generator.randrange(-100000, 100001),
+                     generator.randrange(-1, 40))
+            table.store(key, *entry)
+            assert attached.probe(key) == entry
+        table.new_search()
+        assert attached.generation == table.generation
+    finally:
+        attached.close()
+        table.close()
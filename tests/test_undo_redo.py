@@ -0,0 +1,119 @@
+'''
+Xiaoxi Yang
+Code for project_Checkers Game
+'''
+from game_state import GameState, BLACK, RED, EMPTY
+
+
+def new_game():
+    return GameState(searching=False)
+
+
+def test_undo_redo_restores_position():
+    game = new_game()
+    start = game.to_fen()
+    first = game.legal_moves()[0]
+    game.make_move(first)
+    after = game.to_fen()
+    game.make_move(game.legal_moves()[0])
+    assert game.undo()
+    assert game.to_fen() == after
+    assert game.undo()
+    assert game.to_fen() == start
+    assert game.current_player == BLACK
+    assert not game.undo()
+    assert game.redo()
+    assert game.to_fen() == after
+    assert game.current_player == RED
+
+
+def test_redo_without_undo():
+    game = new_game()
+    assert not game.redo()
+    game.make_move(game.legal_moves()[0])
+    assert not game.redo()
+
+
+def test_make_move_after_undo_clears_redo():
+    game = new_game()
+    first, second = game.legal_moves()[:2]
+    game.make_move(first)
+    game.undo()
+    game.make_move(second)
+    position = game.to_fen()
+    assert not game.redo()
+    assert game.to_fen() == position
+    assert game.current_player == RED
+
+
+def test_redo_after_position_change():
+    game = new_game()
+    first = game.legal_moves()[0]
+    game.make_move(first)
+    game.undo()
+    # the squares change without set_fen, which would drop the redo stack
+    (origin_row, origin_col), _ = first.path
+    game.squares[origin_row][origin_col] = EMPTY
+    position = game.to_fen()
+    assert game.redo_stack
+    assert not game.redo()
+    assert game.to_fen() == position
+    assert not game.redo_stack
+
+
+def test_undo_takes_back_whole_capture():
+    game = new_game()
+    game.set_fen("B:W14,22:B9")
+    start = game.to_fen()
+    (capture,) = game.legal_moves()
+    assert len(capture.captures) == 2
+    game.make_move(capture)
+    assert game.to_fen() == "W:W:B25"
+    assert game.undo()
+    assert game.to_fen() == start
+    assert game.redo()
+    assert game.current_player == RED
+
+
+def jump_first_step(game):
+    (capture,) = game.legal_moves()
+    origin, landing = capture.path[:2]
+    game.select_piece(*origin)
+    assert game.valid_move(*landing)
+    game.update_squares(*landing)
+    game.king_upgrade(*landing)
+    assert game.continue_jump(*landing)
+    return capture
+
+
+def test_undo_in_the_middle_of_a_jump():
+    game = new_game()
+    game.set_fen("B:W14,22:B9")
+    start = game.to_fen()
+    capture = jump_first_step(game)
+    assert game.undo()
+    assert game.to_fen() == start
+    assert game.current_player == BLACK
+    assert game.jump_path == [] and game.jump_moves == []
+    assert game.movable_piece == []
+    assert game.possible_capture_moves == []
+    # the unfinished jump is not kept to be made again
+    assert not game.redo()
+    assert game.to_fen() == start
+    # the next click selects a piece instead of continuing the old jump
+    assert not game.valid_move(*capture.path[2])
+    assert game.legal_moves() == [capture]
+
+
+def test_redo_forgets_the_selected_piece():
+    game = new_game()
+    game.set_fen("B:W14,22:B9")
+    (capture,) = game.legal_moves()
+    game.make_move(capture)
+    game.undo()
+    game.select_piece(*capture.path[0])
+    assert game.redo()
+    assert game.to_fen() == "W:W:B25"
+    assert game.movable_piece == []
+    assert game.jump_path == [] and game.jump_moves == []
+    assert game.possible_capture_moves == []